@@ -1,62 +1,473 @@
-from flask import Flask, render_template, request, jsonify
-import sys
+from flask import Flask, Response, g, render_template, request, jsonify, stream_with_context
+import argparse
+import json
 import os
-
-# Add the path to your existing A* code
-sys.path.append('e:/tensor_learn/astar_maze_solver')
+import threading
+from concurrent.futures import as_completed
+from time import perf_counter
 
 from maze_generator import generate_maze
-from astar_algorithm import astar_solve
+from maze_encoding import MAX_CELLS, MAZE_FORMATS, SOLUTION_FORMATS, decode_maze, format_maze, format_solution
+from maze_store import MazeStore, is_maze_id
+from incremental_planner import IncrementalPlanner, PlannerPool
+from heuristic.landmark_heuristic import landmark_cache
+from parallel_solver import iter_solve_parallel
+from progress_stream import iter_search_progress
+from solver_service import LatencyWindow, QueueFull, SolverService, request_budgets, solve_job
 
 app = Flask(__name__)
 
+# Mazes, solve results and trained heuristics kept server-side, keyed by maze content hash.
+# Set MAZE_STORE_DIR to share the store between worker processes through local files.
+maze_store = MazeStore(
+    max_bytes=int(os.environ.get('MAZE_STORE_MAX_BYTES', 256 * 1024 * 1024)),
+    ttl=float(os.environ['MAZE_STORE_TTL']) if os.environ.get('MAZE_STORE_TTL') else None,
+    directory=os.environ.get('MAZE_STORE_DIR')
+)
+# Decision tree trained offline on a maze corpus (see train_model.py), reused instead of
+# fitting per maze; DT_WARM_START=1 refines it per maze with a small residual tree.
+# Imported here so servers without a corpus model only load scikit-learn on demand.
+if os.environ.get('DT_MODEL_PATH'):
+    from heuristic.decision_tree_heuristic import load_model, use_corpus_model
+    use_corpus_model(load_model(os.environ['DT_MODEL_PATH']),
+                     warm_start=os.environ.get('DT_WARM_START') == '1')
+
+# Incremental planners of mazes edited through /update_maze, keyed by maze ID and goal
+planner_pool = PlannerPool()
+if os.environ.get('MAZE_STORE_DIR'):
+    # Landmark tables serve every goal on a maze, so they are kept next to the store
+    landmark_cache.directory = os.path.join(os.environ['MAZE_STORE_DIR'], 'landmarks')
+
+# Serving mode: generate and solve jobs run on a bounded worker pool (None = in the request thread)
+solver_service = None
+# Server-wide search budgets, used as defaults and caps for per-request budgets
+solve_limits = {'time_limit': None, 'max_expansions': None}
+# Latency of each endpoint (time to the first byte for streamed responses)
+request_latency = {}
+
+def configure_serving(workers=0, queue_depth=16, time_limit=None, max_expansions=None):
+    """
+    Set up serving mode and the server-wide search budgets
+
+    Args:
+        workers: Worker processes for generate and solve jobs (0 = solve in the request thread)
+        queue_depth: Jobs allowed to wait for a worker before requests get 429
+        time_limit: Maximum seconds per solve (None = unlimited)
+        max_expansions: Maximum expanded cells per solve (None = unlimited)
+    """
+    global solver_service
+    if solver_service is not None:
+        solver_service.shutdown()
+    solver_service = SolverService(workers, queue_depth) if workers else None
+    solve_limits.update(time_limit=time_limit, max_expansions=max_expansions)
+
+configure_serving(
+    workers=int(os.environ.get('SOLVER_WORKERS', 0)),
+    queue_depth=int(os.environ.get('SOLVER_QUEUE_DEPTH', 16)),
+    time_limit=float(os.environ['SOLVE_TIME_LIMIT']) if os.environ.get('SOLVE_TIME_LIMIT') else None,
+    max_expansions=int(os.environ['SOLVE_MAX_EXPANSIONS']) if os.environ.get('SOLVE_MAX_EXPANSIONS') else None
+)
+
+def parse_budgets(data):
+    """Return the astar_solve budget options of a request, or None if they are invalid"""
+    try:
+        time_limit = float(data['time_limit']) if data.get('time_limit') is not None else None
+        max_expansions = int(data['max_expansions']) if data.get('max_expansions') is not None else None
+    except (TypeError, ValueError):
+        return None
+    if (time_limit is not None and time_limit <= 0) or (max_expansions is not None and max_expansions <= 0):
+        return None
+    return request_budgets(time_limit, max_expansions, solve_limits['time_limit'],
+                           solve_limits['max_expansions'])
+
+def request_maze(data, store_new=True):
+    """
+    Return (maze_id, maze, None) for the maze a request names, or (None, None, error response)
+
+    Args:
+        data: Request JSON with 'maze_id', or a maze in one of the MAZE_FORMATS
+        store_new: Accept an inline maze and store it (False: 'maze_id' is required)
+    """
+    maze_id = data.get('maze_id')  # Handle from an earlier response instead of the maze itself
+    if maze_id is not None:
+        if not is_maze_id(maze_id):
+            return None, None, (jsonify({'error': 'invalid maze_id'}), 400)
+        maze = maze_store.get(maze_id)
+        if maze is None:
+            return None, None, (jsonify({'error': 'unknown maze_id'}), 404)
+        return maze_id, maze, None
+    if not store_new:
+        return None, None, (jsonify({'error': 'maze_id is required'}), 400)
+    try:
+        maze = decode_maze(data)
+    except ValueError as error:
+        return None, None, (jsonify({'error': f"invalid maze: {error}"}), 400)
+    if maze is None:
+        return None, None, (jsonify({'error': 'maze or maze_id is required'}), 400)
+    return maze_store.put(maze), maze, None
+
+def parse_position(value, maze):
+    """Return value as an in-bounds [x, y] of ints, or None if it is not one"""
+    if not isinstance(value, (list, tuple)) or len(value) != 2:
+        return None
+    position = []
+    for coordinate in value:
+        if isinstance(coordinate, float) and coordinate.is_integer():
+            coordinate = int(coordinate)
+        if isinstance(coordinate, bool) or not isinstance(coordinate, int):
+            return None
+        position.append(coordinate)
+    if not (0 <= position[0] < len(maze) and 0 <= position[1] < len(maze[0])):
+        return None
+    return position
+
+def request_positions(data, maze):
+    """Return the request's (start, end), defaulting to the corners, or None if either is invalid"""
+    start = parse_position(data.get('start', [1, 1]), maze)
+    end = parse_position(data.get('end', [len(maze)-2, len(maze[0])-2]), maze)
+    if start is None or end is None:
+        return None
+    return start, end
+
+def busy_response(error):
+    """429 answer for a request the worker pool has no room for"""
+    response = jsonify({'error': f"server busy: {error}"})
+    response.status_code = 429
+    response.headers['Retry-After'] = '1'
+    return response
+
+@app.before_request
+def start_timer():
+    g.request_began = perf_counter()
+
+@app.after_request
+def record_latency(response):
+    began = getattr(g, 'request_began', None)
+    if began is not None and request.endpoint is not None:
+        window = request_latency.setdefault(request.endpoint, LatencyWindow())
+        window.add(perf_counter() - began)
+    return response
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Worker pool queue depth and job latencies, per-endpoint latencies and maze store counters"""
+    return jsonify({
+        'serving': solver_service.metrics() if solver_service is not None else None,
+        'solve_limits': solve_limits,
+        'requests': {endpoint: window.summary() for endpoint, window in request_latency.items()},
+        'maze_store': maze_store.stats()
+    })
+
 @app.route('/')
 def index():
     return render_template('index.html')
 
+# Smallest maze side /generate_maze accepts (a start, an end and walls around them)
+MIN_MAZE_SIZE = 5
+
 @app.route('/generate_maze', methods=['POST'])
 def generate_maze_endpoint():
     data = request.get_json()
-    size = int(data.get('size', 15))
+    try:
+        size = int(data.get('size', 15))
+    except (TypeError, ValueError):
+        size = None
+    # Same cell limit as uploaded mazes (see request_maze)
+    if size is None or size < MIN_MAZE_SIZE or size * size > MAX_CELLS:
+        return jsonify({'error': f"size must be an integer from {MIN_MAZE_SIZE} to {int(MAX_CELLS ** 0.5)}"}), 400
     multiple_paths = data.get('multiple_paths', True)  # Default to True for multiple paths
     wall_removal_probability = data.get('wall_removal_probability', 0.20)  # Increased probability
+    seed = data.get('seed')  # Optional seed for a reproducible maze
+    fmt = data.get('format', 'grid')  # 'grid', 'rle' or 'bits'
+    if fmt not in MAZE_FORMATS:
+        return jsonify({'error': f"format must be one of {', '.join(MAZE_FORMATS)}"}), 400
     
     # Generate maze using modified function with multiple paths
-    maze = generate_maze(size, size, multiple_paths, wall_removal_probability)
+    if solver_service is not None:
+        try:
+            maze = solver_service.generate(size, multiple_paths, wall_removal_probability, seed).result()
+        except QueueFull as error:
+            return busy_response(error)
+    else:
+        maze = generate_maze(size, size, multiple_paths, wall_removal_probability, seed=seed)
     
     return jsonify({
-        'maze': maze,
+        **format_maze(maze, fmt),
+        'maze_id': maze_store.put(maze),
         'start': [1, 1],
         'end': [size-2, size-2]
     })
 
+# Heuristics compared by /solve_maze, with their display order. Names are the labels the
+# page shows; the solver matches them case-insensitively ('KNN' is the knn heuristic).
+HEURISTIC_TYPES = ['manhattan', 'KNN', 'decision_tree', 'landmark']
+DISPLAY_ORDER = {
+    'manhattan': 1,
+    'KNN': 2,
+    'decision_tree': 3,
+    'landmark': 4
+}
+
+# Search engines selectable with the 'engine' field of /solve_maze
+SEARCH_ENGINES = ['grid', 'jps']
+
 @app.route('/solve_maze', methods=['POST'])
 def solve_maze_endpoint():
     data = request.get_json()
-    maze = data.get('maze')
-    start = data.get('start', [1, 1])
-    end = data.get('end', [len(maze)-2, len(maze[0])-2])
+    maze_id, maze, error = request_maze(data)
+    if error is not None:
+        return error
+    positions = request_positions(data, maze)
+    if positions is None:
+        return jsonify({'error': 'start and end must be [x, y] cells inside the maze'}), 400
+    start, end = positions
+    parallel = data.get('parallel', False)  # Run the heuristics on the worker process pool
+    stream = data.get('stream', False)  # Send each result as NDJSON as soon as it is ready
+    fmt = data.get('format', 'grid')  # 'grid', 'path', 'moves' or 'rle'
+    include_stats = data.get('stats', False)  # Add search statistics to each result
+    bidirectional = data.get('bidirectional', False)  # Search from start and end at once
+    engine = data.get('engine', 'grid')  # 'grid' (A*) or 'jps' (Jump Point Search)
+    budgets = parse_budgets(data)  # Optional 'time_limit' (seconds) and 'max_expansions' per heuristic
+    if budgets is None:
+        return jsonify({'error': 'time_limit and max_expansions must be positive numbers'}), 400
+    if engine not in SEARCH_ENGINES:
+        return jsonify({'error': f"engine must be one of {', '.join(SEARCH_ENGINES)}"}), 400
+    if bidirectional and engine != 'grid':
+        return jsonify({'error': "bidirectional search requires the 'grid' engine"}), 400
+    if fmt not in SOLUTION_FORMATS:
+        return jsonify({'error': f"format must be one of {', '.join(SOLUTION_FORMATS)}"}), 400
+    
+    try:
+        solved = iter_results(maze_id, maze, start, end, parallel, bidirectional, engine, budgets)
+    except QueueFull as error:
+        return busy_response(error)
+    
+    def results():
+        for heuristic_type, path, execution_time, stats, cached in solved:
+            result = {
+                'time': execution_time,
+                **format_solution(maze, path, fmt),
+                'cached': cached,
+                'display_order': DISPLAY_ORDER[heuristic_type]  # Add display order
+            }
+            if 'budget_exceeded' in stats:
+                result['error'] = stats['budget_exceeded']  # Search aborted, path is None
+            if include_stats:
+                result['stats'] = stats
+            yield heuristic_type, result
+    
+    if stream:
+        def generate():
+            for heuristic_type, result in results():
+                yield json.dumps({'heuristic': heuristic_type, **result}) + '\n'
+        response = Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    else:
+        # Solve maze with different heuristics
+        response = jsonify(dict(results()))
+    
+    response.headers['X-Maze-Id'] = maze_id
+    return response
+
+@app.route('/solve_maze_progress', methods=['POST'])
+def solve_maze_progress_endpoint():
+    """
+    Solve like /solve_maze and stream the search progress as NDJSON
+
+    Each line is one message of progress_stream.iter_search_progress: 'start' per
+    heuristic, batches of 'expanded' cells (flat indices x * width + y) while the
+    search runs, then its 'result' in the requested format and a final 'done'.
+    """
+    data = request.get_json()
+    maze_id, maze, error = request_maze(data)
+    if error is not None:
+        return error
+    positions = request_positions(data, maze)
+    if positions is None:
+        return jsonify({'error': 'start and end must be [x, y] cells inside the maze'}), 400
+    start, end = positions
+    fmt = data.get('format', 'path')  # 'grid', 'path', 'moves' or 'rle'
+    batch_size = int(data.get('batch_size', 256))  # Expanded cells per message
+    bidirectional = data.get('bidirectional', False)
+    engine = data.get('engine', 'grid')
+    heuristic_types = data.get('heuristics', HEURISTIC_TYPES)  # Subset of HEURISTIC_TYPES, run in order
+    budgets = parse_budgets(data)
+    if budgets is None:
+        return jsonify({'error': 'time_limit and max_expansions must be positive numbers'}), 400
+    if engine not in SEARCH_ENGINES:
+        return jsonify({'error': f"engine must be one of {', '.join(SEARCH_ENGINES)}"}), 400
+    if bidirectional and engine != 'grid':
+        return jsonify({'error': "bidirectional search requires the 'grid' engine"}), 400
+    if fmt not in SOLUTION_FORMATS:
+        return jsonify({'error': f"format must be one of {', '.join(SOLUTION_FORMATS)}"}), 400
+    if batch_size < 1:
+        return jsonify({'error': 'batch_size must be positive'}), 400
+    unknown = [h for h in heuristic_types if h not in DISPLAY_ORDER]
+    if unknown:
+        return jsonify({'error': f"unknown heuristics: {', '.join(unknown)}"}), 400
+    
+    search = 'jps' if engine == 'jps' else 'bidirectional' if bidirectional else 'astar'
+    service = solver_service
+    if service is not None:
+        # The search runs in this process, but still takes a slot of the worker pool's capacity
+        try:
+            service.reserve()
+        except QueueFull as error:
+            return busy_response(error)
+    release_once = threading.Lock()
+    
+    def release_slot():
+        # Called when the body finishes and when the response is closed; the body may never
+        # be iterated (client gone before the first chunk), so neither alone is enough
+        if service is not None and release_once.acquire(blocking=False):
+            service.release()
+    
+    def get_context(heuristic_type):
+        return maze_store.get_context(maze_id, maze, end, heuristic_type)
+    
+    def generate():
+        progress = iter_search_progress(maze, start, end, heuristic_types, batch_size=batch_size,
+                                        get_context=get_context, engine=engine,
+                                        bidirectional=bidirectional, **budgets)
+        try:
+            for message in progress:
+                if message['type'] == 'result':
+                    heuristic_type, path = message['heuristic'], message['path']
+                    maze_store.put_result(maze_id, start, end, heuristic_type, path,
+                                          message['time'], message['stats'], search)
+                    message = {
+                        'type': 'result',
+                        'heuristic': heuristic_type,
+                        'time': message['time'],
+                        **format_solution(maze, path, fmt),
+                        'stats': message['stats'],
+                        'display_order': DISPLAY_ORDER[heuristic_type]
+                    }
+                yield json.dumps(message) + '\n'
+        finally:
+            progress.close()  # Client gone: stop the search thread
+            release_slot()
+    
+    try:
+        response = Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+        response.call_on_close(release_slot)
+    except BaseException:
+        release_slot()
+        raise
+    response.headers['X-Maze-Id'] = maze_id
+    return response
+
+def iter_results(maze_id, maze, start, end, parallel=False, bidirectional=False, engine='grid',
+                 budgets=None):
+    """
+    Return an iterator of (heuristic_type, path, execution_time, stats, cached) for each heuristic
     
-    # Solve maze with different heuristics
-    results = {}
-    heuristic_types = ['manhattan', 'KNN', 'decision_tree']
+    Results already in the maze store come first; the rest are solved (in completion
+    order if parallel or in serving mode) and stored. Searches that ran out of their
+    budget have path None and 'budget_exceeded' in stats, and are not stored. In
+    serving mode the jobs are submitted before this returns, so QueueFull is raised
+    here rather than while iterating.
+    """
+    search = 'jps' if engine == 'jps' else 'bidirectional' if bidirectional else 'astar'
+    options = {'bidirectional': bidirectional, 'engine': engine, **(budgets or {})}
+    cached, pending = [], []
+    for heuristic_type in HEURISTIC_TYPES:
+        result = maze_store.get_result(maze_id, start, end, heuristic_type, search)
+        if result is not None:
+            cached.append((heuristic_type, *result))
+        else:
+            pending.append(heuristic_type)
     
-    # Define display order
-    display_order = {
-        'manhattan': 1,
-        'KNN': 2,
-        'decision_tree': 3
-    }
+    if solver_service is not None and pending:
+        futures = solver_service.solve(maze, start, end, pending, **options)
+        solved = (future.result() for future in as_completed(futures))
+    elif parallel and pending:
+        solved = iter_solve_parallel(maze, start, end, pending, **options)
+    else:
+        solved = solve_sequential(maze_id, maze, start, end, pending, **options)
     
+    def results():
+        for heuristic_type, path, execution_time, stats in cached:
+            yield heuristic_type, path, execution_time, stats, True
+        for heuristic_type, path, execution_time, stats in solved:
+            if 'budget_exceeded' not in stats:
+                maze_store.put_result(maze_id, start, end, heuristic_type, path, execution_time, stats, search)
+            yield heuristic_type, path, execution_time, stats, False
+    return results()
+
+def solve_sequential(maze_id, maze, start, end, heuristic_types, bidirectional=False, engine='grid',
+                     **budgets):
+    """Yield (heuristic_type, path, execution_time, stats), solving in the request thread"""
     for heuristic_type in heuristic_types:
-        solved_maze, execution_time = astar_solve(maze, start, end, heuristic_type)
-        results[heuristic_type] = {
-            'time': execution_time,
-            'solved_maze': solved_maze,
-            'display_order': display_order[heuristic_type]  # Add display order
-        }
+        context = maze_store.get_context(maze_id, maze, end, heuristic_type)
+        backward_context = maze_store.get_context(maze_id, maze, start, heuristic_type) if bidirectional else None
+        yield solve_job(maze, start, end, heuristic_type,
+                        {'engine': engine, 'context': context, 'bidirectional': bidirectional,
+                         'backward_context': backward_context, **budgets})
+
+@app.route('/update_maze', methods=['POST'])
+def update_maze_endpoint():
+    """
+    Apply a cell diff to a stored maze and return the repaired shortest path
+
+    The request names a stored maze ('maze_id'), 'start', 'end' and 'changes', a
+    list of [x, y, value] cells (value 0 = path, 1 = wall). The goal distance field
+    is repaired incrementally instead of being recomputed; the edited maze gets a
+    new maze_id, which later updates and solves should use.
+    """
+    data = request.get_json()
+    maze_id, maze, error = request_maze(data, store_new=False)
+    if error is not None:
+        return error
+    positions = request_positions(data, maze)
+    if positions is None:
+        return jsonify({'error': 'start and end must be [x, y] cells inside the maze'}), 400
+    start, end = positions
+    changes = data.get('changes', [])
+    fmt = data.get('format', 'path')  # 'grid', 'path', 'moves' or 'rle'
+    if fmt not in SOLUTION_FORMATS:
+        return jsonify({'error': f"format must be one of {', '.join(SOLUTION_FORMATS)}"}), 400
+    
+    planner = planner_pool.take(maze_id, end) or IncrementalPlanner(maze, end)
+    try:
+        stats = planner.update(changes)
+    except (ValueError, TypeError) as error:
+        planner_pool.put(maze_id, planner)  # Nothing was applied, keep it for the next diff
+        return jsonify({'error': f"invalid changes: {error}"}), 400
+    path = planner.path(start)
     
-    return jsonify(results)
+    new_maze_id = maze_store.put(planner.grid.copy())
+    planner_pool.put(new_maze_id, planner)
+    
+    return jsonify({
+        'maze_id': new_maze_id,
+        **format_solution(planner.grid, path, fmt),
+        'stats': stats
+    })
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the maze solver web app")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="worker processes for generate and solve jobs (default: 0, development "
+                             "server solving in the request thread)")
+    parser.add_argument('--queue-depth', type=int, default=16,
+                        help="jobs allowed to wait for a worker before answering 429 (default: 16)")
+    parser.add_argument('--time-limit', type=float, help="maximum seconds per solve")
+    parser.add_argument('--max-expansions', type=int, help="maximum expanded cells per solve")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000)
+    args = parser.parse_args(argv)
+
+    if args.workers:
+        configure_serving(args.workers, args.queue_depth, args.time_limit, args.max_expansions)
+        # Request threads only wait on the worker pool, so a threaded server is enough
+        app.run(host=args.host, port=args.port, threaded=True)
+    else:
+        # Budgets given on the command line replace those from the environment
+        if args.time_limit is not None:
+            solve_limits['time_limit'] = args.time_limit
+        if args.max_expansions is not None:
+            solve_limits['max_expansions'] = args.max_expansions
+        app.run(host=args.host, port=args.port, debug=True)
 
 if __name__ == '__main__':
-    app.run(debug=True)
+    main()
@@ -1,10 +1,22 @@
 import heapq
 import time
-from heuristic.manhattan_heuristic import manhattan_distance
-from heuristic.knn_heuristic import get_optimal_heuristic, train_heuristic
-from heuristic.decision_tree_heuristic import dt_heuristic, setup_decision_tree
+from time import perf_counter
+from heuristic.context import get_heuristic_context, normalize_heuristic
+from grid_engine import (SearchBudget, as_costs, as_grid, astar_grid, bidirectional_astar_grid,
+                         jps_grid, mark_path, timed_heuristic)
 
-def astar_solve(maze, start, end, heuristic_type='knn'):
+# Heuristic evaluation mode picked by heuristic_mode='auto'
+AUTO_HEURISTIC_MODES = {
+    'manhattan': 'scalar',
+    'knn': 'table',
+    'decision_tree': 'table',
+    'landmark': 'table',
+}
+
+def astar_solve(maze, start, end, heuristic_type='knn', engine='grid', path_only=False,
+                open_list='heap', stats=None, heuristic_mode='auto', context=None, trace=None,
+                bidirectional=False, backward_context=None, max_expansions=None, time_limit=None,
+                costs=None):
     """algorithm for maze solving
     Enhanced A* algorithm for maze solving with different heuristic functions
     
@@ -12,24 +24,125 @@ def astar_solve(maze, start, end, heuristic_type='knn'):
         maze: 2D grid representing the maze (0=path, 1=wall)
         start: Starting position [x, y]
         end: Goal position [x, y]
-        heuristic_type: Type of heuristic to use ('manhattan', 'knn', 'decision_tree')
+        heuristic_type: Type of heuristic to use ('manhattan', 'knn', 'decision_tree', or
+            'landmark' for the admissible ALT bound; case-insensitive, ValueError if unknown)
+        engine: Search engine ('grid' for the array-backed engine, 'jps' for Jump Point
+            Search on the same arrays, 'list' for the original loop)
+        path_only: If True, return the path instead of a marked copy of the maze
+        open_list: Open list used by the grid engine ('heap', 'indexed' or 'bucket'; the
+            bucket queue raises ValueError on the non-integer estimates of 'knn' and
+            'decision_tree')
+        stats: Optional dict, filled by every engine with search statistics (see
+            astar_grid) plus training_time (heuristic context set-up) and total_time,
+            measured with perf_counter; heuristic_time includes building the table
+        heuristic_mode: How the grid engine evaluates the heuristic: 'scalar' (one call per
+            neighbor), 'batch' (one vectorized call per expansion), 'table' (every open
+            cell precomputed once) or 'auto' (per-heuristic default)
+        context: Trained HeuristicContext for this maze and end; taken from the shared
+            context pool when omitted
+        trace: Optional callback (event, position, g_score) for 'expand' and 'generate'
+            events, called by every engine
+        bidirectional: If True, search from start and end at once (grid engine only,
+            see grid_engine.bidirectional_astar_grid); the backward search uses the
+            same heuristic type trained towards start
+        backward_context: Trained HeuristicContext for this maze and start, used by the
+            backward search; taken from the shared context pool when omitted
+        max_expansions: Optional limit on expanded cells (grid engines only)
+        time_limit: Optional limit in seconds on the whole solve, training included
+            (grid engines only); exceeding either limit raises
+            grid_engine.SearchBudgetExceeded
+        costs: Optional array of small positive integers with the maze's shape, the cost
+            of entering each cell (unit costs when omitted). Heuristics are trained on
+            weighted costs and their Manhattan terms scaled by the cheapest cell cost.
+            Supported by the 'grid' engine without bidirectional search
         
     Returns:
-        tuple: (solved_maze, execution_time)
+        tuple: (solved_maze, execution_time), or (path, execution_time) if path_only
+        is set, where path is a list of [x, y] from start to end (None if unreachable)
     """
     start_time = time.time()
+    perf_start = perf_counter()
+    heuristic_type = normalize_heuristic(heuristic_type)
+    
+    if costs is not None:
+        if engine != 'grid' or bidirectional:
+            raise ValueError("Weighted cells require the 'grid' engine without bidirectional search")
+        costs = as_costs(costs, as_grid(maze))
+    
+    # Get a trained heuristic context for this maze and goal (shared pool by default)
+    if context is None:
+        context = get_heuristic_context(maze, end, heuristic_type, costs)
+    heuristic_func = context.heuristic_func()
+    if bidirectional:
+        if engine != 'grid':
+            raise ValueError("Bidirectional search requires the 'grid' engine")
+        if backward_context is None:
+            backward_context = get_heuristic_context(maze, start, heuristic_type)
+    
+    budget = None
+    if max_expansions is not None or time_limit is not None:
+        if engine not in ('grid', 'jps'):
+            raise ValueError("Search budgets require the 'grid' or 'jps' engine")
+        budget = SearchBudget(max_expansions, perf_start + time_limit if time_limit is not None else None)
+    
+    if stats is not None:
+        stats['training_time'] = perf_counter() - perf_start
+        stats['heuristic_calls'] = 0
+        stats['heuristic_time'] = 0.0
+    
+    if engine in ('grid', 'jps'):
+        grid = context.grid
+        
+        if heuristic_mode == 'auto':
+            heuristic_mode = AUTO_HEURISTIC_MODES.get(heuristic_type, 'scalar')
+        batch_func = backward_batch_func = None
+        table = backward_table = None
+        if heuristic_mode == 'batch':
+            batch_func = context.estimate_batch
+            if bidirectional:
+                backward_batch_func = backward_context.estimate_batch
+        elif heuristic_mode == 'table':
+            table_start = perf_counter()
+            table = context.heuristic_table()
+            if bidirectional:
+                backward_table = backward_context.heuristic_table()
+            if stats is not None:
+                stats['heuristic_time'] += perf_counter() - table_start
+        
+        if bidirectional:
+            path = bidirectional_astar_grid(grid, start, end, heuristic_func,
+                                            backward_context.heuristic_func(), maze,
+                                            open_list=open_list, stats=stats,
+                                            heuristic_batch=batch_func,
+                                            backward_heuristic_batch=backward_batch_func,
+                                            heuristic_table=table,
+                                            backward_heuristic_table=backward_table, trace=trace,
+                                            budget=budget)
+        elif engine == 'jps':
+            path = jps_grid(grid, start, end, heuristic_func, maze,
+                            open_list=open_list, stats=stats,
+                            heuristic_batch=batch_func, heuristic_table=table, trace=trace,
+                            budget=budget)
+        else:
+            path = astar_grid(grid, start, end, heuristic_func, maze,
+                              open_list=open_list, stats=stats,
+                              heuristic_batch=batch_func, heuristic_table=table, trace=trace,
+                              budget=budget, costs=costs)
+        result = path if path_only else mark_path(maze, path)
+        
+        if stats is not None:
+            stats['total_time'] = perf_counter() - perf_start
+        
+        end_time = time.time()
+        execution_time = end_time - start_time
+        
+        return result, execution_time
     
-    # Set up the appropriate heuristic function
-    if heuristic_type == 'knn':
-        # Pre-train the KNN heuristic for better initial estimates
-        train_heuristic(maze, start, end)
-        heuristic_func = lambda pos, goal, m: get_optimal_heuristic(pos, goal, m)
-    elif heuristic_type == 'decision_tree':
-        # Set up the decision tree model
-        setup_decision_tree(maze, start, end)
-        heuristic_func = lambda pos, goal, m: dt_heuristic(pos, goal, m)
-    else:  # Default to manhattan distance
-        heuristic_func = lambda pos, goal, m: manhattan_distance(pos, goal)
+    # Instrumentation for the list engine, filled with the same keys as astar_grid
+    if stats is not None:
+        heuristic_func = timed_heuristic(heuristic_func, stats)
+        search_began = perf_counter()
+    pushes = stale_pops = peak_size = 0
     
     # Define directions (up, right, down, left)
     directions = [(-1, 0), (0, 1), (1, 0), (0, -1)]
@@ -42,6 +155,8 @@ def astar_solve(maze, start, end, heuristic_type='knn'):
     # Format: (f_score, g_score, position)
     initial_h = heuristic_func(start, end, maze)
     heapq.heappush(open_list, (initial_h, 0, start))
+    if trace is not None:
+        trace('generate', tuple(start), 0)
     
     # Initialize closed set and parent dictionary
     closed_set = set()
@@ -50,7 +165,9 @@ def astar_solve(maze, start, end, heuristic_type='knn'):
     # Track best path for training
     actual_distances = {}
     
+    path = None
     while open_list:
+        peak_size = max(peak_size, len(open_list))
         # Get position with lowest f_score
         _, g_score, current = heapq.heappop(open_list)
         
@@ -59,11 +176,14 @@ def astar_solve(maze, start, end, heuristic_type='knn'):
         
         # Skip if already processed
         if current_tuple in closed_set:
+            stale_pops += 1
             continue
             
         # Mark as visited
         closed_set.add(current_tuple)
         actual_distances[current_tuple] = g_score
+        if trace is not None:
+            trace('expand', current_tuple, g_score)
         
         # Check if we reached the end
         if current == end:
@@ -73,15 +193,8 @@ def astar_solve(maze, start, end, heuristic_type='knn'):
                 path.append(current)
                 current = parent[tuple(current)]
             path.append(start)
-            
-            # Mark path on maze copy (with 2s)
-            for x, y in path:
-                maze_copy[x][y] = 2
-            
-            end_time = time.time()
-            execution_time = end_time - start_time
-            
-            return maze_copy, execution_time
+            path.reverse()
+            break
             
         # Check neighbors
         for dx, dy in directions:
@@ -104,12 +217,29 @@ def astar_solve(maze, start, end, heuristic_type='knn'):
                 
                 # Add to open list
                 heapq.heappush(open_list, (f_score, tentative_g, neighbor))
+                pushes += 1
+                if trace is not None:
+                    trace('generate', neighbor_tuple, tentative_g)
                 
                 # Only update parent if this is a new path or a better path
                 if neighbor_tuple not in parent or tentative_g < actual_distances.get(neighbor_tuple, float('inf')):
                     parent[neighbor_tuple] = current
     
-    # No path found
-    end_time = time.time()
-    execution_time = end_time - start_time
+    if stats is not None:
+        search_time = perf_counter() - search_began
+        stats['search_time'] = search_time - stats['heuristic_time']
+        stats.update({'peak_open_size': peak_size, 'stale_pops': stale_pops,
+                      'generated_nodes': pushes, 're_pushes': 0})
+        stats['expanded_nodes'] = len(closed_set)
+        stats['path_length'] = len(path) - 1 if path else None
+        stats['path_cost'] = len(path) - 1 if path else None
+        stats['total_time'] = perf_counter() - perf_start
+    
+    execution_time = time.time() - start_time
+    if path_only:
+        return path, execution_time
+    
+    # Mark path on maze copy (with 2s)
+    for x, y in path or []:
+        maze_copy[x][y] = 2
     return maze_copy, execution_time
@@ -0,0 +1,162 @@
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from maze_solver import MazeSolver
+from maze_format import load_maze, read_header
+
+DEFAULT_HEURISTICS = ['manhattan', 'knn', 'decision_tree']
+
+def iter_maze_records(source):
+    """
+    Lazily read maze records from a directory, a JSON-lines file or stdin
+
+    Each record is a dict like the /generate_maze response: {'maze', 'start', 'end'},
+    with an optional 'id'. start and end default to [1, 1] and the opposite corner.
+    Binary *.maze files (see maze_format) yield a 'maze_file' path instead of the
+    grid; workers memory-map the file themselves and use its header's start and end.
+
+    Args:
+        source: Directory of *.json and *.maze files, a *.jsonl file (one record
+            per line), or '-' for JSON lines on stdin
+
+    Yields:
+        Record dicts with 'id', 'maze' (or 'maze_file'), 'start' and 'end' set
+    """
+    if source != '-' and os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            record_id = os.path.splitext(name)[0]
+            if name.endswith('.json'):
+                with open(os.path.join(source, name)) as f:
+                    yield _normalize_record(json.load(f), record_id)
+            elif name.endswith('.maze'):
+                maze_file = os.path.join(source, name)
+                header = read_header(maze_file)
+                yield {'id': record_id, 'maze_file': maze_file,
+                       'start': header['start'], 'end': header['end']}
+        return
+
+    stream = sys.stdin if source == '-' else open(source)
+    try:
+        for line_number, line in enumerate(stream, 1):
+            if line.strip():
+                yield _normalize_record(json.loads(line), line_number)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+def _normalize_record(record, default_id):
+    maze = record['maze']
+    record.setdefault('id', default_id)
+    record.setdefault('start', [1, 1])
+    record.setdefault('end', [len(maze) - 2, len(maze[0]) - 2])
+    return record
+
+def solve_record(record, heuristic_types):
+    """
+    Solve one maze record with each heuristic
+
+    Returns:
+        List of result dicts (id, heuristic, path_length, expansions, time);
+        path_length is None when the end is unreachable
+    """
+    maze = record.get('maze')
+    if maze is None:
+        maze, _ = load_maze(record['maze_file'])
+
+    # One solver per maze so the heuristics share its array form and wall counts
+    solver = MazeSolver(maze)
+    results = []
+    for heuristic_type in heuristic_types:
+        stats = {}
+        path, execution_time = solver.solve(record['start'], record['end'], heuristic_type, stats=stats)
+        results.append({
+            'id': record['id'],
+            'heuristic': heuristic_type,
+            'path_length': len(path) - 1 if path else None,
+            'expansions': stats.get('expanded_nodes'),
+            'time': execution_time,
+        })
+    return results
+
+def _solve_chunk(records, heuristic_types):
+    """Worker entry point: solve a chunk of records"""
+    results = []
+    for record in records:
+        results.extend(solve_record(record, heuristic_types))
+    return results
+
+def _chunks(records, chunksize):
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) == chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def solve_batch(records, output, heuristic_types=None, workers=None, chunksize=16):
+    """
+    Solve many mazes across a process pool, writing results as they complete
+
+    Only a bounded number of chunks is in flight at any time, so memory stays
+    flat regardless of how many records the iterable yields.
+
+    Args:
+        records: Iterable of maze records (see iter_maze_records)
+        output: Text stream receiving one JSON result per line
+        heuristic_types: Heuristics to run on every maze (defaults to all three)
+        workers: Number of worker processes (defaults to the CPU count)
+        chunksize: Records per task sent to a worker
+
+    Returns:
+        Number of result lines written
+    """
+    heuristic_types = heuristic_types or DEFAULT_HEURISTICS
+    workers = workers or os.cpu_count()
+    max_in_flight = 2 * workers
+    written = 0
+
+    def write(results):
+        for result in results:
+            output.write(json.dumps(result) + '\n')
+        output.flush()
+        return len(results)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = set()
+        for chunk in _chunks(records, chunksize):
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    written += write(future.result())
+            in_flight.add(pool.submit(_solve_chunk, chunk, heuristic_types))
+
+        for future in wait(in_flight).done:
+            written += write(future.result())
+
+    return written
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve a corpus of mazes with several heuristics")
+    parser.add_argument('source', help="directory of *.json / *.maze mazes, a *.jsonl file, or - for stdin")
+    parser.add_argument('-o', '--output', default='-', help="JSON-lines results file (default: stdout)")
+    parser.add_argument('--heuristics', nargs='+', default=DEFAULT_HEURISTICS,
+                        help="heuristics to run on every maze")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument('--chunksize', type=int, default=16, help="mazes per worker task")
+    args = parser.parse_args(argv)
+
+    output = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        written = solve_batch(iter_maze_records(args.source), output, args.heuristics,
+                              args.workers, args.chunksize)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    print(f"Wrote {written} results", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
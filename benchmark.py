@@ -0,0 +1,140 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import numpy as np
+from astar_algorithm import astar_solve
+from benchmark_report import measure, print_comparison, result_key
+from maze_generator import generate_maze, generate_maze_array
+from heuristic.context import context_pool
+from heuristic.distance_cache import distance_cache
+from heuristic.landmark_heuristic import landmark_cache
+from heuristic.knn_heuristic import KNNHeuristic, train_heuristic
+from heuristic.decision_tree_heuristic import setup_decision_tree
+
+DEFAULT_SIZES = [41, 101, 201, 501, 1001, 2001]
+QUICK_SIZES = [41, 101, 201]
+DEFAULT_PROBABILITIES = [0.0, 0.25, 0.5]
+DEFAULT_HEURISTICS = ['manhattan', 'knn', 'decision_tree']
+BENCHMARKS = ['generate', 'solve', 'train_knn', 'train_decision_tree']
+
+def clear_caches():
+    """Drop cached distance fields, landmark tables and trained contexts so each run starts cold"""
+    distance_cache.clear()
+    landmark_cache.clear()
+    context_pool.clear()
+
+def run_benchmarks(sizes=None, probabilities=None, heuristics=None, benchmarks=None,
+                   warmup=1, repeats=5, seed=0, cold=True, log=None):
+    """
+    Sweep maze sizes, wall removal probabilities and heuristics
+
+    Every case uses the same seeded maze, so results are comparable between runs.
+    Solves go from [1, 1] to the opposite corner.
+
+    Args:
+        sizes: Maze side lengths (defaults to DEFAULT_SIZES)
+        probabilities: wall_removal_probability values (defaults to DEFAULT_PROBABILITIES)
+        heuristics: Heuristics for the solve benchmark (defaults to all three)
+        benchmarks: Subset of BENCHMARKS to run
+        warmup: Untimed runs per case
+        repeats: Timed runs per case
+        seed: Maze generation seed
+        cold: Clear heuristic caches before every run (see measure)
+        log: Optional text stream for progress lines
+
+    Returns:
+        List of result dicts (benchmark, size, probability, heuristic plus measure() fields)
+    """
+    sizes = sizes or DEFAULT_SIZES
+    probabilities = DEFAULT_PROBABILITIES if probabilities is None else probabilities
+    heuristics = heuristics or DEFAULT_HEURISTICS
+    benchmarks = benchmarks or BENCHMARKS
+    results = []
+
+    def record(benchmark, size, probability, heuristic, func):
+        result = {'benchmark': benchmark, 'size': size, 'probability': probability, 'heuristic': heuristic}
+        result.update(measure(func, warmup, repeats, clear_caches if cold else None))
+        results.append(result)
+        if log is not None:
+            log.write(f"{result_key(result)}: median {result['median']:.6f}s, "
+                      f"peak {result['peak_memory'] / 1024:.0f} KiB\n")
+            log.flush()
+
+    for size in sizes:
+        for probability in probabilities:
+            start, end = [1, 1], [size - 2, size - 2]
+            if 'generate' in benchmarks:
+                record('generate', size, probability, None,
+                       lambda: generate_maze(size, size, probability > 0, probability, seed=seed) and None)
+
+            # Solver and training inputs use the fast array generator with the same seed
+            maze = generate_maze_array(size, size, probability > 0, probability, seed=seed)
+
+            if 'solve' in benchmarks:
+                for heuristic in heuristics:
+                    def solve(heuristic=heuristic):
+                        stats = {}
+                        path, _ = astar_solve(maze, start, end, heuristic, path_only=True, stats=stats)
+                        return {'expansions': stats['expanded_nodes'],
+                                'path_length': len(path) - 1 if path else None}
+                    record('solve', size, probability, heuristic, solve)
+            if 'train_knn' in benchmarks:
+                record('train_knn', size, probability, 'knn',
+                       lambda: train_heuristic(maze, start, end, KNNHeuristic()) and None)
+            if 'train_decision_tree' in benchmarks:
+                record('train_decision_tree', size, probability, 'decision_tree',
+                       lambda: setup_decision_tree(maze, start, end) and None)
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark maze generation, heuristic training and A* solving")
+    parser.add_argument('--sizes', type=int, nargs='+', help="maze side lengths (default: 41 to 2001)")
+    parser.add_argument('--quick', action='store_true', help="only sizes 41, 101 and 201 with 3 repeats")
+    parser.add_argument('--probabilities', type=float, nargs='+', default=DEFAULT_PROBABILITIES,
+                        help="wall_removal_probability values (0 disables multiple paths)")
+    parser.add_argument('--heuristics', nargs='+', default=DEFAULT_HEURISTICS, help="heuristics to solve with")
+    parser.add_argument('--benchmarks', nargs='+', choices=BENCHMARKS, default=BENCHMARKS)
+    parser.add_argument('--warmup', type=int, default=1, help="untimed runs per case")
+    parser.add_argument('--repeats', type=int, default=None, help="timed runs per case (default: 5)")
+    parser.add_argument('--seed', type=int, default=0, help="maze generation seed")
+    parser.add_argument('--warm', action='store_true',
+                        help="keep distance field and context caches between runs")
+    parser.add_argument('-o', '--output', help="write JSON results to this file")
+    parser.add_argument('--baseline', help="JSON results file to compare against")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="relative slowdown reported as a regression (default: 0.10)")
+    args = parser.parse_args(argv)
+
+    sizes = args.sizes or (QUICK_SIZES if args.quick else DEFAULT_SIZES)
+    repeats = args.repeats or (3 if args.quick else 5)
+    results = run_benchmarks(sizes, args.probabilities, args.heuristics, args.benchmarks,
+                             args.warmup, repeats, args.seed, not args.warm, log=sys.stderr)
+
+    if args.output:
+        report = {
+            'metadata': {
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'platform': platform.platform(),
+                'seed': args.seed,
+                'warmup': args.warmup,
+                'repeats': repeats,
+                'cold': not args.warm,
+            },
+            'results': results,
+        }
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        regressions = print_comparison(results, baseline, args.threshold)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+import tracemalloc
+from time import perf_counter
+import numpy as np
+
+PERCENTILES = [10, 90]
+# Fields identifying a benchmark case across runs, in key order (None / missing are skipped)
+KEY_FIELDS = ('benchmark', 'size', 'probability', 'heuristic', 'entry_point')
+
+def summarize(times):
+    """Return median, min, max and the PERCENTILES (p10, p90) of a list of timings"""
+    result = {
+        'median': float(np.median(times)),
+        'min': min(times),
+        'max': max(times),
+    }
+    for percentile, value in zip(PERCENTILES, np.percentile(times, PERCENTILES)):
+        result[f'p{percentile}'] = float(value)
+    return result
+
+def measure(func, warmup=1, repeats=5, reset=None):
+    """
+    Time a benchmark function
+
+    Warmup runs are discarded, then func is timed repeats times with perf_counter.
+    One extra run under tracemalloc records the peak Python memory, kept apart so
+    tracing overhead does not distort the timings.
+
+    Args:
+        func: Callable with no arguments; may return a dict of counters (e.g. expansions)
+        warmup: Untimed runs before measuring
+        repeats: Timed runs
+        reset: Optional callable run (untimed) before every run, e.g. to clear caches
+
+    Returns:
+        Dict with the summarize() fields, repeats, peak_memory (bytes) and the
+        counters returned by the last run
+    """
+    for _ in range(warmup):
+        if reset is not None:
+            reset()
+        func()
+
+    times = []
+    counters = None
+    for _ in range(repeats):
+        if reset is not None:
+            reset()
+        began = perf_counter()
+        counters = func()
+        times.append(perf_counter() - began)
+
+    if reset is not None:
+        reset()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    result = summarize(times)
+    result.update(repeats=repeats, peak_memory=peak_memory)
+    result.update(counters or {})
+    return result
+
+def result_key(result):
+    """Identify a benchmark case across runs, e.g. 'solve/201/0.25/knn' or 'startup/app'"""
+    return '/'.join(str(result[field]) for field in KEY_FIELDS if result.get(field) is not None)
+
+def compare_results(results, baseline, threshold=0.10):
+    """
+    Compare median times against a baseline run
+
+    Args:
+        results: Result dicts of this run
+        baseline: Result dicts from an earlier run (e.g. loaded from its JSON file)
+        threshold: Relative slowdown above which a case counts as a regression
+
+    Returns:
+        List of (key, baseline_median, median, ratio, regressed) for cases present in both
+    """
+    baseline_medians = {result_key(result): result['median'] for result in baseline}
+    comparison = []
+    for result in results:
+        key = result_key(result)
+        if key in baseline_medians:
+            ratio = result['median'] / baseline_medians[key] if baseline_medians[key] else float('inf')
+            comparison.append((key, baseline_medians[key], result['median'], ratio, ratio > 1 + threshold))
+    return comparison
+
+def print_comparison(results, baseline, threshold=0.10):
+    """Print compare_results one case per line and return the number of regressions"""
+    regressions = 0
+    for key, baseline_median, median, ratio, regressed in compare_results(results, baseline, threshold):
+        marker = 'REGRESSION' if regressed else ''
+        print(f"{key:45s} {baseline_median:10.6f}s -> {median:10.6f}s  x{ratio:.2f} {marker}")
+        regressions += regressed
+    print(f"{regressions} regression(s) above {threshold:.0%}")
+    return regressions
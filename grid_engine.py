@@ -0,0 +1,668 @@
+from array import array
+from time import perf_counter
+import numpy as np
+from open_lists import make_open_list, open_list_stats
+
+# Directions (up, right, down, left), same order as astar_solve
+DIRECTIONS = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+
+def as_grid(maze):
+    """
+    Convert a maze to a contiguous uint8 array (0=path, 1=wall)
+
+    Args:
+        maze: 2D grid as nested lists or a NumPy array
+
+    Returns:
+        C-contiguous 2D uint8 array (no copy if maze already is one)
+    """
+    return np.ascontiguousarray(maze, dtype=np.uint8)
+
+def as_costs(costs, grid):
+    """
+    Convert cell costs to a contiguous uint8 array matching grid
+
+    Args:
+        costs: 2D array of small positive integers, the cost of entering each cell
+        grid: The maze grid the costs belong to
+
+    Returns:
+        C-contiguous 2D uint8 array
+
+    Raises:
+        ValueError: If the shape differs, a value is outside 0-255, or an open cell costs less than 1
+    """
+    values = np.asarray(costs)
+    if values.shape != grid.shape:
+        raise ValueError(f"Cost array shape {values.shape} does not match maze shape {grid.shape}")
+    if values.size and (values.min() < 0 or values.max() > 255):
+        raise ValueError("Cell costs must fit in 0-255")
+    values = np.ascontiguousarray(values, dtype=np.uint8)
+    if (values[grid == 0] < 1).any():
+        raise ValueError("Open cells must cost at least 1")
+    return values
+
+def pad_grid(grid):
+    """Surround the grid with a one-cell wall border so flat neighbors never need bounds checks"""
+    return np.pad(grid, 1, mode='constant', constant_values=1)
+
+def to_flat(position, padded_width):
+    """Encode an (x, y) maze position as a flat index into the padded grid"""
+    return (position[0] + 1) * padded_width + position[1] + 1
+
+def from_flat(index, padded_width):
+    """Decode a flat padded-grid index back into an [x, y] maze position"""
+    x, y = divmod(index, padded_width)
+    return [x - 1, y - 1]
+
+def build_heuristic_table(grid, heuristic_batch):
+    """
+    Evaluate a batch heuristic once for every open cell of the grid
+
+    Args:
+        grid: 2D uint8 array (0=path)
+        heuristic_batch: Function ((N, 2) positions) -> (N,) estimates
+
+    Returns:
+        float64 array of the grid's shape (0 for blocked cells)
+    """
+    table = np.zeros(grid.shape, dtype=np.float64)
+    positions = np.argwhere(grid == 0)
+    if len(positions):
+        table[positions[:, 0], positions[:, 1]] = heuristic_batch(positions)
+    return table
+
+class SearchBudgetExceeded(Exception):
+    """Raised by a search that used up its SearchBudget"""
+    def __init__(self, reason, expanded):
+        super().__init__(reason, expanded)  # Keep both in args so the error pickles across processes
+        self.reason = reason
+        self.expanded = expanded
+
+    def __str__(self):
+        return f"{self.reason} budget exceeded after {self.expanded} expansions"
+
+class SearchBudget:
+    """
+    Limits on one search: a number of expanded cells and/or a perf_counter deadline.
+
+    Engines wrap their open list's pop with limit_pop(), so the search loops stay
+    unchanged. The deadline is checked every CHECK_INTERVAL expansions.
+    """
+    CHECK_INTERVAL = 256
+
+    def __init__(self, max_expansions=None, deadline=None):
+        self.max_expansions = max_expansions
+        self.deadline = deadline
+        self.expanded = 0
+
+    def limit_pop(self, pop):
+        """Wrap pop so it raises SearchBudgetExceeded once the budget is used up"""
+        max_expansions = self.max_expansions if self.max_expansions is not None else float('inf')
+        deadline = self.deadline
+        interval = self.CHECK_INTERVAL
+
+        def pop_within_budget():
+            # The count lives on the budget so both sides of a bidirectional search share it
+            self.expanded += 1
+            if self.expanded > max_expansions:
+                raise SearchBudgetExceeded('expansion', self.expanded - 1)
+            if deadline is not None and not self.expanded % interval and perf_counter() > deadline:
+                raise SearchBudgetExceeded('time', self.expanded - 1)
+            return pop()
+        return pop_within_budget
+
+def timed_heuristic(heuristic_func, stats):
+    """Wrap a (position, goal, maze) heuristic so calls and time are added to stats"""
+    def timed(position, goal, maze):
+        began = perf_counter()
+        h_score = heuristic_func(position, goal, maze)
+        stats['heuristic_time'] += perf_counter() - began
+        stats['heuristic_calls'] += 1
+        return h_score
+    return timed
+
+def timed_heuristic_batch(heuristic_batch, stats):
+    """Wrap a batch heuristic so evaluated positions and time are added to stats"""
+    def timed(positions):
+        began = perf_counter()
+        h_scores = heuristic_batch(positions)
+        stats['heuristic_time'] += perf_counter() - began
+        stats['heuristic_calls'] += len(positions)
+        return h_scores
+    return timed
+
+def astar_grid(grid, start, end, heuristic_func, maze=None, open_list='heap',
+               tie_break='high_g', stats=None, heuristic_batch=None, heuristic_table=None,
+               trace=None, budget=None, costs=None):
+    """
+    A* search over a uint8 grid using flat integer cell indices
+
+    Cells are addressed as flat indices into a wall-padded copy of the grid.
+    g-scores, closed flags and parents live in preallocated arrays instead of
+    dicts and sets, so no tuples are built per expansion.
+
+    Args:
+        grid: 2D uint8 array (0=path, anything else is blocked)
+        start: Starting position [x, y]
+        end: Goal position [x, y]
+        heuristic_func: Function (position, goal, maze) -> estimate
+        maze: Maze passed through to heuristic_func (defaults to grid)
+        open_list: Open list type ('heap', 'indexed' or 'bucket'), see open_lists.make_open_list
+        tie_break: Ordering among equal f-scores ('high_g' or 'low_g')
+        stats: Optional dict, filled with expanded_nodes, generated_nodes, re_pushes,
+            peak_open_size, stale_pops, path_length, path_cost, heuristic_calls, heuristic_time and
+            search_time (perf_counter seconds, excluding heuristic time). Table lookups
+            are not counted as heuristic calls.
+        heuristic_batch: Optional function ((N, 2) positions) -> (N,) estimates, called
+            once per expansion for all new neighbors instead of heuristic_func
+        heuristic_table: Optional precomputed estimates with the grid's shape (see
+            build_heuristic_table); takes precedence over both heuristic functions
+        trace: Optional callback (event, position, g_score) called with 'expand' for
+            every expanded cell and 'generate' for every cell pushed to the open list
+        budget: Optional SearchBudget; the search raises SearchBudgetExceeded when it runs out
+        costs: Optional uint8 array (see as_costs); entering a cell costs its value
+            instead of 1, and the heuristic must estimate costs, not steps
+
+    Returns:
+        List of [x, y] positions from start to end, or None if unreachable
+    """
+    if maze is None:
+        maze = grid
+
+    height, width = grid.shape
+    padded_width = width + 2
+    cells = pad_grid(grid).tobytes()
+    size = len(cells)
+    # Cost of entering each cell; all ones keeps unit-cost searches on the same loop
+    if costs is not None:
+        step_costs = np.pad(costs, 1, constant_values=1).tobytes()
+    else:
+        step_costs = b'\x01' * size
+
+    # Flat offsets matching DIRECTIONS
+    offsets = (-padded_width, 1, padded_width, -1)
+
+    start_index = to_flat(start, padded_width)
+    end_index = to_flat(end, padded_width)
+    goal = (end[0], end[1])
+
+    # Preallocated search state
+    unreached = 2 ** 31 - 1
+    g_scores = array('l', [unreached]) * size
+    parents = array('l', [-1]) * size
+    closed = bytearray(size)
+
+    table = None
+    if heuristic_table is not None:
+        padded_table = np.pad(np.asarray(heuristic_table, dtype=np.float64), 1)
+        table = array('d')
+        table.frombytes(padded_table.tobytes())
+
+    queue = make_open_list(open_list, size, tie_break)
+    push = queue.push
+    pop = queue.pop
+    if budget is not None:
+        pop = budget.limit_pop(pop)
+
+    # Instrumentation wraps the callables so the search loop itself stays unchanged
+    if stats is not None:
+        stats.setdefault('heuristic_calls', 0)
+        stats.setdefault('heuristic_time', 0.0)
+        heuristic_time_before = stats['heuristic_time']
+        heuristic_func = timed_heuristic(heuristic_func, stats)
+        if heuristic_batch is not None:
+            heuristic_batch = timed_heuristic_batch(heuristic_batch, stats)
+        search_began = perf_counter()
+
+    if trace is not None:
+        def push(item, f_score, g_score, push=push):
+            trace('generate', from_flat(item, padded_width), g_score)
+            push(item, f_score, g_score)
+
+        def pop(pop=pop):
+            item, g_score = pop()
+            trace('expand', from_flat(item, padded_width), g_score)
+            return item, g_score
+
+    g_scores[start_index] = 0
+    push(start_index, heuristic_func(start, end, maze), 0)
+
+    path = None
+    while queue:
+        current, g_score = pop()
+        closed[current] = 1
+
+        if current == end_index:
+            path = reconstruct_path(parents, current, padded_width)
+            break
+
+        batch = []
+        for offset in offsets:
+            neighbor = current + offset
+            tentative_g = g_score + step_costs[neighbor]
+            if cells[neighbor] or closed[neighbor] or tentative_g >= g_scores[neighbor]:
+                continue
+
+            g_scores[neighbor] = tentative_g
+            parents[neighbor] = current
+            if table is not None:
+                push(neighbor, tentative_g + table[neighbor], tentative_g)
+            elif heuristic_batch is not None:
+                batch.append(neighbor)
+            else:
+                x, y = divmod(neighbor, padded_width)
+                h_score = heuristic_func((x - 1, y - 1), goal, maze)
+                push(neighbor, tentative_g + h_score, tentative_g)
+
+        # One vectorized heuristic call for all new neighbors of this expansion
+        if batch:
+            positions = np.array([divmod(neighbor, padded_width) for neighbor in batch]) - 1
+            for neighbor, h_score in zip(batch, heuristic_batch(positions).tolist()):
+                push(neighbor, g_scores[neighbor] + h_score, g_scores[neighbor])
+
+    if stats is not None:
+        search_time = perf_counter() - search_began
+        stats['search_time'] = search_time - (stats['heuristic_time'] - heuristic_time_before)
+        stats.update(open_list_stats(queue))
+        stats['expanded_nodes'] = closed.count(1)
+        stats['path_length'] = len(path) - 1 if path else None
+        stats['path_cost'] = g_scores[end_index] if path else None
+    return path
+
+def bidirectional_astar_grid(grid, start, end, heuristic_func, backward_heuristic_func, maze=None,
+                             open_list='heap', tie_break='high_g', stats=None,
+                             heuristic_batch=None, backward_heuristic_batch=None,
+                             heuristic_table=None, backward_heuristic_table=None, trace=None,
+                             budget=None):
+    """
+    Bidirectional A* search over a uint8 grid
+
+    A forward search from start (guided towards end) and a backward search from
+    end (guided towards start) run in alternation, always expanding the side with
+    the smaller open list. Whenever a cell reached by one side is generated by the
+    other, the joined path length updates the best meeting cost mu. The search
+    stops once mu is no larger than the lowest f on either open list, which
+    guarantees the shortest path when the heuristics are admissible.
+
+    Args:
+        grid: 2D uint8 array (0=path, anything else is blocked)
+        start: Starting position [x, y]
+        end: Goal position [x, y]
+        heuristic_func: Function (position, goal, maze) -> estimate, called with goal=end
+        backward_heuristic_func: Same, called with goal=start for the backward search
+        maze: Maze passed through to the heuristic functions (defaults to grid)
+        open_list: Open list type used by both searches, see open_lists.make_open_list
+        tie_break: Ordering among equal f-scores ('high_g' or 'low_g')
+        stats: Optional dict, filled like astar_grid (counters summed over both sides)
+            plus forward_expanded, backward_expanded and meeting_point
+        heuristic_batch, backward_heuristic_batch: Optional batch heuristics per direction
+        heuristic_table, backward_heuristic_table: Optional precomputed estimates per
+            direction (see build_heuristic_table); take precedence over the functions
+        trace: Optional callback (event, position, g_score) like astar_grid, where
+            g_score is the distance from the side's own origin
+        budget: Optional SearchBudget shared by both directions (see astar_grid)
+
+    Returns:
+        List of [x, y] positions from start to end, or None if unreachable
+    """
+    if maze is None:
+        maze = grid
+
+    height, width = grid.shape
+    padded_width = width + 2
+    cells = pad_grid(grid).tobytes()
+    size = len(cells)
+    offsets = (-padded_width, 1, padded_width, -1)
+    unreached = 2 ** 31 - 1
+
+    if stats is not None:
+        stats.setdefault('heuristic_calls', 0)
+        stats.setdefault('heuristic_time', 0.0)
+        heuristic_time_before = stats['heuristic_time']
+        search_began = perf_counter()
+
+    def make_side(origin, target, func, batch_func, table):
+        """Search state of one direction; estimate(indices) returns h for each index"""
+        if table is not None:
+            padded_table = np.pad(np.asarray(table, dtype=np.float64), 1)
+            values = array('d')
+            values.frombytes(padded_table.tobytes())
+            estimate = lambda indices: [values[index] for index in indices]
+        else:
+            if stats is not None:
+                func = timed_heuristic(func, stats)
+                if batch_func is not None:
+                    batch_func = timed_heuristic_batch(batch_func, stats)
+            goal = (target[0], target[1])
+            if batch_func is not None:
+                def estimate(indices):
+                    positions = np.array([divmod(index, padded_width) for index in indices]) - 1
+                    return batch_func(positions).tolist()
+            else:
+                def estimate(indices):
+                    return [func((index // padded_width - 1, index % padded_width - 1), goal, maze)
+                            for index in indices]
+        queue = make_open_list(open_list, size, tie_break)
+        origin_index = to_flat(origin, padded_width)
+        g_scores = array('l', [unreached]) * size
+        g_scores[origin_index] = 0
+        queue.push(origin_index, estimate([origin_index])[0], 0)
+        if trace is not None:
+            trace('generate', list(origin), 0)
+        return {'queue': queue, 'g': g_scores, 'parents': array('l', [-1]) * size,
+                'closed': bytearray(size), 'estimate': estimate,
+                'pop': budget.limit_pop(queue.pop) if budget is not None else queue.pop}
+
+    forward = make_side(start, end, heuristic_func, heuristic_batch, heuristic_table)
+    backward = make_side(end, start, backward_heuristic_func, backward_heuristic_batch,
+                         backward_heuristic_table)
+
+    best_cost = unreached  # mu, the shortest start-end path found so far
+    meeting = -1
+    if to_flat(start, padded_width) == to_flat(end, padded_width):
+        best_cost, meeting = 0, to_flat(start, padded_width)
+
+    while forward['queue'] and backward['queue']:
+        if best_cost <= max(forward['queue'].min_f(), backward['queue'].min_f()):
+            break
+
+        # Cardinality criterion: expand the side with fewer open cells
+        if len(forward['queue']) <= len(backward['queue']):
+            side, other = forward, backward
+        else:
+            side, other = backward, forward
+        g_scores, parents, closed = side['g'], side['parents'], side['closed']
+        other_g = other['g']
+
+        current, g_score = side['pop']()
+        closed[current] = 1
+        if trace is not None:
+            trace('expand', from_flat(current, padded_width), g_score)
+
+        tentative_g = g_score + 1
+        generated = []
+        for offset in offsets:
+            neighbor = current + offset
+            if cells[neighbor] or closed[neighbor] or tentative_g >= g_scores[neighbor]:
+                continue
+            g_scores[neighbor] = tentative_g
+            parents[neighbor] = current
+            generated.append(neighbor)
+            if other_g[neighbor] != unreached and tentative_g + other_g[neighbor] < best_cost:
+                best_cost = tentative_g + other_g[neighbor]
+                meeting = neighbor
+
+        if generated:
+            push = side['queue'].push
+            for neighbor, h_score in zip(generated, side['estimate'](generated)):
+                push(neighbor, tentative_g + h_score, tentative_g)
+                if trace is not None:
+                    trace('generate', from_flat(neighbor, padded_width), tentative_g)
+
+    path = None
+    if meeting != -1:
+        # Forward half ends at the meeting cell, backward parents lead on to end
+        path = reconstruct_path(forward['parents'], meeting, padded_width)
+        index = backward['parents'][meeting]
+        while index != -1:
+            path.append(from_flat(index, padded_width))
+            index = backward['parents'][index]
+
+    if stats is not None:
+        search_time = perf_counter() - search_began
+        stats['search_time'] = search_time - (stats['heuristic_time'] - heuristic_time_before)
+        forward_stats = open_list_stats(forward['queue'])
+        backward_stats = open_list_stats(backward['queue'])
+        stats.update({key: forward_stats[key] + backward_stats[key] for key in forward_stats})
+        stats['forward_expanded'] = forward['closed'].count(1)
+        stats['backward_expanded'] = backward['closed'].count(1)
+        stats['expanded_nodes'] = stats['forward_expanded'] + stats['backward_expanded']
+        stats['meeting_point'] = from_flat(meeting, padded_width) if path else None
+        stats['path_length'] = len(path) - 1 if path else None
+        stats['path_cost'] = len(path) - 1 if path else None  # Unit costs only
+    return path
+
+def jps_grid(grid, start, end, heuristic_func, maze=None, open_list='heap',
+             tie_break='high_g', stats=None, heuristic_batch=None, heuristic_table=None,
+             trace=None, budget=None):
+    """
+    Jump Point Search over a uint8 grid with 4-connected unit-cost moves
+
+    Instead of pushing every neighbor, each expansion scans straight lines and
+    only pushes jump points: the goal, cells with a forced neighbor (an open
+    side cell whose counterpart one step back is blocked), and cells on a
+    vertical scan from which a horizontal scan reaches such a point. Horizontal
+    jump points continue horizontally and turn vertically; vertical ones continue
+    vertically and turn horizontally. Open regions and straight corridors are
+    therefore crossed without heap operations, and paths stay optimal with an
+    admissible heuristic.
+
+    Args:
+        Same as astar_grid. stats counts jump points as generated / expanded nodes;
+        trace receives jump points only, and budget counts expanded jump points.
+
+    Returns:
+        List of [x, y] positions from start to end (every cell, not just the jump
+        points), or None if unreachable
+    """
+    if maze is None:
+        maze = grid
+
+    height, width = grid.shape
+    padded_width = width + 2
+    cells = pad_grid(grid).tobytes()
+    size = len(cells)
+
+    start_index = to_flat(start, padded_width)
+    end_index = to_flat(end, padded_width)
+    goal = (end[0], end[1])
+
+    unreached = 2 ** 31 - 1
+    g_scores = array('l', [unreached]) * size
+    parents = array('l', [-1]) * size
+    closed = bytearray(size)
+
+    table = None
+    if heuristic_table is not None:
+        padded_table = np.pad(np.asarray(heuristic_table, dtype=np.float64), 1)
+        table = array('d')
+        table.frombytes(padded_table.tobytes())
+
+    queue = make_open_list(open_list, size, tie_break)
+    push = queue.push
+    pop = queue.pop
+    if budget is not None:
+        pop = budget.limit_pop(pop)
+
+    if stats is not None:
+        stats.setdefault('heuristic_calls', 0)
+        stats.setdefault('heuristic_time', 0.0)
+        heuristic_time_before = stats['heuristic_time']
+        heuristic_func = timed_heuristic(heuristic_func, stats)
+        if heuristic_batch is not None:
+            heuristic_batch = timed_heuristic_batch(heuristic_batch, stats)
+        search_began = perf_counter()
+
+    if trace is not None:
+        def push(item, f_score, g_score, push=push):
+            trace('generate', from_flat(item, padded_width), g_score)
+            push(item, f_score, g_score)
+
+        def pop(pop=pop):
+            item, g_score = pop()
+            trace('expand', from_flat(item, padded_width), g_score)
+            return item, g_score
+
+    def jump_horizontal(index, step):
+        """Scan along a row from index; return the first jump point or -1"""
+        while True:
+            index += step
+            if cells[index]:
+                return -1
+            if index == end_index:
+                return index
+            # Forced neighbor above or below
+            if ((not cells[index - padded_width] and cells[index - step - padded_width]) or
+                    (not cells[index + padded_width] and cells[index - step + padded_width])):
+                return index
+
+    def jump_vertical(index, step):
+        """Scan along a column from index; return the first jump point or -1"""
+        while True:
+            index += step
+            if cells[index]:
+                return -1
+            if index == end_index:
+                return index
+            # Forced neighbor to the left or right
+            if ((not cells[index - 1] and cells[index - step - 1]) or
+                    (not cells[index + 1] and cells[index - step + 1])):
+                return index
+            # A horizontal scan from here reaches a jump point
+            if jump_horizontal(index, 1) != -1 or jump_horizontal(index, -1) != -1:
+                return index
+
+    g_scores[start_index] = 0
+    push(start_index, heuristic_func(start, end, maze), 0)
+
+    path = None
+    while queue:
+        current, g_score = pop()
+        closed[current] = 1
+
+        if current == end_index:
+            path = reconstruct_jump_path(parents, current, padded_width)
+            break
+
+        # Scan directions pruned by the direction we arrived from
+        parent = parents[current]
+        if parent == -1:
+            jumps = ((jump_horizontal, 1), (jump_horizontal, -1),
+                     (jump_vertical, padded_width), (jump_vertical, -padded_width))
+        elif abs(current - parent) < padded_width:
+            step = 1 if current > parent else -1
+            jumps = ((jump_horizontal, step), (jump_vertical, padded_width), (jump_vertical, -padded_width))
+        else:
+            step = padded_width if current > parent else -padded_width
+            jumps = ((jump_vertical, step), (jump_horizontal, 1), (jump_horizontal, -1))
+
+        batch = []
+        for jump, step in jumps:
+            successor = jump(current, step)
+            if successor == -1 or closed[successor]:
+                continue
+            distance = abs(successor - current)
+            if distance >= padded_width:
+                distance //= padded_width
+            tentative_g = g_score + distance
+            if tentative_g >= g_scores[successor]:
+                continue
+
+            g_scores[successor] = tentative_g
+            parents[successor] = current
+            if table is not None:
+                push(successor, tentative_g + table[successor], tentative_g)
+            elif heuristic_batch is not None:
+                batch.append(successor)
+            else:
+                x, y = divmod(successor, padded_width)
+                h_score = heuristic_func((x - 1, y - 1), goal, maze)
+                push(successor, tentative_g + h_score, tentative_g)
+
+        if batch:
+            positions = np.array([divmod(successor, padded_width) for successor in batch]) - 1
+            for successor, h_score in zip(batch, heuristic_batch(positions).tolist()):
+                push(successor, g_scores[successor] + h_score, g_scores[successor])
+
+    if stats is not None:
+        search_time = perf_counter() - search_began
+        stats['search_time'] = search_time - (stats['heuristic_time'] - heuristic_time_before)
+        stats.update(open_list_stats(queue))
+        stats['expanded_nodes'] = closed.count(1)
+        stats['path_length'] = len(path) - 1 if path else None
+        stats['path_cost'] = len(path) - 1 if path else None  # Unit costs only
+    return path
+
+def reconstruct_jump_path(parents, index, padded_width):
+    """Follow parent jump points back from index and fill in the straight segments between them"""
+    jump_points = []
+    while index != -1:
+        jump_points.append(index)
+        index = parents[index]
+    jump_points.reverse()
+
+    path = [from_flat(jump_points[0], padded_width)]
+    for previous, current in zip(jump_points, jump_points[1:]):
+        if abs(current - previous) < padded_width:
+            step = 1 if current > previous else -1
+        else:
+            step = padded_width if current > previous else -padded_width
+        for index in range(previous + step, current + step, step):
+            path.append(from_flat(index, padded_width))
+    return path
+
+def reconstruct_path(parents, index, padded_width):
+    """Follow parent indices back from index and return the path from start to it"""
+    path = []
+    while index != -1:
+        path.append(from_flat(index, padded_width))
+        index = parents[index]
+    path.reverse()
+    return path
+
+def descend_distance_field(field, start, costs=None):
+    """
+    Follow a goal distance field downhill from start to the goal
+
+    Every step moves to a neighbor one step closer (first in DIRECTIONS order),
+    so the result is a shortest path without any search. With costs, a step
+    into a neighbor is downhill when the neighbor's distance plus its cost
+    equals the current distance.
+
+    Args:
+        field: int array of distances to the goal (negative for unreachable cells),
+            e.g. from heuristic.distance_cache.distance_field
+        start: Starting position [x, y]
+        costs: Cell costs the field was computed with (None for unit costs)
+
+    Returns:
+        List of [x, y] positions from start to the goal, or None if unreachable
+    """
+    height, width = field.shape
+    x, y = int(start[0]), int(start[1])
+    distance = int(field[x, y])
+    if distance < 0:
+        return None
+    path = [[x, y]]
+    while distance > 0:
+        for dx, dy in DIRECTIONS:
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < height and 0 <= ny < width) or field[nx, ny] < 0:
+                continue
+            step = int(costs[nx, ny]) if costs is not None else 1
+            if field[nx, ny] + step == distance:
+                x, y, distance = nx, ny, distance - step
+                break
+        else:
+            return None  # The field does not belong to this maze
+        path.append([x, y])
+    return path
+
+def mark_path(maze, path):
+    """
+    Return a copy of the maze with the path cells marked as 2
+
+    Nested-list mazes are copied row by row, array mazes with a single array copy.
+    """
+    if isinstance(maze, np.ndarray):
+        maze_copy = maze.copy()
+        if path:
+            xs, ys = zip(*path)
+            maze_copy[list(xs), list(ys)] = 2
+        return maze_copy
+
+    maze_copy = [list(row) for row in maze]
+    for x, y in path or []:
+        maze_copy[x][y] = 2
+    return maze_copy
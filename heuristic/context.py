@@ -0,0 +1,211 @@
+import importlib
+import threading
+from collections import OrderedDict
+import numpy as np
+from .manhattan_heuristic import manhattan_distance, manhattan_distance_batch
+from .distance_cache import maze_key, min_step_cost
+from .features import wall_count_grid
+
+# Module implementing each trained heuristic type. Backends are imported the first
+# time their heuristic is trained, so Manhattan-only solves never load scikit-learn.
+HEURISTIC_MODULES = {
+    'knn': '.knn_heuristic',
+    'decision_tree': '.decision_tree_heuristic',
+    'landmark': '.landmark_heuristic',
+}
+
+# Every heuristic type; Manhattan needs no backend
+HEURISTIC_TYPES = ('manhattan',) + tuple(HEURISTIC_MODULES)
+
+def normalize_heuristic(heuristic_type):
+    """Return the canonical name of heuristic_type (case-insensitive), raising ValueError if unknown"""
+    name = heuristic_type.lower() if isinstance(heuristic_type, str) else heuristic_type
+    if name not in HEURISTIC_TYPES:
+        raise ValueError(f"Unknown heuristic type: {heuristic_type!r} (expected one of "
+                         f"{', '.join(HEURISTIC_TYPES)})")
+    return name
+
+def heuristic_module(heuristic_type):
+    """Import and return the backend module of heuristic_type (None for Manhattan)"""
+    name = HEURISTIC_MODULES.get(normalize_heuristic(heuristic_type))
+    return importlib.import_module(name, __package__) if name is not None else None
+
+class HeuristicContext:
+    """
+    Trained heuristic state for one maze, goal and heuristic type.
+
+    Each context owns its model (KNN samples or decision tree) and caches, so
+    solves on different mazes never share predictions. Once train() has run
+    the context is only read during search and can serve concurrent solves.
+
+    With cell costs, models are trained on weighted costs to the goal and every
+    Manhattan term is scaled by the cheapest cell cost, so the Manhattan and
+    landmark heuristics stay admissible.
+    """
+    def __init__(self, maze, goal, heuristic_type='knn', knn_k=3, knn_max_samples=1000,
+                 wall_counts=None, costs=None):
+        # Always copied: pooled contexts outlive the caller's array, which may be a view of
+        # a shared-memory block (see parallel_solver) or be edited in place afterwards
+        self.grid = np.array(maze, dtype=np.uint8, order='C')
+        self.costs = np.array(costs, dtype=np.uint8, order='C') if costs is not None else None
+        self.min_cost = min_step_cost(self.grid, self.costs)
+        self.goal = [int(goal[0]), int(goal[1])]
+        self.heuristic_type = normalize_heuristic(heuristic_type)
+        self.knn_k = knn_k
+        self.knn_max_samples = knn_max_samples
+        self.wall_counts = wall_counts  # Optional shared 3x3 wall counts (see MazeSolver)
+        self.model = None  # KNNHeuristic, DecisionTreeRegressor or LandmarkTable once trained
+        self.backend = None  # Module of the trained model (see heuristic_module)
+        self.table = None  # Estimates for every open cell, built on first use
+        self.lock = threading.Lock()
+
+    def __getstate__(self):
+        # Locks and modules cannot be pickled; contexts are stored on disk by maze_store
+        state = self.__dict__.copy()
+        del state['lock'], state['backend']
+        if self.heuristic_type == 'landmark' and self.model is not None:
+            # The table is shared by every goal on the maze: keep only its landmark count
+            state['model'] = None
+            state['landmark_count'] = len(self.model.landmarks)
+        return state
+
+    def __setstate__(self, state):
+        landmark_count = state.pop('landmark_count', None)
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
+        self.backend = None
+        if self.model is not None or landmark_count is not None:
+            self.backend = heuristic_module(self.heuristic_type)
+        if landmark_count is not None:
+            # Re-attached from the shared landmark cache (or its directory), rebuilt on a miss
+            self.model = self.backend.get_landmark_table(self.grid, landmark_count, costs=self.costs)
+
+    def train(self):
+        """Fit the model for this maze and goal; returns the context"""
+        backend = heuristic_module(self.heuristic_type)
+        if self.heuristic_type == 'knn':
+            model = backend.KNNHeuristic(k=self.knn_k, max_samples=self.knn_max_samples)
+            backend.train_heuristic(self.grid, self.goal, self.goal, model=model, costs=self.costs)
+            if model.count >= model.k:
+                model.spatial_index()  # Build now so searches never write it
+            self.model = model
+        elif self.heuristic_type == 'decision_tree':
+            if self.wall_counts is None:
+                self.wall_counts = wall_count_grid(self.grid)
+            self.model = backend.train_decision_tree(self.grid, self.goal, self.wall_counts, costs=self.costs)
+        elif self.heuristic_type == 'landmark':
+            # Shared by every goal on this maze, so only the first context builds it
+            self.model = backend.get_landmark_table(self.grid, costs=self.costs)
+        self.backend = backend
+        return self
+
+    def estimate(self, position, maze=None):
+        """Heuristic estimate for one position (maze defaults to the context grid)"""
+        if maze is None:
+            maze = self.grid
+        if self.model is None:
+            return manhattan_distance(position, self.goal) * self.min_cost
+        if self.heuristic_type == 'knn':
+            return self.backend.get_optimal_heuristic(position, self.goal, maze, model=self.model,
+                                                      min_cost=self.min_cost)
+        if self.heuristic_type == 'landmark':
+            return self.model.estimate(position, self.goal)
+        return self.backend.dt_heuristic(position, self.goal, maze, model=self.model,
+                                         wall_counts=self.wall_counts, min_cost=self.min_cost)
+
+    def estimate_batch(self, positions):
+        """Heuristic estimates for an (N, 2) array of positions"""
+        if self.model is None:
+            return manhattan_distance_batch(positions, self.goal).astype(np.float64) * self.min_cost
+        if self.heuristic_type == 'knn':
+            return self.backend.get_optimal_heuristic_batch(positions, self.goal, self.grid, model=self.model,
+                                                            min_cost=self.min_cost)
+        if self.heuristic_type == 'landmark':
+            return self.model.estimate_batch(positions, self.goal)
+        return self.backend.dt_heuristic_batch(positions, self.goal, self.grid, model=self.model,
+                                               wall_counts=self.wall_counts, min_cost=self.min_cost)
+
+    def heuristic_func(self):
+        """Return a (position, goal, maze) function suitable for astar_grid"""
+        if self.model is None:
+            if self.min_cost != 1:
+                min_cost = self.min_cost
+                return lambda pos, goal, m: manhattan_distance(pos, goal) * min_cost
+            return lambda pos, goal, m: manhattan_distance(pos, goal)
+        return lambda pos, goal, m: self.estimate(pos, m)
+
+    def heuristic_table(self):
+        """Return the estimates for every open cell, computing them once per context"""
+        with self.lock:
+            if self.table is None:
+                if self.heuristic_type == 'landmark' and self.model is not None:
+                    table = self.model.goal_table(self.goal)
+                else:
+                    table = np.zeros(self.grid.shape, dtype=np.float64)
+                    positions = np.argwhere(self.grid == 0)
+                    if len(positions):
+                        table[positions[:, 0], positions[:, 1]] = self.estimate_batch(positions)
+                table.setflags(write=False)
+                self.table = table
+            return self.table
+
+class HeuristicContextPool:
+    """
+    Bounded LRU pool of trained contexts keyed by maze content, goal and heuristic type.
+
+    Training happens outside the pool lock; if two threads train the same key at
+    once, the first context stored wins and the other is discarded.
+    """
+    def __init__(self, max_contexts=16):
+        self.max_contexts = max_contexts
+        self.contexts = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, maze, goal, heuristic_type='knn', costs=None):
+        """
+        Return a trained context for maze, goal and heuristic_type
+
+        Args:
+            maze: 2D grid as nested lists or a NumPy array
+            goal: Goal position [x, y]
+            heuristic_type: 'manhattan', 'knn', 'decision_tree' or 'landmark' (any case)
+            costs: Optional cell costs of a weighted maze
+
+        Returns:
+            Trained HeuristicContext (shared with other callers of the same key)
+        """
+        context = HeuristicContext(maze, goal, heuristic_type, costs=costs)
+        key = (maze_key(context.grid, context.costs), context.goal[0], context.goal[1],
+               context.heuristic_type)
+
+        with self.lock:
+            if key in self.contexts:
+                self.contexts.move_to_end(key)
+                self.hits += 1
+                return self.contexts[key]
+            self.misses += 1
+
+        context.train()
+
+        with self.lock:
+            if key in self.contexts:
+                return self.contexts[key]
+            self.contexts[key] = context
+            while len(self.contexts) > self.max_contexts:
+                self.contexts.popitem(last=False)
+        return context
+
+    def clear(self):
+        """Drop all pooled contexts and reset the counters"""
+        with self.lock:
+            self.contexts.clear()
+            self.hits = self.misses = 0
+
+# Shared pool used by astar_solve
+context_pool = HeuristicContextPool()
+
+def get_heuristic_context(maze, goal, heuristic_type='knn', costs=None):
+    """Return a trained context for maze, goal, heuristic_type and optional cell costs from the shared pool"""
+    return context_pool.get(maze, goal, heuristic_type, costs)
@@ -1,86 +1,182 @@
+import pickle
 import numpy as np
-from collections import deque
 from sklearn.tree import DecisionTreeRegressor
-from .manhattan_heuristic import manhattan_distance
+from .manhattan_heuristic import manhattan_distance, manhattan_distance_batch
+from .features import OFFSETS_3X3, neighbor_wall_counts, wall_count_grid
+from .distance_cache import UNREACHABLE, distance_from, get_distance_field
 
 # Global Decision Tree model
 dt_model = None
 
-def setup_decision_tree(maze, start, goal):
+# Default cap on training rows per maze; larger reachable areas are subsampled
+DEFAULT_MAX_SAMPLES = 50000
+
+# Model trained on a corpus of mazes, used instead of fitting per maze (see use_corpus_model)
+corpus_model = None
+corpus_warm_start = False
+
+def setup_decision_tree(maze, start, goal, costs=None):
     """
-    Pre-train the Decision Tree heuristic by running a quick BFS
-    to get actual distances and training a decision tree model
+    Pre-train the global Decision Tree heuristic using actual distances from the
+    shared distance field (BFS, or Dial's algorithm with cell costs) and training
+    a decision tree model
     """
     global dt_model
     
-    # Get distances using BFS
-    maze_height = len(maze)
-    maze_width = len(maze[0]) if maze else 0
-    
-    # Initialize distance map
-    distances = {}
-    visited = set()
-    queue = deque([(goal, 0)])  # Start from goal, working backwards
-    visited.add(tuple(goal))
-    
-    # BFS to calculate actual distances
-    directions = [(-1, 0), (0, 1), (1, 0), (0, -1)]
-    
-    while queue:
-        current, dist = queue.popleft()
-        current_tuple = tuple(current)
-        distances[current_tuple] = dist
-        
-        # Check all four directions
-        for dx, dy in directions:
-            nx, ny = current[0] + dx, current[1] + dy
-            
-            if (0 <= nx < maze_height and 
-                0 <= ny < maze_width and 
-                maze[nx][ny] == 0):  # If it's a path
-                
-                neighbor = (nx, ny)
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    queue.append(([nx, ny], dist + 1))
-    
-    # Prepare data for Decision Tree training
-    X = []  # Features (position, relative to goal, wall density)
-    y = []  # Target (actual distance)
-    
-    for pos, dist in distances.items():
-        # Extract x, y coordinates
-        x, y_pos = pos
-        
-        # Calculate relative position to goal
-        rel_x = x - goal[0]
-        rel_y = y_pos - goal[1]
-        
-        # Calculate Manhattan distance
-        man_dist = abs(rel_x) + abs(rel_y)
-        
-        # Calculate wall density around position (in 3x3 grid)
-        walls = 0
-        for dx in range(-1, 2):
-            for dy in range(-1, 2):
-                nx, ny = x + dx, y_pos + dy
-                if 0 <= nx < maze_height and 0 <= ny < maze_width and maze[nx][ny] == 1:
-                    walls += 1
-        
-        # Features: position, relative position, manhattan distance, wall density
-        X.append([x, y_pos, rel_x, rel_y, man_dist, walls])
-        y.append(dist)
-    
-    # Train the decision tree
-    if X and y:
-        dt_model = DecisionTreeRegressor(max_depth=10)
-        dt_model.fit(np.array(X), np.array(y))
-    else:
-        dt_model = None
+    dt_model = train_decision_tree(maze, goal, costs=costs)
+    return distance_from(get_distance_field(maze, goal, costs), start)
+
+def decision_tree_features(positions, goal, walls):
+    """
+    Build the feature matrix [x, y, rel_x, rel_y, manhattan, walls] for many positions
+    
+    Args:
+        positions: (N, 2) integer array of positions [x, y]
+        goal: Goal position [x, y]
+        walls: (N,) 3x3 wall counts of the positions
+    
+    Returns:
+        (N, 6) int64 array
+    """
+    positions = np.asarray(positions, dtype=np.int64)
+    relative = positions - np.asarray(goal, dtype=np.int64)
+    return np.column_stack([positions, relative, np.abs(relative).sum(axis=1), walls])
+
+def decision_tree_training_set(maze, goal, wall_counts=None, max_samples=DEFAULT_MAX_SAMPLES,
+                               random_state=0, costs=None):
+    """
+    Features and actual distances of the cells that reach goal
+    
+    Args:
+        maze: The maze grid
+        goal: Goal position [x, y]
+        wall_counts: Optional precomputed 3x3 wall counts (computed here when omitted)
+        max_samples: Keep at most this many cells, drawn uniformly at random
+            (None keeps every reachable cell)
+        random_state: Seed for the subsample
+        costs: Optional cell costs; targets are then weighted costs to the goal
+    
+    Returns:
+        (X, y): (N, 6) feature matrix and (N,) distances
+    """
+    # Get actual distances from the shared distance field
+    field = get_distance_field(maze, goal, costs)
+    positions = np.argwhere(field != UNREACHABLE)
+    if max_samples is not None and len(positions) > max_samples:
+        rng = np.random.default_rng(random_state)
+        positions = positions[np.sort(rng.choice(len(positions), max_samples, replace=False))]
+    
+    if wall_counts is None:
+        wall_counts = wall_count_grid(np.asarray(maze))
+    X = decision_tree_features(positions, goal, wall_counts[positions[:, 0], positions[:, 1]])
+    y = field[positions[:, 0], positions[:, 1]]
+    return X, y
+
+def train_decision_tree(maze, goal, wall_counts=None, max_samples=DEFAULT_MAX_SAMPLES, random_state=0,
+                        costs=None):
+    """
+    Train a decision tree on the actual distances to goal from the shared distance field
+    
+    If a corpus model is installed with use_corpus_model, it is returned as is
+    (no fitting), or with warm_start refined by a small residual tree fitted on
+    this maze. Weighted mazes always get their own tree, since the corpus model
+    predicts step counts.
+    
+    Args:
+        maze: The maze grid
+        goal: Goal position [x, y]
+        wall_counts: Optional precomputed 3x3 wall counts for every cell (see
+            features.wall_count_grid), shared instead of recomputed
+        max_samples: Training rows kept per maze (see decision_tree_training_set)
+        random_state: Seed for subsampling and tree fitting
+        costs: Optional cell costs (see decision_tree_training_set)
+    
+    Returns:
+        Fitted model with a predict method, or None if no cell reaches the goal
+    """
+    if corpus_model is not None and not corpus_warm_start and costs is None:
+        return corpus_model
+    
+    X, y = decision_tree_training_set(maze, goal, wall_counts, max_samples, random_state, costs)
+    if not len(y):
+        return None
+    
+    if corpus_model is not None and costs is None:
+        return ResidualTreeModel.fit(corpus_model, X, y, random_state=random_state)
+    
+    model = DecisionTreeRegressor(max_depth=10, random_state=random_state)
+    model.fit(X, y)
+    return model
+
+class ResidualTreeModel:
+    """
+    Corpus model refined for one maze by a shallow tree fitted on its residuals.
     
-    return distances.get(tuple(start), None)
+    Fitting the residual tree is much cheaper than a full max_depth=10 tree, so
+    the per-maze cost stays small while the estimates adapt to the maze.
+    """
+    def __init__(self, base, residual):
+        self.base = base
+        self.residual = residual
+    
+    @classmethod
+    def fit(cls, base, X, y, max_depth=4, random_state=0):
+        residual = DecisionTreeRegressor(max_depth=max_depth, random_state=random_state)
+        residual.fit(X, y - base.predict(X))
+        return cls(base, residual)
+    
+    def predict(self, X):
+        return self.base.predict(X) + self.residual.predict(X)
+
+def train_corpus_model(examples, max_samples_per_maze=5000, max_depth=10, random_state=0):
+    """
+    Fit one decision tree on many (maze, goal) pairs
+    
+    Args:
+        examples: Iterable of (maze, goal)
+        max_samples_per_maze: Training rows drawn from each maze
+        max_depth: Depth of the tree
+        random_state: Seed for subsampling and fitting
+    
+    Returns:
+        Fitted DecisionTreeRegressor, or None if no example had reachable cells
+    """
+    features, targets = [], []
+    for index, (maze, goal) in enumerate(examples):
+        X, y = decision_tree_training_set(maze, goal, max_samples=max_samples_per_maze,
+                                          random_state=random_state + index)
+        features.append(X)
+        targets.append(y)
+    if not features or not sum(len(y) for y in targets):
+        return None
+    model = DecisionTreeRegressor(max_depth=max_depth, random_state=random_state)
+    model.fit(np.concatenate(features), np.concatenate(targets))
+    return model
 
-def dt_heuristic(position, goal, maze=None):
+def use_corpus_model(model, warm_start=False):
+    """
+    Install a corpus-trained model for every later train_decision_tree call
+    
+    Args:
+        model: Model from train_corpus_model / load_model, or None to fit per maze again
+        warm_start: If True, refine the model per maze with a residual tree
+            instead of using it unchanged
+    """
+    global corpus_model, corpus_warm_start
+    corpus_model = model
+    corpus_warm_start = warm_start
+
+def save_model(path, model):
+    """Pickle a trained model to path"""
+    with open(path, 'wb') as f:
+        pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+def load_model(path):
+    """Load a model written by save_model"""
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+def dt_heuristic(position, goal, maze=None, model=None, wall_counts=None, min_cost=1):
     """
     Decision Tree based heuristic
     
@@ -88,17 +184,21 @@ def dt_heuristic(position, goal, maze=None):
         position: Current position [x, y]
         goal: Goal position [x, y]
         maze: The maze grid (optional)
+        model: Trained decision tree (defaults to the global dt_model)
+        wall_counts: Optional precomputed 3x3 wall counts for every cell
+        min_cost: Cheapest cell cost of a weighted maze; scales the Manhattan fallback
     
     Returns:
         Heuristic distance estimate
     """
-    global dt_model
+    if model is None:
+        model = dt_model
     
     # Calculate Manhattan distance as fallback
-    base_heuristic = manhattan_distance(position, goal)
+    base_heuristic = manhattan_distance(position, goal) * min_cost
     
     # If model isn't trained or maze isn't available, use Manhattan distance
-    if dt_model is None or maze is None:
+    if model is None or maze is None:
         return base_heuristic
     
     # Extract features as in setup_decision_tree
@@ -108,23 +208,61 @@ def dt_heuristic(position, goal, maze=None):
     man_dist = abs(rel_x) + abs(rel_y)
     
     # Calculate wall density
-    walls = 0
-    for dx in range(-1, 2):
-        for dy in range(-1, 2):
-            nx, ny = x + dx, y_pos + dy
-            if (0 <= nx < len(maze) and 
-                0 <= ny < len(maze[0]) and 
-                maze[nx][ny] == 1):
-                walls += 1
+    if wall_counts is not None:
+        walls = int(wall_counts[x, y_pos])
+    else:
+        walls = 0
+        for dx in range(-1, 2):
+            for dy in range(-1, 2):
+                nx, ny = x + dx, y_pos + dy
+                if (0 <= nx < len(maze) and 
+                    0 <= ny < len(maze[0]) and 
+                    maze[nx][ny] == 1):
+                    walls += 1
     
     # Prepare feature vector
     features = np.array([[x, y_pos, rel_x, rel_y, man_dist, walls]])
     
     # Predict using the decision tree
     try:
-        prediction = dt_model.predict(features)[0]
+        prediction = model.predict(features)[0]
         # Ensure prediction is positive (sometimes models can predict negative values)
         return max(1.0, prediction)
     except:
         # Fallback to Manhattan distance if prediction fails
         return base_heuristic
+
+def dt_heuristic_batch(positions, goal, maze=None, model=None, wall_counts=None, min_cost=1):
+    """
+    Vectorized Decision Tree heuristic for many positions in one predict call
+    
+    Args:
+        positions: (N, 2) array of positions [x, y]
+        goal: Goal position [x, y]
+        maze: The maze grid as a NumPy array (optional)
+        model: Trained decision tree (defaults to the global dt_model)
+        wall_counts: Optional precomputed 3x3 wall counts for every cell
+        min_cost: Cheapest cell cost of a weighted maze; scales the Manhattan fallback
+    
+    Returns:
+        (N,) array of heuristic distance estimates
+    """
+    if model is None:
+        model = dt_model
+    positions = np.asarray(positions, dtype=np.int64)
+    base_heuristic = manhattan_distance_batch(positions, goal).astype(np.float64) * min_cost
+    
+    if model is None or maze is None or len(positions) == 0:
+        return base_heuristic
+    
+    # Same features as training, one row per position
+    if wall_counts is not None:
+        walls = wall_counts[positions[:, 0], positions[:, 1]]
+    else:
+        walls = neighbor_wall_counts(np.asarray(maze), positions, OFFSETS_3X3)
+    features = decision_tree_features(positions, goal, walls)
+    
+    try:
+        return np.maximum(1.0, model.predict(features))
+    except Exception:
+        return base_heuristic
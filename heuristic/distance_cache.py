@@ -0,0 +1,223 @@
+import hashlib
+import threading
+from array import array
+from collections import OrderedDict, deque
+import numpy as np
+
+# Marker for cells that cannot reach the goal
+UNREACHABLE = -1
+
+def maze_key(grid, costs=None):
+    """
+    Content hash of a maze grid (shape and cell values)
+
+    Args:
+        grid: 2D uint8 array
+        costs: Optional uint8 array of cell costs, hashed along with the grid
+
+    Returns:
+        Hex digest identifying the maze
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.asarray(grid.shape, dtype=np.int64).tobytes())
+    digest.update(grid.tobytes())
+    if costs is not None:
+        digest.update(b'costs')
+        digest.update(np.ascontiguousarray(costs, dtype=np.uint8).tobytes())
+    return digest.hexdigest()
+
+def min_step_cost(grid, costs):
+    """Cheapest cost of entering an open cell (1 without costs); scales Manhattan distance admissibly"""
+    if costs is None:
+        return 1
+    open_costs = np.asarray(costs)[np.asarray(grid) == 0]
+    return max(int(open_costs.min()), 1) if len(open_costs) else 1
+
+def bfs_distance_field(grid, goal):
+    """
+    Compute the BFS distance from every cell to the goal
+
+    Args:
+        grid: 2D uint8 array (0=path, anything else is blocked)
+        goal: Goal position [x, y]
+
+    Returns:
+        int32 array of the grid's shape with the step distance to the goal,
+        UNREACHABLE for walls and cells with no path (everywhere if the goal is blocked)
+    """
+    height, width = grid.shape
+    if grid[goal[0], goal[1]]:
+        return np.full(grid.shape, UNREACHABLE, dtype=np.int32)  # Nothing reaches a blocked goal
+    padded_width = width + 2
+    # Wall border so flat neighbors never need bounds checks
+    cells = np.pad(grid, 1, mode='constant', constant_values=1).tobytes()
+    offsets = (-padded_width, 1, padded_width, -1)
+
+    distances = array('i', [UNREACHABLE]) * len(cells)
+    goal_index = (goal[0] + 1) * padded_width + goal[1] + 1
+    distances[goal_index] = 0
+    queue = deque([goal_index])
+
+    while queue:
+        current = queue.popleft()
+        next_dist = distances[current] + 1
+        for offset in offsets:
+            neighbor = current + offset
+            if not cells[neighbor] and distances[neighbor] == UNREACHABLE:
+                distances[neighbor] = next_dist
+                queue.append(neighbor)
+
+    field = np.frombuffer(distances, dtype=np.int32).reshape(height + 2, padded_width)
+    return np.ascontiguousarray(field[1:-1, 1:-1])
+
+def dial_distance_field(grid, goal, costs):
+    """
+    Compute the weighted distance from every cell to the goal with Dial's algorithm
+
+    Moving into a cell costs costs[x, y] (a small positive integer), so the
+    distance of a cell is the sum of the costs of the cells entered on its
+    cheapest path, the goal included and the cell itself excluded. Pending
+    cells sit in a ring of max_cost + 1 buckets indexed by distance, which
+    replaces the heap of Dijkstra's algorithm for integer weights.
+
+    Args:
+        grid: 2D uint8 array (0=path, anything else is blocked)
+        goal: Goal position [x, y]
+        costs: 2D array of cell costs (>= 1 on open cells) with the grid's shape
+
+    Returns:
+        int32 array of the grid's shape with the cost to the goal,
+        UNREACHABLE for walls and cells with no path
+    """
+    height, width = grid.shape
+    if grid[goal[0], goal[1]]:
+        return np.full(grid.shape, UNREACHABLE, dtype=np.int32)
+    padded_width = width + 2
+    cells = np.pad(grid, 1, mode='constant', constant_values=1).tobytes()
+    step_costs = np.pad(np.ascontiguousarray(costs, dtype=np.uint8), 1, constant_values=1).tobytes()
+    offsets = (-padded_width, 1, padded_width, -1)
+    unreached = 2 ** 31 - 1
+
+    distances = array('i', [unreached]) * len(cells)
+    goal_index = (goal[0] + 1) * padded_width + goal[1] + 1
+    distances[goal_index] = 0
+    ring = max(step_costs) + 1
+    buckets = [[] for _ in range(ring)]
+    buckets[0].append(goal_index)
+    pending = 1
+    distance = 0
+
+    while pending:
+        bucket = buckets[distance % ring]
+        while bucket:
+            current = bucket.pop()
+            pending -= 1
+            if distances[current] != distance:
+                continue  # Stale entry, the cell was settled at a lower distance
+            # Reaching current from a neighbor means entering current
+            next_dist = distance + step_costs[current]
+            for offset in offsets:
+                neighbor = current + offset
+                if not cells[neighbor] and next_dist < distances[neighbor]:
+                    distances[neighbor] = next_dist
+                    buckets[next_dist % ring].append(neighbor)
+                    pending += 1
+        distance += 1
+
+    field = np.frombuffer(distances, dtype=np.int32).reshape(height + 2, padded_width)
+    field = np.ascontiguousarray(field[1:-1, 1:-1])
+    field[field == unreached] = UNREACHABLE
+    return field
+
+def distance_field(grid, goal, costs=None):
+    """Distance field towards goal: BFS for unit costs, Dial's algorithm with costs"""
+    if costs is None:
+        return bfs_distance_field(grid, goal)
+    return dial_distance_field(grid, goal, costs)
+
+class DistanceFieldCache:
+    """
+    LRU cache of goal distance fields keyed by maze content hash and goal.
+
+    Fields are stored as read-only int32 arrays and evicted least recently
+    used first once their total size exceeds max_bytes.
+    """
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.fields = OrderedDict()  # (maze_key, goal) -> distance field
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, maze, goal, costs=None):
+        """
+        Return the distance field of maze towards goal, computing it on a miss
+
+        Args:
+            maze: 2D grid as nested lists or a NumPy array
+            goal: Goal position [x, y]
+            costs: Optional array of cell costs (see dial_distance_field)
+
+        Returns:
+            Read-only int32 array of distances (UNREACHABLE where no path exists)
+        """
+        grid = np.ascontiguousarray(maze, dtype=np.uint8)
+        key = (maze_key(grid, costs), int(goal[0]), int(goal[1]))
+
+        with self.lock:
+            field = self.fields.get(key)
+            if field is not None:
+                self.fields.move_to_end(key)
+                self.hits += 1
+                return field
+            self.misses += 1
+
+        field = distance_field(grid, goal, costs)
+        field.setflags(write=False)
+        self.put(key, field)
+        return field
+
+    def put(self, key, field):
+        """Store a field under key, evicting old fields to stay within max_bytes"""
+        if field.nbytes > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.fields:
+                self.current_bytes -= self.fields.pop(key).nbytes
+            self.fields[key] = field
+            self.current_bytes += field.nbytes
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self.fields.popitem(last=False)
+                self.current_bytes -= evicted.nbytes
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all cached fields and reset the counters"""
+        with self.lock:
+            self.fields.clear()
+            self.current_bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """Return the cache counters as a dict"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self.fields),
+            'bytes': self.current_bytes,
+        }
+
+# Shared cache used by the learned heuristics
+distance_cache = DistanceFieldCache()
+
+def get_distance_field(maze, goal, costs=None):
+    """Return the cached distance field of maze (with optional cell costs) towards goal"""
+    return distance_cache.get(maze, goal, costs)
+
+def distance_from(field, position):
+    """Return the distance stored in field at position, or None if unreachable"""
+    dist = int(field[position[0], position[1]])
+    return None if dist == UNREACHABLE else dist
@@ -0,0 +1,52 @@
+import numpy as np
+
+# Neighborhood offsets used by the learned heuristics
+OFFSETS_3X3 = [(dx, dy) for dx in range(-1, 2) for dy in range(-1, 2)]
+OFFSETS_4 = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+
+def neighbor_wall_counts(grid, positions, offsets):
+    """
+    Count walls (cells equal to 1) around many positions at once
+
+    Args:
+        grid: 2D NumPy maze array
+        positions: (N, 2) integer array of [x, y] positions
+        offsets: Neighborhood offsets to check, e.g. OFFSETS_3X3
+    
+    Returns:
+        (N,) int array of wall counts; cells outside the maze are not walls
+    """
+    height, width = grid.shape
+    xs = positions[:, 0]
+    ys = positions[:, 1]
+    counts = np.zeros(len(positions), dtype=np.int64)
+    for dx, dy in offsets:
+        nx = xs + dx
+        ny = ys + dy
+        inside = (nx >= 0) & (nx < height) & (ny >= 0) & (ny < width)
+        walls = grid[np.clip(nx, 0, height - 1), np.clip(ny, 0, width - 1)] == 1
+        counts += inside & walls
+    return counts
+
+def wall_count_grid(grid, offsets=OFFSETS_3X3):
+    """
+    Count walls (cells equal to 1) around every cell of the grid
+
+    Same counts as neighbor_wall_counts for all positions. With OFFSETS_3X3 this
+    is a 3x3 box convolution of the wall mask, computed as one shifted slice of a
+    zero-padded copy per offset.
+
+    Args:
+        grid: 2D NumPy maze array
+        offsets: Neighborhood offsets to check, e.g. OFFSETS_3X3
+
+    Returns:
+        int array of the grid's shape
+    """
+    height, width = grid.shape
+    radius = max(max(abs(dx), abs(dy)) for dx, dy in offsets)
+    walls = np.pad(np.asarray(grid) == 1, radius, mode='constant', constant_values=False)
+    counts = np.zeros((height, width), dtype=np.int64)
+    for dx, dy in offsets:
+        counts += walls[radius + dx:radius + dx + height, radius + dy:radius + dy + width]
+    return counts
@@ -1,84 +1,154 @@
 import numpy as np
-from collections import deque
-from .manhattan_heuristic import manhattan_distance
+from sklearn.neighbors import KDTree
+from .manhattan_heuristic import manhattan_distance, manhattan_distance_batch
+from .features import OFFSETS_4, neighbor_wall_counts
+from .distance_cache import UNREACHABLE, distance_from, get_distance_field
 
 class KNNHeuristic:
     """
     K-Nearest Neighbors based heuristic calculation to improve A* pathfinding.
     This helps identify more promising paths by learning from previously successful paths.
+    
+    Samples live in a preallocated ring buffer that overwrites the oldest entry
+    once max_samples is reached. Nearest-neighbor queries go through a Manhattan
+    KD-tree that is rebuilt lazily after the buffer changes.
     """
-    def __init__(self):
-        self.training_positions = []  # Store positions
-        self.training_distances = []  # Store actual distances
-        self.k = 3  # Number of neighbors to consider
-        self.max_samples = 1000  # Limit samples for performance
-        self.cache = {}  # Cache for position-to-distance lookups
+    def __init__(self, k=3, max_samples=1000):
+        self.k = k  # Number of neighbors to consider
+        self.max_samples = max_samples  # Limit samples for performance
+        self.positions = np.zeros((max_samples, 2), dtype=np.int64)  # Ring buffer of positions
+        self.distances = np.zeros(max_samples, dtype=np.float64)  # Actual distances per slot
+        self.count = 0  # Number of filled slots
+        self.head = 0  # Next slot to write (the oldest sample once full)
+        self.cache = {}  # Actual distance of each training position (written only by training)
+        self.tree = None  # Spatial index over the filled slots, None when stale
+        self.batch_rows = 4096  # Positions per chunk in predict_distance_batch
+    
+    @property
+    def training_positions(self):
+        """Filled part of the position buffer (slot order, not insertion order)"""
+        return self.positions[:self.count]
+    
+    @property
+    def training_distances(self):
+        """Filled part of the distance buffer, aligned with training_positions"""
+        return self.distances[:self.count]
     
     def add_sample(self, position, actual_distance):
         """Add a position and its actual distance to the goal to the training data"""
+        # Keep the training set manageable by overwriting the oldest sample
+        if self.count == self.max_samples:
+            removed_pos = tuple(self.positions[self.head].tolist())
+            self.cache.pop(removed_pos, None)
+        else:
+            self.count += 1
+        
         # Convert to tuple for consistency
         position_tuple = tuple(position)
-        self.training_positions.append(position_tuple)
-        self.training_distances.append(actual_distance)
+        self.positions[self.head] = position_tuple
+        self.distances[self.head] = actual_distance
+        self.head = (self.head + 1) % self.max_samples
         self.cache[position_tuple] = actual_distance
+        self.tree = None
+    
+    def add_samples(self, positions, actual_distances):
+        """
+        Add many samples at once, in order, with the same eviction as add_sample
         
-        # Keep the training set manageable
-        if len(self.training_positions) > self.max_samples:
-            removed_pos = self.training_positions.pop(0)
-            self.training_distances.pop(0)
-            if removed_pos in self.cache:
-                del self.cache[removed_pos]
+        Args:
+            positions: (N, 2) array of positions [x, y]
+            actual_distances: (N,) array of actual distances to the goal
+        """
+        positions = np.asarray(positions, dtype=np.int64).reshape(-1, 2)
+        actual_distances = np.asarray(actual_distances, dtype=np.float64)
+        # Only the last max_samples can survive
+        positions = positions[-self.max_samples:]
+        actual_distances = actual_distances[-self.max_samples:]
+        if len(positions) == 0:
+            return
+        
+        slots = (self.head + np.arange(len(positions))) % self.max_samples
+        overwritten = slots[slots < self.count]
+        for removed_pos in map(tuple, self.positions[overwritten].tolist()):
+            self.cache.pop(removed_pos, None)
+        
+        self.positions[slots] = positions
+        self.distances[slots] = actual_distances
+        self.count = min(self.max_samples, self.count + len(positions))
+        self.head = int(slots[-1] + 1) % self.max_samples
+        self.cache.update(zip(map(tuple, positions.tolist()), actual_distances.tolist()))
+        self.tree = None
+    
+    def spatial_index(self):
+        """Return the KD-tree over the current samples, rebuilding it if the buffer changed"""
+        if self.tree is None:
+            self.tree = KDTree(self.training_positions, metric='manhattan')
+        return self.tree
     
     def predict_distance(self, position, default_heuristic):
-        """Predict distance using KNN if possible, otherwise use default heuristic"""
+        """Predict distance using KNN if possible, otherwise use default heuristic (read-only)"""
         position_tuple = tuple(position)
         
         # Check cache first for exact matches
         if position_tuple in self.cache:
             return self.cache[position_tuple]
         
-        if len(self.training_positions) < self.k:
+        if self.count < self.k:
             return default_heuristic
         
-        # Convert to numpy arrays for vectorized operations if not already
-        if not isinstance(self.training_positions, np.ndarray):
-            positions_array = np.array(self.training_positions)
-        else:
-            positions_array = self.training_positions
-            
-        # Vectorized Manhattan distance calculation
-        diffs = np.abs(positions_array - np.array(position))
-        feature_dists = np.sum(diffs, axis=1)
-        
-        # Get indices of k nearest neighbors
-        if len(feature_dists) <= self.k:
-            nearest_indices = np.arange(len(feature_dists))
-        else:
-            nearest_indices = np.argpartition(feature_dists, self.k)[:self.k]
-        
-        # Get distances and actuals for k nearest neighbors
-        nearest_dists = feature_dists[nearest_indices]
-        nearest_actuals = np.array(self.training_distances)[nearest_indices]
+        # Get distances and indices of the k nearest neighbors
+        nearest_dists, nearest_indices = self.spatial_index().query([position_tuple], k=self.k)
+        nearest_dists = nearest_dists[0]
+        nearest_actuals = self.distances[nearest_indices[0]]
         
         # Calculate weights (inverse distance)
-        weights = np.where(nearest_dists > 0, 1.0 / nearest_dists, 1.0)
+        weights = 1.0 / np.maximum(nearest_dists, 1)
+        weights[nearest_dists == 0] = 1.0
         sum_weights = np.sum(weights)
         
         # Calculate weighted average
         if sum_weights > 0:
             prediction = np.sum(weights * nearest_actuals) / sum_weights
             # Blend with the default heuristic for stability
-            result = 0.7 * prediction + 0.3 * default_heuristic
-            # Cache the result
-            self.cache[position_tuple] = result
-            return result
+            # Not memoized: models are shared by concurrent searches and must stay read-only
+            return 0.7 * prediction + 0.3 * default_heuristic
         else:
             return default_heuristic
+    
+    def predict_distance_batch(self, positions, default_heuristics):
+        """
+        Vectorized predict_distance for an (N, 2) array of positions
+        
+        Training positions return their actual distance; other positions get the
+        same inverse-distance weighted KNN estimate blended with the defaults.
+        Results are not written to the cache.
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        result = np.asarray(default_heuristics, dtype=np.float64).copy()
+        if self.count < self.k or len(positions) == 0:
+            return result
+        
+        tree = self.spatial_index()
+        for begin in range(0, len(positions), self.batch_rows):
+            chunk = positions[begin:begin + self.batch_rows]
+            nearest_dists, nearest_indices = tree.query(chunk, k=self.k)
+            nearest_actuals = self.distances[nearest_indices]
+            
+            weights = 1.0 / np.maximum(nearest_dists, 1)
+            weights[nearest_dists == 0] = 1.0
+            prediction = np.sum(weights * nearest_actuals, axis=1) / np.sum(weights, axis=1)
+            blended = 0.7 * prediction + 0.3 * result[begin:begin + len(chunk)]
+            
+            # Exact matches use the stored actual distance (query results are sorted)
+            exact = nearest_dists[:, 0] == 0
+            result[begin:begin + len(chunk)] = np.where(exact, nearest_actuals[:, 0], blended)
+        
+        return result
 
 # Initialize a global instance for use across the application
 knn_heuristic = KNNHeuristic()
 
-def get_optimal_heuristic(position, goal, maze=None):
+def get_optimal_heuristic(position, goal, maze=None, model=None, min_cost=1):
     """
     Get the best heuristic estimate using KNN
     
@@ -86,15 +156,20 @@ def get_optimal_heuristic(position, goal, maze=None):
         position: Current position [x, y]
         goal: Goal position [x, y]
         maze: The maze grid (optional)
+        model: KNNHeuristic to use (defaults to the global knn_heuristic)
+        min_cost: Cheapest cell cost of a weighted maze; scales the Manhattan part
     
     Returns:
         Heuristic distance estimate
     """
+    if model is None:
+        model = knn_heuristic
+    
     # Calculate basic Manhattan distance
-    base_heuristic = manhattan_distance(position, goal)
+    base_heuristic = manhattan_distance(position, goal) * min_cost
     
     # Use KNN to potentially improve the estimate
-    enhanced_estimate = knn_heuristic.predict_distance(position, base_heuristic)
+    enhanced_estimate = model.predict_distance(position, base_heuristic)
     
     # If maze is provided, we can do additional analysis
     if maze is not None:
@@ -114,44 +189,55 @@ def get_optimal_heuristic(position, goal, maze=None):
     
     return enhanced_estimate
 
-def train_heuristic(maze, start, goal):
+def get_optimal_heuristic_batch(positions, goal, maze=None, model=None, min_cost=1):
+    """
+    Vectorized get_optimal_heuristic for many positions at once
+    
+    Args:
+        positions: (N, 2) array of positions [x, y]
+        goal: Goal position [x, y]
+        maze: The maze grid as a NumPy array (optional)
+        model: KNNHeuristic to use (defaults to the global knn_heuristic)
+        min_cost: Cheapest cell cost of a weighted maze; scales the Manhattan part
+    
+    Returns:
+        (N,) array of heuristic distance estimates
+    """
+    if model is None:
+        model = knn_heuristic
+    positions = np.asarray(positions, dtype=np.int64)
+    base_heuristic = manhattan_distance_batch(positions, goal) * min_cost
+    enhanced_estimate = model.predict_distance_batch(positions, base_heuristic)
+    
+    if maze is not None:
+        # Same obstacle penalty as get_optimal_heuristic
+        obstacles = neighbor_wall_counts(np.asarray(maze), positions, OFFSETS_4)
+        enhanced_estimate *= 1 + obstacles / 8
+    
+    return enhanced_estimate
+
+def train_heuristic(maze, start, goal, model=None, costs=None):
     """
-    Pre-train the KNN heuristic by running a quick BFS to get actual distances
+    Pre-train the KNN heuristic with actual distances from the shared distance field
     This helps the A* algorithm make better decisions from the start
+    
+    Args:
+        maze: The maze grid
+        start: Starting position [x, y]
+        goal: Goal position [x, y]
+        model: KNNHeuristic to train (defaults to the global knn_heuristic)
+        costs: Optional cell costs; the samples are then weighted costs to the goal
+            from Dial's algorithm instead of BFS step counts
     """
-    maze_height = len(maze)
-    maze_width = len(maze[0]) if maze else 0
-    
-    # Initialize distance map
-    distances = {}
-    visited = set()
-    queue = deque([(goal, 0)])  # Start from goal, working backwards
-    visited.add(tuple(goal))
-    
-    # Pre-calculate valid directions once
-    directions = [(-1, 0), (0, 1), (1, 0), (0, -1)]
-    
-    # BFS to calculate actual distances from all points to goal
-    while queue:
-        current, dist = queue.popleft()
-        current_tuple = tuple(current)
-        distances[current_tuple] = dist
-        
-        # Check all four directions
-        for dx, dy in directions:
-            nx, ny = current[0] + dx, current[1] + dy
-            
-            if (0 <= nx < maze_height and 
-                0 <= ny < maze_width and 
-                maze[nx][ny] == 0):  # If it's a path
-                
-                neighbor = (nx, ny)
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    queue.append(([nx, ny], dist + 1))
-    
-    # Batch add samples to our KNN model
-    for pos, dist in distances.items():
-        knn_heuristic.add_sample(list(pos), dist)
-    
-    return distances.get(tuple(start), None)  # Return distance from start to goal if found
+    if model is None:
+        model = knn_heuristic
+    
+    field = get_distance_field(maze, goal, costs)
+    
+    # Batch add samples to our KNN model, nearest to the goal first (BFS order)
+    xs, ys = np.nonzero(field != UNREACHABLE)
+    dists = field[xs, ys]
+    order = np.argsort(dists, kind='stable')
+    model.add_samples(np.column_stack([xs[order], ys[order]]), dists[order])
+    
+    return distance_from(field, start)  # Return distance from start to goal if found
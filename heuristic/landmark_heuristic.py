@@ -0,0 +1,237 @@
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+from .manhattan_heuristic import manhattan_distance, manhattan_distance_batch
+from .distance_cache import UNREACHABLE, distance_field, maze_key, min_step_cost
+
+# Default number of landmarks per maze
+DEFAULT_LANDMARKS = 8
+
+# Distance stored for cells a landmark cannot reach, per storage dtype
+MISSING = {np.dtype(np.uint16): np.iinfo(np.uint16).max, np.dtype(np.int32): UNREACHABLE}
+
+class LandmarkTable:
+    """
+    BFS distances from k landmark cells to every cell of one maze (ALT heuristic).
+
+    By the triangle inequality |d(L, p) - d(L, g)| never exceeds the true distance
+    from p to g, so the maximum over all landmarks (and Manhattan distance) is an
+    admissible lower bound for any start/goal pair. The table is built once per
+    maze and reused for every query; distances are stored as uint16 when they fit,
+    int32 otherwise.
+
+    On weighted mazes the stored fields are costs to each landmark, which are not
+    symmetric (moves pay for the cell entered), so only the directed bound
+    d(p, L) - d(g, L) is used, and Manhattan distance is scaled by the cheapest
+    cell cost.
+    """
+    def __init__(self, key, landmarks, distances, min_cost=1, directed=False):
+        self.key = key  # maze_key of the maze (and costs) the table was built for
+        self.landmarks = landmarks  # (k, 2) int32 landmark positions
+        self.distances = distances  # (k, height, width) uint16 or int32
+        self.missing = MISSING[distances.dtype]
+        self.min_cost = min_cost  # Cheapest cell cost, scales Manhattan distance
+        self.directed = directed  # True for weighted fields (distances towards the landmarks)
+
+    @property
+    def shape(self):
+        return self.distances.shape[1:]
+
+    @property
+    def nbytes(self):
+        return self.distances.nbytes + self.landmarks.nbytes
+
+    def estimate(self, position, goal):
+        """Admissible distance estimate from position to goal"""
+        best = manhattan_distance(position, goal) * self.min_cost
+        for distances in self.distances:
+            from_position = int(distances[position[0], position[1]])
+            from_goal = int(distances[goal[0], goal[1]])
+            if from_position != self.missing and from_goal != self.missing:
+                bound = from_position - from_goal
+                best = max(best, bound if self.directed else abs(bound))
+        return best
+
+    def estimate_batch(self, positions, goal):
+        """Admissible estimates for an (N, 2) array of positions"""
+        positions = np.asarray(positions)
+        from_positions = self.distances[:, positions[:, 0], positions[:, 1]].astype(np.int32)
+        from_goal = self.distances[:, goal[0], goal[1]].astype(np.int32)[:, None]
+        bounds = from_positions - from_goal
+        if not self.directed:
+            bounds = np.abs(bounds)
+        bounds[(from_positions == self.missing) | (from_goal == self.missing)] = 0
+        estimates = np.maximum(bounds.max(axis=0, initial=0),
+                               manhattan_distance_batch(positions, goal) * self.min_cost)
+        return estimates.astype(np.float64)
+
+    def goal_table(self, goal):
+        """
+        Estimates from every cell to goal, as a float64 array of the maze's shape
+
+        This is the whole per-query set-up: one vectorized pass over the stored
+        distances, with no training or search.
+        """
+        height, width = self.shape
+        rows, cols = np.ogrid[:height, :width]
+        table = ((np.abs(rows - goal[0]) + np.abs(cols - goal[1])) * self.min_cost).astype(np.float64)
+        for distances in self.distances:
+            from_goal = int(distances[goal[0], goal[1]])
+            if from_goal == self.missing:
+                continue
+            bounds = distances.astype(np.int32) - from_goal
+            if not self.directed:
+                bounds = np.abs(bounds)
+            bounds[distances == self.missing] = 0
+            np.maximum(table, bounds, out=table)
+        return table
+
+    def save(self, path):
+        """Write the table to an .npz file"""
+        np.savez(path, key=np.array(self.key), landmarks=self.landmarks, distances=self.distances,
+                 min_cost=np.array(self.min_cost), directed=np.array(self.directed))
+
+def load_landmark_table(path):
+    """Read a table written by LandmarkTable.save"""
+    with np.load(path) as data:
+        # Tables saved before weighted mazes were supported have neither field
+        min_cost = int(data['min_cost']) if 'min_cost' in data else 1
+        directed = bool(data['directed']) if 'directed' in data else False
+        return LandmarkTable(str(data['key']), data['landmarks'], data['distances'], min_cost, directed)
+
+def select_landmarks(grid, k=DEFAULT_LANDMARKS, costs=None):
+    """
+    Pick k landmarks spread over the maze by farthest-point selection
+
+    The first landmark is the open cell farthest from the first open cell in
+    row-major order; each next one is the cell whose distance to its nearest
+    landmark is largest. Landmarks on the maze's outskirts give the tightest
+    bounds.
+
+    Args:
+        grid: 2D uint8 array (0=path)
+        k: Number of landmarks
+        costs: Optional cell costs; fields are then weighted costs to each landmark
+
+    Returns:
+        (landmarks, fields): (k', 2) positions and the list of their int32
+        distance fields, with k' <= k if the maze has fewer reachable cells
+    """
+    open_cells = np.argwhere(grid == 0)
+    if not len(open_cells):
+        return np.empty((0, 2), dtype=np.int32), []
+
+    seed_field = distance_field(grid, open_cells[0], costs)
+    nearest = np.where(seed_field == UNREACHABLE, -1, np.iinfo(np.int32).max)
+    seed_field[seed_field == UNREACHABLE] = -1
+    landmark = np.unravel_index(np.argmax(seed_field), grid.shape)
+
+    landmarks, fields = [], []
+    for _ in range(k):
+        field = distance_field(grid, landmark, costs)
+        landmarks.append(landmark)
+        fields.append(field)
+        reachable = field != UNREACHABLE
+        nearest[reachable] = np.minimum(nearest[reachable], field[reachable])
+        if nearest.max() <= 0:
+            break
+        landmark = np.unravel_index(np.argmax(nearest), grid.shape)
+    return np.array(landmarks, dtype=np.int32), fields
+
+def build_landmark_table(maze, k=DEFAULT_LANDMARKS, costs=None):
+    """
+    Select landmarks and compute their distance fields for one maze
+
+    Args:
+        maze: 2D grid as nested lists or a NumPy array
+        k: Number of landmarks
+        costs: Optional cell costs (weighted, directed table)
+
+    Returns:
+        LandmarkTable
+    """
+    grid = np.ascontiguousarray(maze, dtype=np.uint8)
+    key = maze_key(grid, costs)
+    min_cost, directed = min_step_cost(grid, costs), costs is not None
+    landmarks, fields = select_landmarks(grid, k, costs)
+    if not fields:
+        return LandmarkTable(key, landmarks, np.zeros((0,) + grid.shape, dtype=np.uint16),
+                             min_cost, directed)
+
+    distances = np.stack(fields)
+    # uint16 halves the memory unless some distance does not fit
+    if distances.max() < np.iinfo(np.uint16).max:
+        stored = distances.astype(np.uint16)
+        stored[distances == UNREACHABLE] = MISSING[stored.dtype]
+        distances = stored
+    return LandmarkTable(key, landmarks, distances, min_cost, directed)
+
+class LandmarkTableCache:
+    """
+    LRU cache of landmark tables keyed by maze (and cost) content hash and landmark count.
+
+    With a directory, tables are also saved as .npz files and loaded from there
+    on a memory miss, so they survive restarts and are shared between processes.
+    """
+    def __init__(self, max_bytes=256 * 1024 * 1024, directory=None):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.tables = OrderedDict()  # (maze_key, k) -> LandmarkTable
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def path(self, key, k):
+        return os.path.join(self.directory, f"{key}-k{k}.npz")
+
+    def get(self, maze, k=DEFAULT_LANDMARKS, costs=None):
+        """Return the landmark table for maze (with optional cell costs), building (or loading) it on a miss"""
+        grid = np.ascontiguousarray(maze, dtype=np.uint8)
+        key = maze_key(grid, costs)
+        with self.lock:
+            table = self.tables.get((key, k))
+            if table is not None:
+                self.tables.move_to_end((key, k))
+                self.hits += 1
+                return table
+            self.misses += 1
+
+        table = None
+        if self.directory is not None and os.path.exists(self.path(key, k)):
+            table = load_landmark_table(self.path(key, k))
+        if table is None:
+            table = build_landmark_table(grid, k, costs)
+            if self.directory is not None:
+                os.makedirs(self.directory, exist_ok=True)
+                tmp_path = self.path(key, k) + f".{os.getpid()}.tmp.npz"
+                table.save(tmp_path)
+                os.replace(tmp_path, self.path(key, k))
+        table.distances.setflags(write=False)
+        self.put((key, k), table)
+        return table
+
+    def put(self, key, table):
+        with self.lock:
+            if key in self.tables or table.nbytes > self.max_bytes:
+                return
+            self.tables[key] = table
+            self.current_bytes += table.nbytes
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self.tables.popitem(last=False)
+                self.current_bytes -= evicted.nbytes
+
+    def clear(self):
+        """Drop all cached tables (files on disk are kept)"""
+        with self.lock:
+            self.tables.clear()
+            self.current_bytes = 0
+            self.hits = self.misses = 0
+
+# Shared cache used by heuristic contexts
+landmark_cache = LandmarkTableCache()
+
+def get_landmark_table(maze, k=DEFAULT_LANDMARKS, costs=None):
+    """Return the landmark table for maze (with optional cell costs) from the shared cache"""
+    return landmark_cache.get(maze, k, costs)
@@ -1,3 +1,5 @@
+import numpy as np
+
 def manhattan_distance(a, b):
     """
     Calculate Manhattan distance between two points
@@ -10,3 +12,17 @@ def manhattan_distance(a, b):
         Manhattan distance (sum of absolute differences)
     """
     return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+def manhattan_distance_batch(positions, goal):
+    """
+    Calculate Manhattan distances from many points to one goal
+    
+    Args:
+        positions: (N, 2) array of positions [x, y]
+        goal: Goal position [x, y]
+        
+    Returns:
+        (N,) array of Manhattan distances
+    """
+    positions = np.asarray(positions)
+    return np.abs(positions[:, 0] - goal[0]) + np.abs(positions[:, 1] - goal[1])
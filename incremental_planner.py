@@ -0,0 +1,178 @@
+import heapq
+import threading
+from array import array
+from collections import OrderedDict
+import numpy as np
+from grid_engine import as_grid, descend_distance_field, pad_grid, to_flat
+from heuristic.distance_cache import UNREACHABLE, distance_cache, get_distance_field, maze_key
+
+# Distance of cells that cannot reach the goal during repair
+INFINITE = 2 ** 31 - 1
+
+class IncrementalPlanner:
+    """
+    Goal distance field and path for one maze that is edited between solves.
+
+    The planner keeps the full BFS distance field towards its goal and repairs it
+    after cell updates with a Lifelong Planning A* style pass (g / rhs values,
+    unit costs, no heuristic, so the whole field is kept exact). Only cells whose
+    distance actually changes are touched. Paths are read off the field by
+    descent, so any start can be answered without search, and the repaired
+    field is put back into the shared distance cache for the edited maze, where
+    the learned heuristics pick it up instead of running a new BFS.
+    """
+    def __init__(self, maze, goal):
+        """
+        Args:
+            maze: 2D grid (0=path, 1=wall); the planner works on its own copy
+            goal: Goal position [x, y]
+        """
+        self.grid = np.array(as_grid(maze))  # Own writable copy
+        self.goal = [int(goal[0]), int(goal[1])]
+        height, width = self.grid.shape
+        self.padded_width = width + 2
+        self.offsets = (-self.padded_width, 1, self.padded_width, -1)
+        self.cells = bytearray(pad_grid(self.grid).tobytes())
+        self.goal_index = to_flat(self.goal, self.padded_width)
+
+        # Start consistent from the (cached) BFS field: rhs == g everywhere
+        field = np.pad(get_distance_field(self.grid, self.goal), 1, constant_values=UNREACHABLE)
+        field = np.where(field == UNREACHABLE, INFINITE, field).astype('l')
+        self.g = array('l', field.tobytes())
+        self.rhs = array('l', self.g)
+        self.queue = []
+        self.lock = threading.Lock()
+        self.last_stats = {}
+
+    def _compute_rhs(self, index):
+        """One-step lookahead distance of a cell from its neighbors' g-values"""
+        if self.cells[index]:
+            return INFINITE
+        if index == self.goal_index:
+            return 0
+        g = self.g
+        best = min(g[index + offset] for offset in self.offsets)
+        return INFINITE if best == INFINITE else best + 1
+
+    def _update_cell(self, index):
+        """Recompute rhs and queue the cell if it became inconsistent"""
+        rhs = self._compute_rhs(index)
+        self.rhs[index] = rhs
+        g = self.g[index]
+        if g != rhs:
+            heapq.heappush(self.queue, (min(g, rhs), index))
+
+    def _repair(self):
+        """Process inconsistent cells until the field is exact again; returns (pops, changed cells)"""
+        g, rhs, queue, offsets = self.g, self.rhs, self.queue, self.offsets
+        update = self._update_cell
+        pops = 0
+        changed = set()
+        while queue:
+            key, index = heapq.heappop(queue)
+            pops += 1
+            if g[index] == rhs[index]:
+                continue  # Already consistent (stale entry)
+            if key != min(g[index], rhs[index]):
+                heapq.heappush(queue, (min(g[index], rhs[index]), index))
+                continue
+            changed.add(index)
+            if g[index] > rhs[index]:
+                # Overconsistent: the cell got closer, settle it and relax its neighbors
+                g[index] = rhs[index]
+                for offset in offsets:
+                    if not self.cells[index + offset]:
+                        update(index + offset)
+            else:
+                # Underconsistent: the cell got farther, invalidate it and everything depending on it
+                g[index] = INFINITE
+                update(index)
+                for offset in offsets:
+                    update(index + offset)
+        return pops, len(changed)
+
+    def update(self, changes):
+        """
+        Apply a batch of cell changes and repair the distance field
+
+        Args:
+            changes: Iterable of (x, y, value) with value 0 (path) or 1 (wall)
+
+        Returns:
+            Dict of repair statistics: changed_cells (cells edited), repaired_cells
+            (cells whose distance was recomputed) and queue_pops
+        """
+        height, width = self.grid.shape
+        # Validate the whole batch before editing anything
+        cells = []
+        for x, y, value in changes:
+            x, y, value = int(x), int(y), 1 if value else 0
+            if not (0 <= x < height and 0 <= y < width):
+                raise ValueError(f"Cell {[x, y]} is outside the maze")
+            cells.append((x, y, value))
+
+        with self.lock:
+            touched = []
+            for x, y, value in cells:
+                index = to_flat((x, y), self.padded_width)
+                if self.cells[index] != value:
+                    self.cells[index] = value
+                    self.grid[x, y] = value
+                    touched.append(index)
+
+            for index in touched:
+                self._update_cell(index)
+                for offset in self.offsets:
+                    neighbor = index + offset
+                    if not self.cells[neighbor]:
+                        self._update_cell(neighbor)
+            pops, repaired = self._repair()
+
+            if touched:
+                # The edited maze has a new content hash; cache its exact field
+                field = self.distance_field()
+                distance_cache.put((maze_key(self.grid), self.goal[0], self.goal[1]), field)
+
+            self.last_stats = {'changed_cells': len(touched), 'repaired_cells': repaired, 'queue_pops': pops}
+            return self.last_stats
+
+    def distance_field(self):
+        """Return the current distance field as a read-only int32 array (UNREACHABLE where no path)"""
+        height, width = self.grid.shape
+        padded = np.frombuffer(self.g, dtype='l')
+        padded = padded.reshape(height + 2, self.padded_width)[1:-1, 1:-1]
+        field = np.where(padded == INFINITE, UNREACHABLE, padded).astype(np.int32)
+        field.setflags(write=False)
+        return field
+
+    def path(self, start):
+        """Shortest path from start to the goal on the current maze, or None if unreachable"""
+        if self.grid[start[0], start[1]]:
+            return None
+        with self.lock:
+            return descend_distance_field(self.distance_field(), start)
+
+class PlannerPool:
+    """
+    Bounded LRU of incremental planners keyed by maze ID and goal.
+
+    take() removes the planner, so two requests never edit the same planner at
+    once; put() files it under the ID of the edited maze.
+    """
+    def __init__(self, max_planners=32):
+        self.max_planners = max_planners
+        self.planners = OrderedDict()
+        self.lock = threading.Lock()
+
+    def take(self, maze_id, goal):
+        """Remove and return the planner for maze_id and goal, or None"""
+        with self.lock:
+            return self.planners.pop((maze_id, int(goal[0]), int(goal[1])), None)
+
+    def put(self, maze_id, planner):
+        """Store a planner under the ID of the maze it now holds"""
+        with self.lock:
+            self.planners[(maze_id, planner.goal[0], planner.goal[1])] = planner
+            self.planners.move_to_end((maze_id, planner.goal[0], planner.goal[1]))
+            while len(self.planners) > self.max_planners:
+                self.planners.popitem(last=False)
@@ -1,8 +1,6 @@
-import time
-import matplotlib.pyplot as plt
-import numpy as np
 from maze_generator import generate_maze, print_maze
 from astar_algorithm import astar_solve
+from maze_render import save_maze_png
 
 def main():
     # Create maze dimensions
@@ -18,7 +16,7 @@ def main():
     # Compare different heuristics
     compare_heuristics(maze, start, end)
 
-def compare_heuristics(maze, start, end):
+def compare_heuristics(maze, start, end, bidirectional=False, engine='grid'):
     """
     Compare different heuristic functions for A* algorithm
     
@@ -26,27 +24,37 @@ def compare_heuristics(maze, start, end):
         maze: The maze grid
         start: Starting position [x, y]
         end: Goal position [x, y]
+        bidirectional: If True, use bidirectional A* for every heuristic
+        engine: Search engine for every heuristic ('grid', 'jps' or 'list', see astar_solve)
     """
-    heuristic_types = ['manhattan', 'knn', 'decision_tree']
+    heuristic_types = ['manhattan', 'knn', 'decision_tree', 'landmark']
     results = {}
     
     print("\nComparing different heuristic functions:")
     print("----------------------------------------")
     
     for heuristic_type in heuristic_types:
-        print(f"\nSolving maze with A* algorithm using {heuristic_type} heuristic...")
+        search = "Jump Point Search" if engine == 'jps' else "bidirectional A*" if bidirectional else "A*"
+        print(f"\nSolving maze with {search} algorithm using {heuristic_type} heuristic...")
         
         # Solve the maze with the specified heuristic
-        solved_maze, execution_time = astar_solve(maze, start, end, heuristic_type)
+        stats = {}
+        solved_maze, execution_time = astar_solve(maze, start, end, heuristic_type, engine=engine,
+                                                  stats=stats, bidirectional=bidirectional)
         
         # Store result
         results[heuristic_type] = {
             'time': execution_time,
-            'solved_maze': solved_maze
+            'solved_maze': solved_maze,
+            'stats': stats
         }
         
         # Print result
         print(f"Execution time with {heuristic_type}: {execution_time:.6f} seconds")
+        print(f"  Expanded {stats['expanded_nodes']} nodes, generated {stats['generated_nodes']}, "
+              f"path length {stats['path_length']}, {stats['heuristic_calls']} heuristic calls")
+        print(f"  Training {stats['training_time']:.6f}s, heuristic {stats['heuristic_time']:.6f}s, "
+              f"search {stats['search_time']:.6f}s")
         
     # Identify the fastest heuristic
     fastest = min(results.items(), key=lambda x: x[1]['time'])
@@ -54,7 +62,8 @@ def compare_heuristics(maze, start, end):
     
     # Print the solution from the fastest heuristic
     print("\nSolution using the fastest heuristic:")
-    print_maze(fastest[1]['solved_maze'])
+    print_maze(fastest[1]['solved_maze'], start=start, end=end)
+    save_maze_png(fastest[1]['solved_maze'], 'fastest_solution.png', start, end)
     
     # Plot comparison
     plot_comparison(results)
@@ -66,11 +75,14 @@ def plot_comparison(results):
     Args:
         results: Dictionary with heuristic results
     """
+    # Imported here: matplotlib takes longer to load than a small maze takes to solve
+    import matplotlib.pyplot as plt
+
     heuristics = list(results.keys())
     times = [results[h]['time'] for h in heuristics]
     
     plt.figure(figsize=(10, 6))
-    bars = plt.bar(heuristics, times, color=['blue', 'green', 'red'])
+    bars = plt.bar(heuristics, times, color=['blue', 'green', 'red', 'purple'])
     
     # Add labels and title
     plt.xlabel('Heuristic Function')
@@ -0,0 +1,191 @@
+import base64
+import binascii
+import numpy as np
+from grid_engine import as_grid, mark_path
+
+# Move letters for path_to_moves, keyed by (dx, dy)
+MOVES = {(-1, 0): 'U', (0, 1): 'R', (1, 0): 'D', (0, -1): 'L'}
+MOVE_STEPS = {move: step for step, move in MOVES.items()}
+
+# Largest maze (in cells) the decoders accept, checked before anything is allocated
+MAX_CELLS = 16 * 1024 * 1024
+
+def path_to_moves(path):
+    """
+    Encode a path as a move string
+
+    Args:
+        path: List of [x, y] positions, each one step from the previous
+
+    Returns:
+        String of 'U', 'R', 'D', 'L' moves (one per step), or None if path is None
+    """
+    if path is None:
+        return None
+    return ''.join(MOVES[(x2 - x1, y2 - y1)] for (x1, y1), (x2, y2) in zip(path, path[1:]))
+
+def moves_to_path(start, moves):
+    """Decode a move string from path_to_moves back into a list of [x, y] positions"""
+    path = [list(start)]
+    for move in moves:
+        dx, dy = MOVE_STEPS[move]
+        path.append([path[-1][0] + dx, path[-1][1] + dy])
+    return path
+
+def encode_rle(maze):
+    """
+    Run-length encode a grid in row-major order
+
+    Returns:
+        Dict with 'shape', 'values' (cell value of each run) and 'runs' (run lengths)
+    """
+    grid = as_grid(maze)
+    flat = grid.ravel()
+    if flat.size == 0:
+        return {'shape': list(grid.shape), 'values': [], 'runs': []}
+    starts = np.concatenate(([0], np.flatnonzero(flat[1:] != flat[:-1]) + 1))
+    runs = np.diff(np.append(starts, flat.size))
+    return {'shape': list(grid.shape), 'values': flat[starts].tolist(), 'runs': runs.tolist()}
+
+def _decode_shape(shape, max_cells):
+    """Return shape as (height, width), raising ValueError unless it is two positive ints within max_cells"""
+    if (not isinstance(shape, (list, tuple)) or len(shape) != 2 or
+            not all(isinstance(n, int) and not isinstance(n, bool) and n > 0 for n in shape)):
+        raise ValueError("shape must be [height, width] with positive integers")
+    if shape[0] * shape[1] > max_cells:
+        raise ValueError(f"maze has more than {max_cells} cells")
+    return shape[0], shape[1]
+
+def _int_array(values, name):
+    """Convert a JSON list of integers to an int64 array, raising ValueError otherwise"""
+    if not isinstance(values, (list, tuple)):
+        raise ValueError(f"{name} must be a list of integers")
+    try:
+        array = np.asarray(values)
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError(f"{name} must be a list of integers") from None
+    if array.ndim != 1 or (array.size and array.dtype.kind not in 'iu'):
+        raise ValueError(f"{name} must be a list of integers")
+    return array.astype(np.int64)
+
+def decode_rle(encoded, max_cells=MAX_CELLS):
+    """
+    Decode an encode_rle dict back into a uint8 grid
+
+    Raises:
+        ValueError: If the dict is malformed, its runs do not cover the shape exactly
+            or the maze has more than max_cells cells
+    """
+    height, width = _decode_shape(encoded.get('shape'), max_cells)
+    values = _int_array(encoded.get('values'), 'values')
+    runs = _int_array(encoded.get('runs'), 'runs')
+    if len(values) != len(runs):
+        raise ValueError("values and runs must have the same length")
+    if len(values) and (values.min() < 0 or values.max() > 255):
+        raise ValueError("values must be between 0 and 255")
+    # Checked before np.repeat so a bogus run length cannot force a huge allocation
+    if len(runs) and (runs.min() < 0 or runs.max() > height * width):
+        raise ValueError("runs must be between 0 and the number of cells")
+    if int(runs.sum()) != height * width:
+        raise ValueError("runs do not add up to height * width")
+    return np.repeat(values.astype(np.uint8), runs).reshape(height, width)
+
+def encode_bits(maze):
+    """
+    Bit-pack a 0/1 grid (row-major, most significant bit first) as base64
+
+    Returns:
+        Dict with 'shape' and 'bits'
+    """
+    grid = as_grid(maze)
+    if grid.max(initial=0) > 1:
+        raise ValueError("Only 0/1 grids can be bit-packed")
+    bits = np.packbits(grid, axis=None)
+    return {'shape': list(grid.shape), 'bits': base64.b64encode(bits.tobytes()).decode('ascii')}
+
+def decode_bits(encoded, max_cells=MAX_CELLS):
+    """
+    Decode an encode_bits dict back into a uint8 grid
+
+    Raises:
+        ValueError: If the dict is malformed (including invalid base64), the bit count
+            does not match the shape or the maze has more than max_cells cells
+    """
+    height, width = _decode_shape(encoded.get('shape'), max_cells)
+    bits = encoded.get('bits')
+    if not isinstance(bits, str):
+        raise ValueError("bits must be a base64 string")
+    # Compare the encoded length first so an oversized payload is never decoded
+    size = -(-height * width // 8)
+    if len(bits) != 4 * -(-size // 3):
+        raise ValueError("bits do not match height * width")
+    try:
+        packed = np.frombuffer(base64.b64decode(bits, validate=True), dtype=np.uint8)
+    except binascii.Error as error:
+        raise ValueError(f"invalid base64 bits: {error}") from None
+    if len(packed) != size:
+        raise ValueError("bits do not match height * width")
+    return np.unpackbits(packed, count=height * width).reshape(height, width)
+
+# Formats accepted by format_maze and format_solution
+MAZE_FORMATS = ('grid', 'rle', 'bits')
+SOLUTION_FORMATS = ('grid', 'path', 'moves', 'rle')
+
+def format_maze(maze, fmt='grid'):
+    """Return the response fields for a maze in one of MAZE_FORMATS"""
+    if fmt == 'rle':
+        return {'maze_rle': encode_rle(maze)}
+    if fmt == 'bits':
+        return {'maze_bits': encode_bits(maze)}
+    return {'maze': as_grid(maze).tolist() if isinstance(maze, np.ndarray) else maze}
+
+def format_solution(maze, path, fmt='grid'):
+    """
+    Return the response fields for a solved path in one of SOLUTION_FORMATS
+
+    'grid' marks the path on a full maze copy like astar_solve; the other formats
+    never build the solved grid in JSON-encodable form.
+    """
+    if fmt == 'path':
+        return {'path': path}
+    if fmt == 'moves':
+        return {'start': path[0] if path else None, 'moves': path_to_moves(path)}
+    if fmt == 'rle':
+        return {'solved_maze_rle': encode_rle(mark_path(as_grid(maze), path))}
+    solved_maze = mark_path(maze, path)
+    return {'solved_maze': solved_maze.tolist() if isinstance(solved_maze, np.ndarray) else solved_maze}
+
+def decode_maze(data, max_cells=MAX_CELLS):
+    """
+    Read a maze sent as 'maze', 'maze_rle' or 'maze_bits' in a request body
+
+    Returns:
+        uint8 grid of 0 (path) and 1 (wall) cells, or None if the body has no maze
+
+    Raises:
+        ValueError: If the maze is malformed or larger than max_cells cells
+    """
+    if data.get('maze_rle') is not None:
+        if not isinstance(data['maze_rle'], dict):
+            raise ValueError("maze_rle must be an object")
+        grid = decode_rle(data['maze_rle'], max_cells)
+    elif data.get('maze_bits') is not None:
+        if not isinstance(data['maze_bits'], dict):
+            raise ValueError("maze_bits must be an object")
+        grid = decode_bits(data['maze_bits'], max_cells)
+    elif data.get('maze') is not None:
+        maze = data['maze']
+        if not isinstance(maze, list) or not maze or not isinstance(maze[0], list):
+            raise ValueError("maze must be a list of rows")
+        _decode_shape([len(maze), len(maze[0])], max_cells)
+        try:
+            grid = np.array(maze)
+        except ValueError:
+            raise ValueError("maze rows must all have the same length") from None
+        if grid.ndim != 2 or grid.dtype.kind not in 'iu':
+            raise ValueError("maze must be a rectangular grid of integers")
+    else:
+        return None
+    if grid.min(initial=0) < 0 or grid.max(initial=0) > 1:
+        raise ValueError("maze cells must be 0 (path) or 1 (wall)")
+    return as_grid(grid)
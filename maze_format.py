@@ -0,0 +1,103 @@
+import struct
+import numpy as np
+from grid_engine import as_grid
+
+# File layout: fixed little-endian header followed by the grid
+#   magic, version, flags, reserved, height, width, start x/y, end x/y, seed
+HEADER_FORMAT = '<4sBBHIIIIIIq'
+HEADER_SIZE = 64  # Header is zero-padded so the grid starts on an aligned offset
+MAGIC = b'MAZE'
+VERSION = 1
+
+FLAG_BIT_PACKED = 1  # Grid stored as one bit per cell (0=path, 1=wall)
+FLAG_HAS_SEED = 2  # Seed field holds the generation seed
+
+def save_maze(path, maze, start=None, end=None, seed=None, bit_packed=False):
+    """
+    Write a maze to the binary maze format
+
+    Args:
+        path: Output file path
+        maze: 2D grid as nested lists or a NumPy array
+        start: Starting position [x, y] (default [1, 1])
+        end: Goal position [x, y] (default: opposite corner)
+        seed: Generation seed to record, if any
+        bit_packed: Store one bit per cell instead of one byte; only valid for 0/1 grids
+    """
+    grid = as_grid(maze)
+    height, width = grid.shape
+    start = start if start is not None else [1, 1]
+    end = end if end is not None else [height - 2, width - 2]
+
+    flags = 0
+    if bit_packed:
+        if grid.max(initial=0) > 1:
+            raise ValueError("Bit-packed mazes can only hold 0 (path) and 1 (wall) cells")
+        flags |= FLAG_BIT_PACKED
+    if seed is not None:
+        flags |= FLAG_HAS_SEED
+
+    header = struct.pack(HEADER_FORMAT, MAGIC, VERSION, flags, 0, height, width,
+                         start[0], start[1], end[0], end[1], seed if seed is not None else -1)
+    with open(path, 'wb') as f:
+        f.write(header.ljust(HEADER_SIZE, b'\0'))
+        if bit_packed:
+            f.write(np.packbits(grid, axis=None).tobytes())
+        else:
+            f.write(grid.tobytes())
+
+def read_header(path):
+    """
+    Read the header of a binary maze file
+
+    Returns:
+        Dict with height, width, start, end, seed (None if absent) and bit_packed
+    """
+    with open(path, 'rb') as f:
+        raw = f.read(HEADER_SIZE)
+    if len(raw) < HEADER_SIZE:
+        raise ValueError(f"{path} is too short to be a maze file")
+
+    (magic, version, flags, _, height, width,
+     start_x, start_y, end_x, end_y, seed) = struct.unpack_from(HEADER_FORMAT, raw)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a maze file")
+    if version != VERSION:
+        raise ValueError(f"Unsupported maze file version {version}")
+
+    return {
+        'height': height,
+        'width': width,
+        'start': [start_x, start_y],
+        'end': [end_x, end_y],
+        'seed': seed if flags & FLAG_HAS_SEED else None,
+        'bit_packed': bool(flags & FLAG_BIT_PACKED),
+    }
+
+def load_maze(path, mmap=True):
+    """
+    Load a binary maze file
+
+    Byte grids are memory-mapped read-only by default, so huge mazes are paged in
+    on demand instead of being read up front. Bit-packed grids are always unpacked
+    into memory.
+
+    Args:
+        path: Maze file path
+        mmap: Memory-map byte grids instead of reading them
+
+    Returns:
+        tuple: (grid, header) where grid is a 2D uint8 array and header is read_header's dict
+    """
+    header = read_header(path)
+    shape = (header['height'], header['width'])
+
+    if header['bit_packed']:
+        packed = np.fromfile(path, dtype=np.uint8, offset=HEADER_SIZE)
+        grid = np.unpackbits(packed, count=shape[0] * shape[1]).reshape(shape)
+    elif mmap:
+        grid = np.memmap(path, dtype=np.uint8, mode='r', offset=HEADER_SIZE, shape=shape)
+    else:
+        grid = np.fromfile(path, dtype=np.uint8, offset=HEADER_SIZE,
+                           count=shape[0] * shape[1]).reshape(shape)
+    return grid, header
@@ -1,11 +1,40 @@
 import random
-import colorama
-from colorama import Fore, Back, Style
+from itertools import permutations
+import numpy as np
+from maze_render import print_frame
 
-# Initialize colorama
-colorama.init(autoreset=True)
+# Cell costs drawn by terrain=True: open ground, rough ground, mud
+DEFAULT_TERRAIN = (1, 2, 5)
 
-def generate_maze(n, m, multiple_paths=True, wall_removal_probability=0.25):
+def generate_terrain(n, m, levels=DEFAULT_TERRAIN, patch_size=4, seed=None):
+    """Generate a patchy cost array for weighted mazes
+    
+    Costs are drawn per patch_size x patch_size block, so terrain forms regions
+    rather than per-cell noise.
+    
+    Args:
+        n: Height of the maze
+        m: Width of the maze
+        levels: Cell costs to draw from (small positive integers)
+        patch_size: Side of the square patches sharing one cost
+        seed: Seed for the NumPy generator
+    
+    Returns:
+        2D uint8 array of shape (n, m) with the cost of entering each cell
+    """
+    if not levels or min(levels) < 1 or max(levels) > 255:
+        raise ValueError("Terrain costs must be integers from 1 to 255")
+    rng = np.random.default_rng(seed)
+    patches = rng.integers(len(levels), size=(-(-n // patch_size), -(-m // patch_size)))
+    costs = np.asarray(levels, dtype=np.uint8)[patches]
+    return np.ascontiguousarray(costs.repeat(patch_size, axis=0).repeat(patch_size, axis=1)[:n, :m])
+
+def _terrain_levels(terrain):
+    """Cost levels for a terrain option: True for DEFAULT_TERRAIN, or a sequence of costs"""
+    return DEFAULT_TERRAIN if terrain is True else tuple(int(level) for level in terrain)
+
+def generate_maze(n, m, multiple_paths=True, wall_removal_probability=0.25, seed=None, rng=None,
+                  terrain=None):
     """Generate a maze with walls (1), paths (0)
     
     Args:
@@ -13,12 +42,23 @@ def generate_maze(n, m, multiple_paths=True, wall_removal_probability=0.25):
         m: Width of the maze
         multiple_paths: If True, creates multiple possible paths by randomly removing walls
         wall_removal_probability: Probability (0-1) of removing a wall to create alternative paths
+        seed: Seed for a private random.Random, so the same seed gives the same maze
+        rng: random.Random instance to draw from (overrides seed; default is the global random module)
+        terrain: Optional cell costs for a weighted maze: True for DEFAULT_TERRAIN or a
+            sequence of costs (see generate_terrain). The maze itself is unchanged.
+    
+    Returns:
+        The maze as nested lists, or (maze, costs) with terrain, costs being a uint8
+        array for astar_solve(costs=...)
     """
+    if rng is None:
+        rng = random if seed is None else random.Random(seed)
+    
     # Create initial grid with all walls
     maze = [[1 for _ in range(m)] for _ in range(n)]
     
-    # Carve paths using recursive backtracking
-    _carve_passages(maze, 1, 1)
+    # Carve paths using backtracking
+    _carve_passages(maze, 1, 1, rng)
     
     # Ensure start and end are open
     maze[1][1] = 0  # Start point
@@ -37,13 +77,13 @@ def generate_maze(n, m, multiple_paths=True, wall_removal_probability=0.25):
                     
                     # Higher chance of removal if it would connect existing paths
                     if horizontal_path or vertical_path:
-                        if random.random() < wall_removal_probability * 1.5:  # Higher probability for good candidates
+                        if rng.random() < wall_removal_probability * 1.5:  # Higher probability for good candidates
                             maze[i][j] = 0  # Remove wall
                     # Consider diagonal path connections with lower probability
-                    elif diagonal_path and random.random() < wall_removal_probability * 0.7:
+                    elif diagonal_path and rng.random() < wall_removal_probability * 0.7:
                         maze[i][j] = 0
                     # Sometimes remove random walls to create diverse path options
-                    elif random.random() < wall_removal_probability * 0.4:
+                    elif rng.random() < wall_removal_probability * 0.4:
                         maze[i][j] = 0
         
         # Second pass: Create some wider corridors by removing adjacent walls
@@ -54,48 +94,173 @@ def generate_maze(n, m, multiple_paths=True, wall_removal_probability=0.25):
                     for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
                         nx, ny = i + dx, j + dy
                         if (0 < nx < n-1 and 0 < ny < m-1 and 
-                            maze[nx][ny] == 1 and random.random() < wall_removal_probability * 0.3):
+                            maze[nx][ny] == 1 and rng.random() < wall_removal_probability * 0.3):
                             maze[nx][ny] = 0  # Remove additional adjacent wall
     
+    if terrain:
+        # Drawn after the maze, so the same seed gives the same maze with or without terrain
+        return maze, generate_terrain(n, m, _terrain_levels(terrain), seed=rng.getrandbits(32))
     return maze
 
-def _carve_passages(maze, cx, cy):
-    """Recursively carve passages through the maze"""
-    directions = [(0, 2), (2, 0), (0, -2), (-2, 0)]
-    random.shuffle(directions)
-    
-    for dx, dy in directions:
-        nx, ny = cx + dx, cy + dy
-        if 0 < nx < len(maze)-1 and 0 < ny < len(maze[0])-1 and maze[nx][ny] == 1:
-            maze[nx][ny] = 0
-            maze[cx + dx//2][cy + dy//2] = 0
-            _carve_passages(maze, nx, ny)
+def _carve_passages(maze, cx, cy, rng=random):
+    """Carve passages through the maze by backtracking with an explicit stack
+    
+    Visits cells in the same order as the recursive version (one shuffle per
+    cell) without being limited by Python's recursion depth.
+    """
+    height, width = len(maze), len(maze[0])
+    
+    def shuffled_directions():
+        directions = [(0, 2), (2, 0), (0, -2), (-2, 0)]
+        rng.shuffle(directions)
+        return iter(directions)
+    
+    stack = [(cx, cy, shuffled_directions())]
+    while stack:
+        cx, cy, directions = stack[-1]
+        for dx, dy in directions:
+            nx, ny = cx + dx, cy + dy
+            if 0 < nx < height-1 and 0 < ny < width-1 and maze[nx][ny] == 1:
+                maze[nx][ny] = 0
+                maze[cx + dx//2][cy + dy//2] = 0
+                stack.append((nx, ny, shuffled_directions()))
+                break
+        else:
+            # All directions tried, backtrack
+            stack.pop()
 
-def print_maze(maze):
+# Every ordering of the four carving directions, picked by index during array carving
+_DIRECTION_ORDERS = list(permutations([(0, 2), (2, 0), (0, -2), (-2, 0)]))
+
+def generate_maze_array(n, m, multiple_paths=True, wall_removal_probability=0.25, seed=None, rng=None,
+                        terrain=None):
+    """Generate a maze as a compact uint8 array with walls (1), paths (0)
+    
+    Same options as generate_maze, but carving uses an explicit stack over a flat
+    byte buffer and the wall-removal and corridor-widening passes are vectorized
+    with NumPy random masks, so very large grids are generated quickly.
+    
+    Args:
+        n: Height of the maze
+        m: Width of the maze
+        multiple_paths: If True, creates multiple possible paths by randomly removing walls
+        wall_removal_probability: Probability (0-1) of removing a wall to create alternative paths
+        seed: Seed for the NumPy generator, so the same seed gives the same maze
+        rng: numpy.random.Generator to draw from (overrides seed)
+        terrain: Optional cell costs, as in generate_maze
+    
+    Returns:
+        2D uint8 array of shape (n, m), or (maze, costs) with terrain
+    """
+    if rng is None:
+        rng = np.random.default_rng(seed)
+    maze = _carve_array(n, m, rng)
+    
+    # Ensure start and end are open
+    maze[1, 1] = 0  # Start point
+    maze[n-2, m-2] = 0  # End point
+    
+    if multiple_paths and n > 4 and m > 4:
+        _remove_walls(maze, wall_removal_probability, rng)
+        _widen_corridors(maze, wall_removal_probability, rng)
+    
+    if terrain:
+        return maze, generate_terrain(n, m, _terrain_levels(terrain), seed=int(rng.integers(2 ** 32)))
+    return maze
+
+def _carve_array(n, m, rng):
+    """Carve passages from (1, 1) with an explicit stack over a flat byte buffer
+    
+    The buffer has two extra rows above and below and two extra columns on the
+    right, so neighbor offsets never wrap or go out of range. Cells that can
+    still be carved are 1, open cells 0 and blocked cells (border, padding) 2.
+    """
+    width = m + 2
+    buffer = np.full((n + 4, width), 2, dtype=np.uint8)
+    buffer[3:n+1, 1:m-1] = 1  # Carvable interior; the maze border stays blocked
+    cells = bytearray(buffer.tobytes())
+    
+    # (offset to the next cell, offset to the wall in between) for each direction
+    steps = {(dx, dy): (dx * width + dy, (dx//2) * width + dy//2) for dx, dy in _DIRECTION_ORDERS[0]}
+    orders = [tuple(steps[d] for d in order) for order in _DIRECTION_ORDERS]
+    choices = rng.integers(0, len(orders), size=(n // 2) * (m // 2) + 1).tolist()
+    
+    current = 3 * width + 1
+    cells[current] = 0
+    visited = 0
+    stack = [(current, iter(orders[choices[visited]]))]
+    while stack:
+        current, directions = stack[-1]
+        for step, half in directions:
+            neighbor = current + step
+            if cells[neighbor] == 1:
+                cells[neighbor] = 0
+                cells[current + half] = 0
+                visited += 1
+                stack.append((neighbor, iter(orders[choices[visited]])))
+                break
+        else:
+            # All directions tried, backtrack
+            stack.pop()
+    
+    maze = np.frombuffer(cells, dtype=np.uint8).reshape(n + 4, width)[2:n+2, :m].copy()
+    maze[maze > 1] = 1
+    return maze
+
+def _remove_walls(maze, wall_removal_probability, rng):
+    """Vectorized first pass of generate_maze: remove walls, favoring ones that connect paths"""
+    p = wall_removal_probability
+    # Interior cells (2..n-3, 2..m-3) and their neighbors as shifted views
+    center = maze[2:-2, 2:-2]
+    path = maze == 0
+    up, down = path[1:-3, 2:-2], path[3:-1, 2:-2]
+    left, right = path[2:-2, 1:-3], path[2:-2, 3:-1]
+    horizontal_or_vertical = (left & right) | (up & down)
+    diagonal = (path[1:-3, 1:-3] & path[3:-1, 3:-1]) | (path[1:-3, 3:-1] & path[3:-1, 1:-3])
+    
+    # Diagonal candidates fall through to the random removal when their own draw fails
+    probability = np.where(horizontal_or_vertical, p * 1.5,
+                           np.where(diagonal, 1 - (1 - p * 0.7) * (1 - p * 0.4), p * 0.4))
+    remove = (center == 1) & (rng.random(center.shape) < probability)
+    center[remove] = 0
+
+def _widen_corridors(maze, wall_removal_probability, rng):
+    """Vectorized second pass of generate_maze: open walls next to interior path cells"""
+    n, m = maze.shape
+    q = wall_removal_probability * 0.3
+    # Count interior path cells (2..n-3, 2..m-3) next to every cell
+    source = np.zeros((n, m), dtype=bool)
+    source[2:-2, 2:-2] = maze[2:-2, 2:-2] == 0
+    adjacent = np.zeros((n, m), dtype=np.int8)
+    adjacent[1:, :] += source[:-1, :]
+    adjacent[:-1, :] += source[1:, :]
+    adjacent[:, 1:] += source[:, :-1]
+    adjacent[:, :-1] += source[:, 1:]
+    
+    # Each adjacent path cell gets one independent chance to remove the wall
+    probability = 1 - (1 - q) ** adjacent
+    remove = (maze == 1) & (adjacent > 0) & (rng.random((n, m)) < probability)
+    maze[remove] = 0
+
+def print_maze(maze, mode='auto', start=None, end=None):
     """
     Print the maze with colored formatting:
     - White for walls
     - Blue for path
     - Green for start
     - Red for end
+    
+    The whole frame is built in one buffer and written at once (see
+    maze_render.render_maze); mazes too wide for the terminal are drawn with
+    half-block characters and downsampled.
+    
+    Args:
+        maze: 2D grid (0=path, 1=wall, 2=solution path)
+        mode: 'full', 'half' or 'auto' (see maze_render.render_maze)
+        start: Start position [x, y] (defaults to [1, 1])
+        end: End position [x, y] (defaults to the opposite corner)
     """
-    start_pos = (1, 1)
-    end_pos = (len(maze)-2, len(maze[0])-2)
-    
-    for i, row in enumerate(maze):
-        line = ""
-        for j, cell in enumerate(row):
-            if (i, j) == start_pos:
-                line += Back.GREEN + '  ' + Style.RESET_ALL
-            elif (i, j) == end_pos:
-                line += Back.RED + '  ' + Style.RESET_ALL
-            elif cell == 1:
-                line += Back.WHITE + '  ' + Style.RESET_ALL
-            elif cell == 2:
-                line += Back.BLUE + '  ' + Style.RESET_ALL
-            else:
-                line += '  '
-        print(line)
+    print_frame(maze, start, end, mode)
 
 if __name__ == "__main__":
     # Example usage
@@ -0,0 +1,171 @@
+import shutil
+import struct
+import sys
+import zlib
+import numpy as np
+from grid_engine import as_grid
+
+# Cell codes used by the renderers, ordered by priority when cells are downsampled
+PATH, WALL, SOLUTION, END, START = range(5)
+
+# ANSI SGR codes per cell code (the same codes colorama's Back / Fore constants emit)
+BACKGROUND = ('\033[49m', '\033[47m', '\033[44m', '\033[41m', '\033[42m')
+FOREGROUND = ('\033[39m', '\033[37m', '\033[34m', '\033[31m', '\033[32m')
+RESET = '\033[0m'
+
+# RGB colors per cell code for PNG export, matching the web page
+PALETTE = np.array([
+    (255, 255, 255),  # path
+    (51, 51, 51),     # wall
+    (33, 150, 243),   # solution
+    (244, 67, 54),    # end
+    (76, 175, 80),    # start
+], dtype=np.uint8)
+
+def cell_codes(maze, start=None, end=None):
+    """
+    Return the maze as a uint8 array of cell codes
+
+    Args:
+        maze: 2D grid (0=path, 1=wall, 2=solution path)
+        start: Start position [x, y] (defaults to [1, 1])
+        end: End position [x, y] (defaults to the opposite corner)
+    """
+    grid = as_grid(maze)
+    codes = np.minimum(grid, SOLUTION)
+    height, width = codes.shape
+    start = start if start is not None else (1, 1)
+    end = end if end is not None else (height - 2, width - 2)
+    if 0 <= end[0] < height and 0 <= end[1] < width:
+        codes[end[0], end[1]] = END
+    if 0 <= start[0] < height and 0 <= start[1] < width:
+        codes[start[0], start[1]] = START
+    return codes
+
+def downsample(codes, factor):
+    """Shrink codes by factor in both directions, keeping the highest-priority code of each block"""
+    if factor <= 1:
+        return codes
+    height, width = codes.shape
+    padded = np.zeros((-(-height // factor) * factor, -(-width // factor) * factor), dtype=codes.dtype)
+    padded[:height, :width] = codes
+    blocks = padded.reshape(padded.shape[0] // factor, factor, padded.shape[1] // factor, factor)
+    return blocks.max(axis=(1, 3))
+
+def _render_runs(rows, tokens):
+    """
+    Join rows of token indices into one frame, one escape sequence per run of equal tokens
+
+    Args:
+        rows: 2D integer array of token indices
+        tokens: Sequence of (escape_code, text) per index; text is repeated for the run length
+    """
+    lines = []
+    for row in rows:
+        # Run starts: the first cell and every cell that differs from its left neighbor
+        starts = np.flatnonzero(np.r_[True, row[1:] != row[:-1]])
+        lengths = np.diff(np.r_[starts, len(row)])
+        parts = []
+        for token, length in zip(row[starts].tolist(), lengths.tolist()):
+            code, text = tokens[token]
+            parts.append(code + text * length)
+        parts.append(RESET)
+        lines.append(''.join(parts))
+    return '\n'.join(lines) + '\n'
+
+# Full mode: two spaces with the cell's background
+FULL_TOKENS = [(BACKGROUND[code], '  ') for code in range(5)]
+
+def _half_block_token(top, bottom):
+    """Escape code and character drawing two vertically stacked cells in one character"""
+    if top == bottom:
+        return BACKGROUND[top], ' '
+    if top == PATH:
+        return FOREGROUND[bottom] + BACKGROUND[PATH], '▄'  # Lower half block
+    return FOREGROUND[top] + BACKGROUND[bottom], '▀'  # Upper half block
+
+# Half-block mode: token index top * 5 + bottom
+HALF_TOKENS = [_half_block_token(top, bottom) for top in range(5) for bottom in range(5)]
+
+def render_maze(maze, start=None, end=None, mode='auto', columns=None):
+    """
+    Render a maze as one string of ANSI-colored text
+
+    The frame is built in a single buffer: cell codes come from NumPy, runs of
+    equal cells share one escape sequence, and each line ends with a reset.
+
+    Args:
+        maze: 2D grid (0=path, 1=wall, 2=solution path)
+        start: Start position [x, y] (defaults to [1, 1])
+        end: End position [x, y] (defaults to the opposite corner)
+        mode: 'full' (two characters per cell), 'half' (half-block characters, two
+            rows per line, downsampled to fit columns) or 'auto' ('full' if it fits)
+        columns: Width available (defaults to the terminal width)
+
+    Returns:
+        The frame, ending with a newline
+    """
+    codes = cell_codes(maze, start, end)
+    if columns is None:
+        columns = shutil.get_terminal_size().columns
+    height, width = codes.shape
+    if mode == 'auto':
+        mode = 'full' if 2 * width <= columns else 'half'
+
+    if mode == 'full':
+        return _render_runs(codes, FULL_TOKENS)
+    if mode != 'half':
+        raise ValueError(f"Unknown render mode: {mode}")
+
+    codes = downsample(codes, -(-width // max(columns, 1)))
+    if len(codes) % 2:
+        codes = np.vstack([codes, np.zeros((1, codes.shape[1]), dtype=codes.dtype)])
+    pairs = codes[0::2].astype(np.intp) * 5 + codes[1::2]
+    return _render_runs(pairs, HALF_TOKENS)
+
+def print_frame(maze, start=None, end=None, mode='auto', file=None):
+    """
+    Render a maze with render_maze and write it with a single write call
+
+    Standard output goes through colorama's stream wrapper, which translates the
+    escape codes on Windows consoles and strips them when output is redirected.
+    colorama is imported here, on the first print, rather than by every module
+    that generates mazes.
+    """
+    if file is None:
+        import colorama
+        file = colorama.AnsiToWin32(sys.stdout).stream
+    file.write(render_maze(maze, start, end, mode))
+    file.flush()
+
+def encode_png(rgb):
+    """Encode an (H, W, 3) uint8 array as PNG bytes (8-bit RGB, no filtering)"""
+    height, width, _ = rgb.shape
+    # Each scanline is prefixed with filter type 0
+    raw = np.zeros((height, width * 3 + 1), dtype=np.uint8)
+    raw[:, 1:] = rgb.reshape(height, width * 3)
+
+    def chunk(kind, data):
+        return (struct.pack('>I', len(data)) + kind + data +
+                struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff))
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) +
+            chunk(b'IDAT', zlib.compress(raw.tobytes(), 6)) + chunk(b'IEND', b''))
+
+def save_maze_png(maze, path, start=None, end=None, scale=4):
+    """
+    Write a maze as a PNG image, without matplotlib
+
+    Args:
+        maze: 2D grid (0=path, 1=wall, 2=solution path)
+        path: Output file
+        start: Start position [x, y] (defaults to [1, 1])
+        end: End position [x, y] (defaults to the opposite corner)
+        scale: Pixels per cell side
+    """
+    rgb = PALETTE[cell_codes(maze, start, end)]
+    if scale > 1:
+        rgb = rgb.repeat(scale, axis=0).repeat(scale, axis=1)
+    with open(path, 'wb') as file:
+        file.write(encode_png(rgb))
@@ -0,0 +1,126 @@
+import threading
+import time
+from collections import OrderedDict
+from astar_algorithm import astar_solve
+from grid_engine import as_costs, as_grid, descend_distance_field, mark_path
+from heuristic.context import HeuristicContext, normalize_heuristic
+from heuristic.distance_cache import get_distance_field
+from heuristic.features import wall_count_grid
+
+class MazeSolver:
+    """
+    Solver for many start/goal queries on one maze.
+
+    The maze is converted to its array form once, the 3x3 wall counts used by the
+    decision tree features are computed once for every cell, and trained
+    heuristic contexts are kept per goal, so repeated queries only pay for the
+    search itself.
+    """
+    def __init__(self, maze, heuristic_type='knn', engine='grid', open_list='heap',
+                 heuristic_mode='auto', max_contexts=64, costs=None):
+        """
+        Args:
+            maze: 2D grid (0=path, 1=wall) as nested lists or a NumPy array
+            heuristic_type: Heuristic used by solve ('manhattan', 'knn', 'decision_tree', 'landmark')
+            engine: Search engine passed to astar_solve ('grid' or 'jps')
+            open_list: Open list passed to astar_solve
+            heuristic_mode: Heuristic evaluation mode passed to astar_solve
+            max_contexts: Number of per-goal trained contexts to keep (least recently used dropped)
+            costs: Optional cell costs of a weighted maze (see astar_solve)
+        """
+        self.grid = as_grid(maze)
+        self.costs = as_costs(costs, self.grid) if costs is not None else None
+        self.wall_counts = wall_count_grid(self.grid)
+        self.heuristic_type = heuristic_type
+        self.engine = engine
+        self.open_list = open_list
+        self.heuristic_mode = heuristic_mode
+        self.max_contexts = max_contexts
+        self.contexts = OrderedDict()  # (goal_x, goal_y, heuristic_type) -> HeuristicContext
+        self.lock = threading.Lock()
+
+    def context(self, goal, heuristic_type=None):
+        """Return the trained heuristic context for goal, training it on first use"""
+        heuristic_type = normalize_heuristic(heuristic_type or self.heuristic_type)
+        key = (int(goal[0]), int(goal[1]), heuristic_type)
+        with self.lock:
+            if key in self.contexts:
+                self.contexts.move_to_end(key)
+                return self.contexts[key]
+
+        context = HeuristicContext(self.grid, goal, heuristic_type, wall_counts=self.wall_counts,
+                                   costs=self.costs).train()
+
+        with self.lock:
+            context = self.contexts.setdefault(key, context)
+            while len(self.contexts) > self.max_contexts:
+                self.contexts.popitem(last=False)
+        return context
+
+    def solve(self, start, end, heuristic_type=None, path_only=True, stats=None, **options):
+        """
+        Solve one query with astar_solve, reusing this maze's preprocessing
+
+        Args:
+            start: Starting position [x, y]
+            end: Goal position [x, y]
+            heuristic_type: Overrides the solver's heuristic for this query
+            path_only: If False, return a marked copy of the maze like astar_solve
+            stats: Optional statistics dict (see astar_solve)
+            **options: Extra keyword arguments for astar_solve (e.g. bidirectional, trace)
+
+        Returns:
+            (path, execution_time), or (solved_maze, execution_time) if not path_only
+        """
+        heuristic_type = heuristic_type or self.heuristic_type
+        options.setdefault('engine', self.engine)
+        options.setdefault('open_list', self.open_list)
+        options.setdefault('heuristic_mode', self.heuristic_mode)
+        if options.get('bidirectional'):
+            options.setdefault('backward_context', self.context(start, heuristic_type))
+        return astar_solve(self.grid, start, end, heuristic_type, path_only=path_only, stats=stats,
+                           context=self.context(end, heuristic_type), costs=self.costs, **options)
+
+    def solve_many(self, queries, group_by_goal=False, heuristic_type=None, **options):
+        """
+        Answer a batch of (start, end) queries
+
+        With group_by_goal, queries are grouped by end and each group is answered
+        from a single goal distance field (one backward BFS, or Dial search with
+        costs, shared with the heuristic training through the distance cache):
+        paths are read off by descending the field, so they are optimal and need
+        no search. Otherwise every query runs solve(), with contexts still shared
+        per goal.
+
+        Args:
+            queries: Iterable of (start, end) pairs
+            group_by_goal: Answer queries sharing a goal from its distance field
+            heuristic_type: Overrides the solver's heuristic (searched queries only)
+            **options: Extra keyword arguments for solve()
+
+        Returns:
+            List of (path, execution_time) in query order; path is None if unreachable.
+            For grouped queries the time includes an equal share of the field computation.
+        """
+        queries = [(list(start), list(end)) for start, end in queries]
+        if not group_by_goal:
+            return [self.solve(start, end, heuristic_type, **options) for start, end in queries]
+
+        groups = OrderedDict()  # goal -> indices of its queries
+        for index, (_, end) in enumerate(queries):
+            groups.setdefault((end[0], end[1]), []).append(index)
+
+        results = [None] * len(queries)
+        for goal, indices in groups.items():
+            start_time = time.time()
+            field = get_distance_field(self.grid, goal, self.costs)
+            field_share = (time.time() - start_time) / len(indices)
+            for index in indices:
+                start_time = time.time()
+                path = descend_distance_field(field, queries[index][0], self.costs)
+                results[index] = (path, time.time() - start_time + field_share)
+        return results
+
+    def mark(self, path):
+        """Return a copy of the maze array with path marked as 2"""
+        return mark_path(self.grid, path)
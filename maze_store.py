@@ -0,0 +1,251 @@
+import os
+import pickle
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from grid_engine import as_grid
+from heuristic.context import HeuristicContext, normalize_heuristic
+from heuristic.distance_cache import maze_key
+from maze_format import load_maze, save_maze
+
+# Maze IDs are maze_key digests (16-byte blake2b, hex encoded)
+MAZE_ID_PATTERN = re.compile(r'[0-9a-f]{32}')
+
+def is_maze_id(value):
+    """True if value has the form of a maze ID; IDs from clients end up in file names"""
+    return isinstance(value, str) and MAZE_ID_PATTERN.fullmatch(value) is not None
+
+class LRUStore:
+    """
+    Thread-safe LRU map with a byte budget and an optional time-to-live.
+
+    Each entry is stored with its approximate size; least recently used entries
+    are evicted once the total exceeds max_bytes, and entries older than ttl
+    seconds are dropped when they are next looked up.
+    """
+    def __init__(self, max_bytes, ttl=None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.entries = OrderedDict()  # key -> (value, nbytes, stored_at)
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """Return the value stored under key, or None if missing or expired"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and self.ttl is not None and time.time() - entry[2] > self.ttl:
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, nbytes):
+        """Store value under key, evicting old entries to stay within max_bytes"""
+        if nbytes > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (value, nbytes, time.time())
+            self.current_bytes += nbytes
+            while self.current_bytes > self.max_bytes:
+                self._remove(next(iter(self.entries)))
+                self.evictions += 1
+
+    def _remove(self, key):
+        _, nbytes, _ = self.entries.pop(key)
+        self.current_bytes -= nbytes
+
+    def stats(self):
+        """Return the store counters as a dict"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self.entries),
+            'bytes': self.current_bytes,
+        }
+
+class FileBackend:
+    """
+    Directory-backed second level for MazeStore, shared by all worker processes.
+
+    Mazes are written in the binary maze format (memory-mapped on load), results
+    and trained contexts are pickled. Files are written to a temporary name and
+    renamed, so concurrent workers never read partial entries.
+    """
+    def __init__(self, directory, ttl=None):
+        self.directory = directory
+        self.ttl = ttl
+        for namespace in ('mazes', 'results', 'contexts'):
+            os.makedirs(os.path.join(directory, namespace), exist_ok=True)
+
+    def path(self, namespace, key):
+        # Keys are built from request fields, so never let one leave the namespace folder
+        if os.sep in key or (os.altsep and os.altsep in key) or '..' in key:
+            raise ValueError(f"invalid store key: {key!r}")
+        extension = '.maze' if namespace == 'mazes' else '.pkl'
+        return os.path.join(self.directory, namespace, key + extension)
+
+    def load(self, namespace, key):
+        """Return the stored value, or None if missing or older than ttl"""
+        path = self.path(namespace, key)
+        try:
+            if self.ttl is not None and time.time() - os.path.getmtime(path) > self.ttl:
+                os.remove(path)
+                return None
+            if namespace == 'mazes':
+                return load_maze(path)[0]
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+    def save(self, namespace, key, value):
+        """Atomically write value under key"""
+        path = self.path(namespace, key)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            if namespace == 'mazes':
+                os.close(fd)
+                save_maze(tmp_path, value)
+            else:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def purge(self):
+        """Delete every file older than ttl; returns the number removed"""
+        if self.ttl is None:
+            return 0
+        removed = 0
+        cutoff = time.time() - self.ttl
+        for namespace in ('mazes', 'results', 'contexts'):
+            folder = os.path.join(self.directory, namespace)
+            for name in os.listdir(folder):
+                path = os.path.join(folder, name)
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                        removed += 1
+                except OSError:
+                    pass
+        return removed
+
+def _context_nbytes(context):
+    """Approximate memory held by a trained heuristic context"""
+    nbytes = context.grid.nbytes
+    if context.wall_counts is not None:
+        nbytes += context.wall_counts.nbytes
+    if context.table is not None:
+        nbytes += context.table.nbytes
+    model = context.model
+    if hasattr(model, 'positions'):  # KNNHeuristic
+        nbytes += model.positions.nbytes + model.distances.nbytes + 100 * len(model.cache)
+    elif hasattr(model, 'tree_'):  # Decision tree
+        nbytes += 100 * model.tree_.node_count
+    elif hasattr(model, 'residual'):  # Corpus tree refined per maze
+        nbytes += 100 * model.residual.tree_.node_count
+    # A LandmarkTable is shared by every goal on the maze and budgeted by landmark_cache
+    return nbytes
+
+class MazeStore:
+    """
+    Server-side store of mazes, solve results and trained heuristic contexts.
+
+    Everything is keyed by maze content hash, which doubles as the maze ID handed
+    to clients. Each kind of entry lives in its own LRU with a byte budget and an
+    optional TTL. With a directory, entries are also written to a FileBackend so
+    other worker processes (and restarts) get cache hits.
+    """
+    def __init__(self, max_bytes=256 * 1024 * 1024, ttl=None, directory=None):
+        # Split the memory budget between mazes, results and trained contexts
+        self.mazes = LRUStore(max_bytes // 4, ttl)
+        self.results = LRUStore(max_bytes // 8, ttl)
+        self.contexts = LRUStore(max_bytes - max_bytes // 4 - max_bytes // 8, ttl)
+        self.backend = FileBackend(directory, ttl) if directory else None
+
+    def _get(self, store, namespace, key, nbytes_of):
+        value = store.get(key)
+        if value is None and self.backend is not None:
+            value = self.backend.load(namespace, key)
+            if value is not None:
+                store.put(key, value, nbytes_of(value))
+        return value
+
+    def _put(self, store, namespace, key, value, nbytes):
+        store.put(key, value, nbytes)
+        if self.backend is not None:
+            self.backend.save(namespace, key, value)
+
+    def put(self, maze):
+        """Store a maze and return its ID"""
+        grid = as_grid(maze)
+        maze_id = maze_key(grid)
+        if self.mazes.get(maze_id) is None:
+            self._put(self.mazes, 'mazes', maze_id, grid, grid.nbytes)
+        return maze_id
+
+    def get(self, maze_id):
+        """Return the grid stored under maze_id, or None if unknown, evicted or not a maze ID"""
+        if not is_maze_id(maze_id):
+            return None
+        return self._get(self.mazes, 'mazes', maze_id, lambda grid: grid.nbytes)
+
+    @staticmethod
+    def result_key(maze_id, start, end, heuristic_type, search='astar'):
+        heuristic_type = normalize_heuristic(heuristic_type)
+        return f"{maze_id}-{start[0]}_{start[1]}-{end[0]}_{end[1]}-{heuristic_type}-{search}"
+
+    def get_result(self, maze_id, start, end, heuristic_type, search='astar'):
+        """Return the cached (path, execution_time, stats) of a solve, or None"""
+        key = self.result_key(maze_id, start, end, heuristic_type, search)
+        return self._get(self.results, 'results', key, lambda result: 16 * len(result[0] or []) + 1024)
+
+    def put_result(self, maze_id, start, end, heuristic_type, path, execution_time, stats=None,
+                   search='astar'):
+        """Cache the (path, execution_time, stats) of a solve made with the given search"""
+        key = self.result_key(maze_id, start, end, heuristic_type, search)
+        self._put(self.results, 'results', key, (path, execution_time, stats),
+                  16 * len(path or []) + 1024)
+
+    def get_context(self, maze_id, maze, goal, heuristic_type):
+        """
+        Return a trained heuristic context for a stored maze, training it on a miss
+
+        Args:
+            maze_id: ID of the maze from put()
+            maze: The maze grid (used only when the context must be trained)
+            goal: Goal position [x, y]
+            heuristic_type: Heuristic the context serves
+        """
+        key = f"{maze_id}-{goal[0]}_{goal[1]}-{normalize_heuristic(heuristic_type)}"
+        context = self._get(self.contexts, 'contexts', key, _context_nbytes)
+        if context is None:
+            context = HeuristicContext(maze, goal, heuristic_type).train()
+            if context.model is not None:
+                context.heuristic_table()  # Store the precomputed table with the model
+            self._put(self.contexts, 'contexts', key, context, _context_nbytes(context))
+        return context
+
+    def stats(self):
+        """Return the counters of each LRU level"""
+        return {
+            'mazes': self.mazes.stats(),
+            'results': self.results.stats(),
+            'contexts': self.contexts.stats(),
+        }
@@ -0,0 +1,243 @@
+import heapq
+from array import array
+
+# Marker for items that are not currently in the open list
+NOT_QUEUED = -1
+
+class LazyHeapOpenList:
+    """
+    Binary heap open list with lazy deletion.
+
+    Improving an item pushes a second entry; the outdated one is detected
+    and skipped when it reaches the top (counted in stale_pops).
+    """
+    def __init__(self, capacity, tie_break='high_g'):
+        self.heap = []
+        self.queued_g = array('l', [NOT_QUEUED]) * capacity  # g of the live entry per item
+        self.sign = -1 if tie_break == 'high_g' else 1
+        self.count = 0  # Number of live items
+        self.peak_size = 0
+        self.stale_pops = 0
+        self.pushes = 0
+        self.decreases = 0
+
+    def push(self, item, f_score, g_score):
+        """Insert an item, or lower its key if it is already queued"""
+        if self.queued_g[item] == NOT_QUEUED:
+            self.count += 1
+        else:
+            self.decreases += 1
+        self.queued_g[item] = g_score
+        heapq.heappush(self.heap, (f_score, self.sign * g_score, item))
+        self.pushes += 1
+        if len(self.heap) > self.peak_size:
+            self.peak_size = len(self.heap)
+
+    def pop(self):
+        """Remove and return (item, g_score) with the lowest f"""
+        while True:
+            _, signed_g, item = heapq.heappop(self.heap)
+            g_score = self.sign * signed_g
+            if self.queued_g[item] == g_score:
+                self.queued_g[item] = NOT_QUEUED
+                self.count -= 1
+                return item, g_score
+            self.stale_pops += 1
+
+    def min_f(self):
+        """Lower bound on the lowest f in the list (exact unless the top entry is stale)"""
+        return self.heap[0][0]
+
+    def __len__(self):
+        return self.count
+
+class IndexedHeapOpenList:
+    """
+    Binary heap open list with a position index supporting decrease-key.
+
+    Each item appears at most once, so the heap never holds stale entries.
+    """
+    def __init__(self, capacity, tie_break='high_g'):
+        self.heap = []  # Items ordered by key
+        self.keys = {}  # item -> (f_score, signed g_score)
+        self.positions = {}  # item -> index in heap
+        self.sign = -1 if tie_break == 'high_g' else 1
+        self.peak_size = 0
+        self.stale_pops = 0
+        self.pushes = 0
+        self.decreases = 0
+
+    def push(self, item, f_score, g_score):
+        """Insert an item, or lower its key if it is already queued"""
+        key = (f_score, self.sign * g_score)
+        self.pushes += 1
+        if item in self.positions:
+            self.decreases += 1
+            if key < self.keys[item]:
+                self.keys[item] = key
+                self._sift_up(self.positions[item])
+            return
+
+        self.keys[item] = key
+        self.positions[item] = len(self.heap)
+        self.heap.append(item)
+        self._sift_up(len(self.heap) - 1)
+        if len(self.heap) > self.peak_size:
+            self.peak_size = len(self.heap)
+
+    def pop(self):
+        """Remove and return (item, g_score) with the lowest f"""
+        heap = self.heap
+        item = heap[0]
+        last = heap.pop()
+        if heap:
+            heap[0] = last
+            self.positions[last] = 0
+            self._sift_down(0)
+        del self.positions[item]
+        _, signed_g = self.keys.pop(item)
+        return item, self.sign * signed_g
+
+    def _sift_up(self, index):
+        heap, keys, positions = self.heap, self.keys, self.positions
+        item = heap[index]
+        key = keys[item]
+        while index > 0:
+            parent_index = (index - 1) >> 1
+            parent = heap[parent_index]
+            if keys[parent] <= key:
+                break
+            heap[index] = parent
+            positions[parent] = index
+            index = parent_index
+        heap[index] = item
+        positions[item] = index
+
+    def _sift_down(self, index):
+        heap, keys, positions = self.heap, self.keys, self.positions
+        size = len(heap)
+        item = heap[index]
+        key = keys[item]
+        while True:
+            child_index = 2 * index + 1
+            if child_index >= size:
+                break
+            right_index = child_index + 1
+            if right_index < size and keys[heap[right_index]] < keys[heap[child_index]]:
+                child_index = right_index
+            child = heap[child_index]
+            if key <= keys[child]:
+                break
+            heap[index] = child
+            positions[child] = index
+            index = child_index
+        heap[index] = item
+        positions[item] = index
+
+    def min_f(self):
+        """Lowest f in the list"""
+        return self.keys[self.heap[0]][0]
+
+    def __len__(self):
+        return len(self.heap)
+
+class BucketOpenList:
+    """
+    Bucket (Dial) queue for integer f-scores, e.g. with the Manhattan heuristic.
+
+    Buckets are indexed by f; inside a bucket a small heap orders entries by g.
+    Improved items are re-pushed and the old entry skipped lazily like
+    LazyHeapOpenList.
+    """
+    def __init__(self, capacity, tie_break='high_g'):
+        self.buckets = []
+        self.cursor = 0  # Lowest bucket that may be non-empty
+        self.queued_g = array('l', [NOT_QUEUED]) * capacity
+        self.sign = -1 if tie_break == 'high_g' else 1
+        self.count = 0  # Number of live items
+        self.size = 0  # Number of entries including stale ones
+        self.peak_size = 0
+        self.stale_pops = 0
+        self.pushes = 0
+        self.decreases = 0
+
+    def push(self, item, f_score, g_score):
+        """Insert an item, or lower its key if it is already queued"""
+        bucket = int(f_score)
+        if bucket != f_score:
+            # Truncating would pop out of f order and could return suboptimal paths
+            raise ValueError(f"bucket open list needs integer f-scores, got {f_score}")
+        f_score = bucket
+        if self.queued_g[item] == NOT_QUEUED:
+            self.count += 1
+        else:
+            self.decreases += 1
+        self.queued_g[item] = g_score
+
+        while len(self.buckets) <= f_score:
+            self.buckets.append([])
+        heapq.heappush(self.buckets[f_score], (self.sign * g_score, item))
+        # Inconsistent heuristics can produce f below the current minimum
+        if f_score < self.cursor:
+            self.cursor = f_score
+
+        self.pushes += 1
+        self.size += 1
+        if self.size > self.peak_size:
+            self.peak_size = self.size
+
+    def pop(self):
+        """Remove and return (item, g_score) with the lowest f"""
+        while True:
+            while not self.buckets[self.cursor]:
+                self.cursor += 1
+            signed_g, item = heapq.heappop(self.buckets[self.cursor])
+            self.size -= 1
+            g_score = self.sign * signed_g
+            if self.queued_g[item] == g_score:
+                self.queued_g[item] = NOT_QUEUED
+                self.count -= 1
+                return item, g_score
+            self.stale_pops += 1
+
+    def min_f(self):
+        """Lower bound on the lowest f in the list (exact unless the lowest entry is stale)"""
+        while not self.buckets[self.cursor]:
+            self.cursor += 1
+        return self.cursor
+
+    def __len__(self):
+        return self.count
+
+# Available open list implementations
+OPEN_LISTS = {
+    'heap': LazyHeapOpenList,
+    'indexed': IndexedHeapOpenList,
+    'bucket': BucketOpenList,
+}
+
+def make_open_list(kind, capacity, tie_break='high_g'):
+    """
+    Create an open list by name
+
+    Args:
+        kind: 'heap' (lazy binary heap), 'indexed' (decrease-key heap) or 'bucket' (integer f only)
+        capacity: Number of distinct items (flat cell indices) that can be queued
+        tie_break: 'high_g' to prefer deeper nodes among equal f, 'low_g' for the opposite
+
+    Returns:
+        Open list with push(item, f, g), pop() -> (item, g), min_f(), len(), and the
+        peak_size / stale_pops / pushes / decreases counters
+    """
+    if kind not in OPEN_LISTS:
+        raise ValueError(f"Unknown open list type: {kind}")
+    return OPEN_LISTS[kind](capacity, tie_break)
+
+def open_list_stats(open_list):
+    """Return the counters of an open list as a dict"""
+    return {
+        'peak_open_size': open_list.peak_size,
+        'stale_pops': open_list.stale_pops,
+        'generated_nodes': open_list.pushes,
+        're_pushes': open_list.decreases,
+    }
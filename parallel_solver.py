@@ -0,0 +1,118 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+import numpy as np
+from grid_engine import as_grid
+from solver_service import solve_job
+
+# Warm worker pool shared by all parallel solves in this process
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_solver_pool(max_workers=None):
+    """
+    Return the shared process pool, creating it on first use
+
+    Workers stay alive between requests, so their imports and heuristic
+    context pools remain warm.
+
+    Args:
+        max_workers: Number of worker processes (defaults to the CPU count)
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=max_workers or os.cpu_count())
+        return _pool
+
+def shutdown_solver_pool():
+    """Stop the shared process pool (it is recreated on the next solve)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
+
+class SharedMaze:
+    """
+    Maze grid copied once into a shared-memory block.
+
+    Workers attach to the block by name instead of receiving a pickled copy.
+    Use as a context manager so the block is unlinked afterwards.
+    """
+    def __init__(self, maze):
+        grid = as_grid(maze)
+        self.shape = grid.shape
+        self.shm = shared_memory.SharedMemory(create=True, size=max(grid.nbytes, 1))
+        np.ndarray(self.shape, dtype=np.uint8, buffer=self.shm.buf)[:] = grid
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def close(self):
+        """Release and unlink the shared-memory block"""
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def _solve_shared(shm_name, shape, start, end, heuristic_type, options):
+    """Worker entry point: attach to the shared maze and return (heuristic_type, path, time, stats)"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        grid = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+        result = solve_job(grid, start, end, heuristic_type, options)
+        del grid
+    finally:
+        shm.close()
+    return result
+
+def iter_solve_parallel(maze, start, end, heuristic_types, max_workers=None, **options):
+    """
+    Solve one maze with several heuristics on the process pool
+
+    Args:
+        maze: 2D grid representing the maze (0=path, 1=wall)
+        start: Starting position [x, y]
+        end: Goal position [x, y]
+        heuristic_types: Heuristics to run, one task each
+        max_workers: Pool size if the pool does not exist yet
+        **options: Extra keyword arguments for astar_solve (e.g. engine, open_list)
+
+    Yields:
+        (heuristic_type, path, execution_time, stats) as each heuristic finishes,
+        where path is a list of [x, y] (None if unreachable) and stats is the
+        astar_solve statistics dict (see solver_service.solve_job for budgets)
+    """
+    pool = get_solver_pool(max_workers)
+    with SharedMaze(maze) as shared:
+        futures = [pool.submit(_solve_shared, shared.name, shared.shape,
+                               list(start), list(end), heuristic_type, options)
+                   for heuristic_type in heuristic_types]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            # Workers must be done with the block before it is unlinked
+            for future in futures:
+                future.cancel()
+            for future in futures:
+                if not future.cancelled():
+                    future.exception()
+
+def solve_parallel(maze, start, end, heuristic_types, max_workers=None, **options):
+    """
+    Solve one maze with several heuristics in parallel and wait for all of them
+
+    Returns:
+        Dict of heuristic_type -> (path, execution_time, stats)
+    """
+    return {heuristic_type: (path, execution_time, stats)
+            for heuristic_type, path, execution_time, stats
+            in iter_solve_parallel(maze, start, end, heuristic_types, max_workers, **options)}
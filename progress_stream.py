@@ -0,0 +1,99 @@
+import queue
+import threading
+from time import perf_counter
+from astar_algorithm import astar_solve
+from grid_engine import as_grid
+
+class SearchCancelled(Exception):
+    """Raised inside a traced search when the consumer stopped reading"""
+
+def iter_search_progress(maze, start, end, heuristic_types, batch_size=256, flush_interval=0.05,
+                         get_context=None, max_pending=16, **options):
+    """
+    Run solves in a background thread and yield their progress as messages
+
+    Expanded cells are collected through astar_solve's trace hook and sent in
+    batches, so the first cells arrive as soon as the search starts no matter how
+    large the maze is. A bounded queue between the search and the consumer keeps
+    memory flat: a slow consumer pauses the search instead of buffering it.
+    Closing the generator cancels the running search.
+
+    Messages (dicts with a 'type'):
+        {'type': 'start', 'heuristic', 'shape'} before each heuristic's search
+        {'type': 'expanded', 'heuristic', 'cells'} flat indices (x * width + y) of
+            newly expanded cells, at most batch_size per message
+        {'type': 'result', 'heuristic', 'path', 'time', 'stats'} when a search ends
+        {'type': 'error', 'heuristic', 'error'} if a search fails
+        {'type': 'done'} at the end
+
+    Args:
+        maze: 2D grid (0=path, 1=wall)
+        start: Starting position [x, y]
+        end: Goal position [x, y]
+        heuristic_types: Heuristics to run one after another
+        batch_size: Maximum cells per 'expanded' message
+        flush_interval: Send a partial batch after this many seconds
+        get_context: Optional function heuristic_type -> trained HeuristicContext
+        max_pending: Messages buffered before the search waits for the consumer
+        **options: Extra keyword arguments for astar_solve (e.g. engine, bidirectional)
+    """
+    grid = as_grid(maze)
+    width = grid.shape[1]
+    messages = queue.Queue(maxsize=max_pending)
+    cancelled = threading.Event()
+
+    def send(message):
+        while not cancelled.is_set():
+            try:
+                messages.put(message, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+        raise SearchCancelled()
+
+    def run():
+        try:
+            for heuristic_type in heuristic_types:
+                send({'type': 'start', 'heuristic': heuristic_type, 'shape': list(grid.shape)})
+                cells = []
+                last_flush = perf_counter()
+
+                def trace(event, position, g_score):
+                    nonlocal last_flush
+                    if event != 'expand':
+                        return
+                    cells.append(position[0] * width + position[1])
+                    if len(cells) >= batch_size or perf_counter() - last_flush >= flush_interval:
+                        send({'type': 'expanded', 'heuristic': heuristic_type, 'cells': cells[:]})
+                        cells.clear()
+                        last_flush = perf_counter()
+
+                stats = {}
+                try:
+                    context = get_context(heuristic_type) if get_context is not None else None
+                    path, execution_time = astar_solve(grid, start, end, heuristic_type, path_only=True,
+                                                       stats=stats, context=context, trace=trace,
+                                                       **options)
+                except SearchCancelled:
+                    raise
+                except Exception as error:
+                    send({'type': 'error', 'heuristic': heuristic_type, 'error': str(error)})
+                    continue
+                if cells:
+                    send({'type': 'expanded', 'heuristic': heuristic_type, 'cells': cells[:]})
+                send({'type': 'result', 'heuristic': heuristic_type, 'path': path,
+                      'time': execution_time, 'stats': stats})
+            send({'type': 'done'})
+        except SearchCancelled:
+            pass
+
+    worker = threading.Thread(target=run, daemon=True)
+    worker.start()
+    try:
+        while True:
+            message = messages.get()
+            yield message
+            if message['type'] == 'done':
+                break
+    finally:
+        cancelled.set()
@@ -0,0 +1,200 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+import numpy as np
+from astar_algorithm import astar_solve
+from grid_engine import SearchBudgetExceeded, as_grid
+from maze_generator import generate_maze
+
+class QueueFull(Exception):
+    """Raised when a job would exceed the service's worker and queue capacity"""
+
+class LatencyWindow:
+    """Recent latency samples (seconds) summarized as percentiles"""
+    def __init__(self, size=1024):
+        self.samples = deque(maxlen=size)
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def add(self, seconds):
+        with self.lock:
+            self.samples.append(seconds)
+            self.count += 1
+
+    def summary(self):
+        """Return count (all time) plus mean and p50 / p95 / p99 / max of the recent window"""
+        with self.lock:
+            samples = np.array(self.samples, dtype=np.float64)
+            count = self.count
+        if not len(samples):
+            return {'count': count}
+        p50, p95, p99 = np.percentile(samples, [50, 95, 99]).tolist()
+        return {'count': count, 'mean': float(samples.mean()), 'p50': p50, 'p95': p95,
+                'p99': p99, 'max': float(samples.max())}
+
+def request_budgets(time_limit=None, max_expansions=None, max_time_limit=None,
+                    max_max_expansions=None):
+    """
+    Return astar_solve budget options for a request
+
+    Args:
+        time_limit, max_expansions: Limits asked for by the request (None = server default)
+        max_time_limit, max_max_expansions: Server limits, used as defaults and caps
+            (None = unlimited)
+    """
+    def capped(requested, limit):
+        if requested is None:
+            return limit
+        return requested if limit is None else min(requested, limit)
+    return {'time_limit': capped(time_limit, max_time_limit),
+            'max_expansions': capped(max_expansions, max_max_expansions)}
+
+def solve_job(maze, start, end, heuristic_type, options):
+    """
+    Solve one heuristic, reporting an exhausted search budget instead of raising
+
+    Returns:
+        (heuristic_type, path, execution_time, stats); when the budget ran out, path
+        is None and stats holds 'budget_exceeded' (the reason) and 'expanded_nodes'
+    """
+    stats = {}
+    began = time.time()
+    try:
+        path, execution_time = astar_solve(maze, start, end, heuristic_type, path_only=True,
+                                           stats=stats, **options)
+    except SearchBudgetExceeded as error:
+        return heuristic_type, None, time.time() - began, {'budget_exceeded': str(error),
+                                                           'expanded_nodes': error.expanded}
+    return heuristic_type, path, execution_time, stats
+
+def generate_job(size, multiple_paths, wall_removal_probability, seed):
+    """Generate a square maze and return it as a uint8 array (cheap to send back)"""
+    return as_grid(generate_maze(size, size, multiple_paths, wall_removal_probability, seed=seed))
+
+def _timed_call(func, args):
+    """Worker entry point: return (wall-clock start, wall-clock end, func(*args))"""
+    began = time.time()
+    result = func(*args)
+    return began, time.time(), result
+
+class SolverService:
+    """
+    Bounded pool of worker processes with admission control and metrics.
+
+    At most workers + queue_depth jobs are accepted at once; submit() raises
+    QueueFull beyond that instead of letting work pile up, so the web layer can
+    answer 429 right away. Workers stay alive between jobs, keeping their imports
+    and heuristic context pools warm.
+    """
+    def __init__(self, workers=None, queue_depth=16, latency_window=1024):
+        """
+        Args:
+            workers: Number of worker processes (defaults to the CPU count)
+            queue_depth: Jobs allowed to wait for a free worker
+            latency_window: Number of recent jobs the latency percentiles cover
+        """
+        self.workers = workers or os.cpu_count()
+        self.queue_depth = queue_depth
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.counters = {'submitted': 0, 'completed': 0, 'failed': 0, 'rejected': 0,
+                         'budget_exceeded': 0}
+        self.latency = {name: LatencyWindow(latency_window) for name in ('queue_wait', 'run', 'total')}
+
+    @property
+    def capacity(self):
+        return self.workers + self.queue_depth
+
+    def reserve(self, count=1):
+        """Claim capacity for count jobs at once, or raise QueueFull"""
+        with self.lock:
+            if self.in_flight + count > self.capacity:
+                self.counters['rejected'] += 1
+                raise QueueFull(f"{self.in_flight} jobs in flight, capacity {self.capacity}")
+            self.in_flight += count
+            self.counters['submitted'] += count
+
+    def release(self, count=1, failed=False):
+        """Return capacity claimed with reserve()"""
+        with self.lock:
+            self.in_flight -= count
+            self.counters['failed' if failed else 'completed'] += count
+
+    def submit(self, func, *args, reserved=False):
+        """
+        Run func(*args) on a worker process
+
+        Args:
+            func: Picklable top-level function
+            reserved: True if the capacity was already claimed with reserve()
+
+        Returns:
+            Future of func's result
+        """
+        if not reserved:
+            self.reserve()
+        submitted = time.time()
+        result = Future()
+
+        def done(future):
+            try:
+                began, finished, value = future.result()
+            except BaseException as error:
+                self.release(failed=True)
+                result.set_exception(error)
+                return
+            self.release()
+            self.latency['queue_wait'].add(max(began - submitted, 0.0))
+            self.latency['run'].add(finished - began)
+            self.latency['total'].add(time.time() - submitted)
+            if isinstance(value, tuple) and len(value) == 4 and 'budget_exceeded' in value[3]:
+                with self.lock:
+                    self.counters['budget_exceeded'] += 1
+            result.set_result(value)
+
+        try:
+            self.pool.submit(_timed_call, func, args).add_done_callback(done)
+        except BaseException:
+            self.release(failed=True)
+            raise
+        return result
+
+    def solve(self, maze, start, end, heuristic_types, **options):
+        """
+        Submit one solve job per heuristic, all admitted or none
+
+        Returns:
+            List of futures of (heuristic_type, path, execution_time, stats), see solve_job
+        """
+        self.reserve(len(heuristic_types))
+        grid = as_grid(maze)
+        return [self.submit(solve_job, grid, list(start), list(end), heuristic_type, options,
+                            reserved=True)
+                for heuristic_type in heuristic_types]
+
+    def generate(self, size, multiple_paths=True, wall_removal_probability=0.2, seed=None):
+        """Submit a maze generation job; returns a future of the uint8 maze array"""
+        return self.submit(generate_job, size, multiple_paths, wall_removal_probability, seed)
+
+    def metrics(self):
+        """Return queue depth, job counters and latency percentiles"""
+        with self.lock:
+            in_flight = self.in_flight
+            counters = dict(self.counters)
+        return {
+            'workers': self.workers,
+            'queue_depth': self.queue_depth,
+            'in_flight': in_flight,
+            # Jobs beyond the worker count wait in the pool's queue
+            'running': min(in_flight, self.workers),
+            'queued': max(in_flight - self.workers, 0),
+            **counters,
+            'latency': {name: window.summary() for name, window in self.latency.items()},
+        }
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        self.pool.shutdown()
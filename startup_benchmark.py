@@ -0,0 +1,169 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from time import perf_counter
+from benchmark_report import print_comparison, result_key, summarize
+
+# Code run by a fresh interpreter for each entry point
+ENTRY_POINTS = {
+    'solver': "import astar_algorithm",
+    'solve_manhattan': ("from maze_generator import generate_maze_array\n"
+                        "from astar_algorithm import astar_solve\n"
+                        "astar_solve(generate_maze_array(41, 41, seed=0), [1, 1], [39, 39], 'manhattan', path_only=True)"),
+    'worker': "import solver_service",
+    'main': "import main",
+    'app': "import app",
+}
+# Modules whose import time dominates small solves
+HEAVY_MODULES = ['sklearn', 'scipy', 'matplotlib', 'colorama', 'flask']
+# Heavy modules an entry point must not load before its heuristic or feature is used
+FORBIDDEN = {
+    'solver': ['sklearn', 'scipy', 'matplotlib', 'colorama'],
+    'solve_manhattan': ['sklearn', 'scipy', 'matplotlib', 'colorama'],
+    'worker': ['sklearn', 'scipy', 'matplotlib', 'colorama'],
+    'main': ['sklearn', 'scipy', 'matplotlib'],
+    'app': ['sklearn', 'scipy', 'matplotlib'],
+}
+
+# Wraps an entry point: time it and report what it loaded as one JSON line
+PROBE = """import sys, json
+from time import perf_counter
+began = perf_counter()
+{code}
+elapsed = perf_counter() - began
+print(json.dumps({{'import_time': elapsed, 'modules': len(sys.modules),
+                  'loaded': [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+def run_entry_point(name, python_flags=()):
+    """
+    Run one entry point in a fresh interpreter
+
+    Returns:
+        (probe report dict, wall-clock seconds of the whole process, stderr text)
+    """
+    code = PROBE.format(code=ENTRY_POINTS[name], heavy=HEAVY_MODULES)
+    began = perf_counter()
+    completed = subprocess.run([sys.executable, *python_flags, '-c', code], cwd=ROOT,
+                               capture_output=True, text=True)
+    elapsed = perf_counter() - began
+    if completed.returncode != 0:
+        raise RuntimeError(f"{name} failed:\n{completed.stderr}")
+    return json.loads(completed.stdout.strip().splitlines()[-1]), elapsed, completed.stderr
+
+def slowest_imports(name, top=10):
+    """
+    Profile an entry point with python -X importtime
+
+    Returns:
+        List of (seconds, package) with the import time of each top-level package
+        (its own modules only, not what they import), slowest first
+    """
+    _, _, stderr = run_entry_point(name, ('-X', 'importtime'))
+    packages = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        own, _, module = line[len('import time:'):].split('|')
+        package = module.strip().split('.')[0]
+        packages[package] = packages.get(package, 0.0) + int(own) / 1e6
+    return sorted(((seconds, package) for package, seconds in packages.items()), reverse=True)[:top]
+
+def run_startup_benchmarks(entry_points=None, warmup=1, repeats=5, log=None):
+    """
+    Time each entry point in fresh interpreters
+
+    Args:
+        entry_points: Names from ENTRY_POINTS (defaults to all)
+        warmup: Untimed runs per entry point (fill the OS file cache)
+        repeats: Timed runs per entry point
+        log: Optional text stream for progress lines
+
+    Returns:
+        List of result dicts: benchmark ('startup'), entry_point, the summarize() fields
+        of the in-process import time, process_median (interpreter startup
+        included), modules (number loaded), loaded (HEAVY_MODULES present) and
+        violations (FORBIDDEN modules present)
+    """
+    results = []
+    for name in entry_points or ENTRY_POINTS:
+        for _ in range(warmup):
+            run_entry_point(name)
+        times, process_times = [], []
+        for _ in range(repeats):
+            report, elapsed, _ = run_entry_point(name)
+            times.append(report['import_time'])
+            process_times.append(elapsed)
+        result = {
+            'benchmark': 'startup',
+            'entry_point': name,
+            **summarize(times),
+            'process_median': summarize(process_times)['median'],
+            'repeats': repeats,
+            'modules': report['modules'],
+            'loaded': report['loaded'],
+            'violations': [module for module in report['loaded'] if module in FORBIDDEN.get(name, ())],
+        }
+        results.append(result)
+        if log is not None:
+            log.write(f"{result_key(result)}: median {result['median']:.4f}s "
+                      f"(process {result['process_median']:.4f}s), {result['modules']} modules, "
+                      f"heavy: {', '.join(result['loaded']) or 'none'}\n")
+            log.flush()
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark import time of the CLI, web app and solver entry points")
+    parser.add_argument('--entry-points', nargs='+', choices=list(ENTRY_POINTS), default=list(ENTRY_POINTS))
+    parser.add_argument('--warmup', type=int, default=1, help="untimed runs per entry point")
+    parser.add_argument('--repeats', type=int, default=5, help="timed runs per entry point (default: 5)")
+    parser.add_argument('--profile', type=int, default=0, metavar='N',
+                        help="also list the N slowest imported packages of each entry point (python -X importtime)")
+    parser.add_argument('-o', '--output', help="write JSON results to this file")
+    parser.add_argument('--baseline', help="JSON results file to compare against")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="relative slowdown reported as a regression (default: 0.10)")
+    args = parser.parse_args(argv)
+
+    results = run_startup_benchmarks(args.entry_points, args.warmup, args.repeats, log=sys.stderr)
+
+    if args.profile:
+        for name in args.entry_points:
+            print(f"{name}:")
+            for seconds, package in slowest_imports(name, args.profile):
+                print(f"  {seconds:8.4f}s  {package}")
+
+    if args.output:
+        report = {
+            'metadata': {
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'warmup': args.warmup,
+                'repeats': args.repeats,
+            },
+            'results': results,
+        }
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    failures = 0
+    for result in results:
+        if result['violations']:
+            print(f"{result['entry_point']} loaded {', '.join(result['violations'])} at startup")
+            failures += 1
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+        failures += print_comparison(results, baseline, args.threshold)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,15 +7,26 @@ document.addEventListener('DOMContentLoaded', function() {
     const mazeContainer = document.getElementById('maze-container');
     const resultsContainer = document.getElementById('results-container');
     const resultCards = document.getElementById('result-cards');
+    const animateCheckbox = document.getElementById('animate-search');
     
     // Chart
     let comparisonChart = null;
     
     // Current maze state
     let currentMaze = null;
+    let currentMazeId = null;
     let startPos = [1, 1];
     let endPos = [1, 1];
     
+    // Cell elements of the displayed maze, indexed by x * width + y
+    let cellElements = [];
+    
+    // Incremental renderer state: queued paint operations and the cells painted so far
+    let paintQueue = [];
+    let paintedCells = [];
+    let paintScheduled = false;
+    const CELLS_PER_FRAME = 4000;
+    
     // Update size value display when slider changes
     sizeSlider.addEventListener('input', function() {
         // Ensure size is odd (for maze generation)
@@ -40,12 +51,13 @@ document.addEventListener('DOMContentLoaded', function() {
             headers: {
                 'Content-Type': 'application/json',
             },
-            body: JSON.stringify({ size: size })
+            body: JSON.stringify({ size: size, format: 'bits' })
         })
         .then(response => response.json())
         .then(data => {
             // Store maze data
-            currentMaze = data.maze;
+            currentMaze = decodeBits(data.maze_bits);
+            currentMazeId = data.maze_id;
             startPos = data.start;
             endPos = data.end;
             
@@ -75,19 +87,36 @@ document.addEventListener('DOMContentLoaded', function() {
         solveBtn.disabled = true;
         solveBtn.textContent = "Solving...";
         
-        // Make API request to solve maze
-        fetch('/solve_maze', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify({
-                maze: currentMaze,
-                start: startPos,
-                end: endPos
-            })
+        if (animateCheckbox.checked) {
+            solveWithProgress().finally(() => {
+                solveBtn.disabled = false;
+                solveBtn.textContent = "Solve Maze";
+            });
+            return;
+        }
+        
+        // Make API request to solve maze, referring to the server-side copy by ID
+        requestSolve({ maze_id: currentMazeId })
+        .then(response => {
+            // Re-upload the maze if the server no longer has it
+            if (response.status === 404) {
+                return requestSolve({ maze: currentMaze });
+            }
+            return response;
+        })
+        .then(response => {
+            // Error bodies carry an 'error' message instead of results
+            return response.json().catch(() => ({})).then(data => {
+                if (response.status === 429) {
+                    throw new Error('Server busy, please retry in a moment.');
+                }
+                if (!response.ok) {
+                    throw new Error(data.error || `HTTP ${response.status}`);
+                }
+                currentMazeId = response.headers.get('X-Maze-Id') || currentMazeId;
+                return data;
+            });
         })
-        .then(response => response.json())
         .then(data => {
             // Display results
             displayResults(data);
@@ -97,7 +126,7 @@ document.addEventListener('DOMContentLoaded', function() {
         })
         .catch(error => {
             console.error('Error solving maze:', error);
-            alert('Error solving maze. Please try again.');
+            alert(`Error solving maze: ${error.message}`);
         })
         .finally(() => {
             // Re-enable button
@@ -106,10 +135,175 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     });
     
-    // Function to display the maze
+    // Post a solve request that returns only the path of each heuristic
+    function requestSolve(mazeFields) {
+        return fetch('/solve_maze', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                ...mazeFields,
+                start: startPos,
+                end: endPos,
+                format: 'path'
+            })
+        });
+    }
+    
+    // Post a solve request that streams the search progress as NDJSON
+    function requestProgress(mazeFields) {
+        return fetch('/solve_maze_progress', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                ...mazeFields,
+                start: startPos,
+                end: endPos,
+                format: 'path'
+            })
+        });
+    }
+    
+    // Solve while painting the expanded cells of each heuristic as they arrive
+    function solveWithProgress() {
+        const results = {};
+        displayMaze(currentMaze, startPos, endPos);
+        
+        return requestProgress({ maze_id: currentMazeId })
+        .then(response => {
+            // Re-upload the maze if the server no longer has it
+            if (response.status === 404) {
+                return requestProgress({ maze: currentMaze });
+            }
+            return response;
+        })
+        .then(response => {
+            if (!response.ok) {
+                throw new Error(`HTTP ${response.status}`);
+            }
+            currentMazeId = response.headers.get('X-Maze-Id') || currentMazeId;
+            return readNdjson(response, message => {
+                if (message.type === 'start') {
+                    queuePaint({ clear: true });
+                } else if (message.type === 'expanded') {
+                    queuePaint({ cells: message.cells, className: 'expanded' });
+                } else if (message.type === 'result') {
+                    results[message.heuristic] = message;
+                    const width = currentMaze[0].length;
+                    const cells = (message.path || []).map(([x, y]) => x * width + y);
+                    queuePaint({ cells: cells, className: 'solution' });
+                } else if (message.type === 'error') {
+                    console.error(`Error solving with ${message.heuristic}:`, message.error);
+                }
+            });
+        })
+        .then(() => {
+            // Replace the animation with the usual comparison once every search is done
+            paintQueue = [];
+            if (Object.keys(results).length > 0) {
+                displayResults(results);
+                resultsContainer.style.display = 'block';
+            }
+        })
+        .catch(error => {
+            console.error('Error solving maze:', error);
+            alert('Error solving maze. Please try again.');
+        });
+    }
+    
+    // Read a streamed NDJSON response, calling onMessage for each line as it arrives
+    async function readNdjson(response, onMessage) {
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            const lines = buffer.split('\n');
+            buffer = lines.pop();
+            for (const line of lines) {
+                if (line) onMessage(JSON.parse(line));
+            }
+        }
+        if (buffer) onMessage(JSON.parse(buffer));
+    }
+    
+    // Queue a paint operation ({cells, className} or {clear: true}) for the next frame
+    function queuePaint(operation) {
+        paintQueue.push(operation);
+        if (!paintScheduled) {
+            paintScheduled = true;
+            requestAnimationFrame(paintFrame);
+        }
+    }
+    
+    // Repaint only the cells changed since the last frame, a bounded number per frame
+    function paintFrame() {
+        paintScheduled = false;
+        let budget = CELLS_PER_FRAME;
+        while (paintQueue.length > 0 && budget > 0) {
+            const operation = paintQueue[0];
+            if (operation.clear) {
+                // A new heuristic starts: undo the previous one's cells
+                for (const cell of paintedCells) {
+                    cell.classList.remove('expanded', 'solution');
+                }
+                paintedCells = [];
+                paintQueue.shift();
+                continue;
+            }
+            const offset = operation.offset || 0;
+            const end = Math.min(operation.cells.length, offset + budget);
+            for (let k = offset; k < end; k++) {
+                const cell = cellElements[operation.cells[k]];
+                // Leave start, end and walls untouched
+                if (!cell || !cell.classList.contains('path')) continue;
+                if (operation.className === 'solution') {
+                    cell.classList.remove('expanded');
+                }
+                cell.classList.add(operation.className);
+                paintedCells.push(cell);
+            }
+            budget -= end - offset;
+            if (end < operation.cells.length) {
+                operation.offset = end;
+            } else {
+                paintQueue.shift();
+            }
+        }
+        if (paintQueue.length > 0) {
+            paintScheduled = true;
+            requestAnimationFrame(paintFrame);
+        }
+    }
+    
+    // Decode a bit-packed base64 maze (row-major, most significant bit first)
+    function decodeBits(encoded) {
+        const [rows, cols] = encoded.shape;
+        const bytes = atob(encoded.bits);
+        const maze = [];
+        for (let i = 0; i < rows; i++) {
+            const row = new Array(cols);
+            for (let j = 0; j < cols; j++) {
+                const index = i * cols + j;
+                row[j] = (bytes.charCodeAt(index >> 3) >> (7 - (index & 7))) & 1;
+            }
+            maze.push(row);
+        }
+        return maze;
+    }
+    
+    // Function to display the maze; solution is a path of [x, y] positions
     function displayMaze(maze, start, end, solution = null) {
+        const solutionCells = new Set((solution || []).map(([x, y]) => x * maze[0].length + y));
+        
         // Clear existing maze
         mazeContainer.innerHTML = '';
+        cellElements = [];
         
         // Set CSS grid size
         mazeContainer.style.gridTemplateColumns = `repeat(${maze[0].length}, 15px)`;
@@ -126,7 +320,7 @@ document.addEventListener('DOMContentLoaded', function() {
                     cell.classList.add('start');
                 } else if (i === end[0] && j === end[1]) {
                     cell.classList.add('end');
-                } else if (solution && solution[i][j] === 2) {
+                } else if (solutionCells.has(i * maze[0].length + j)) {
                     cell.classList.add('solution');
                 } else if (maze[i][j] === 1) {
                     cell.classList.add('wall');
@@ -135,6 +329,7 @@ document.addEventListener('DOMContentLoaded', function() {
                 }
                 
                 mazeContainer.appendChild(cell);
+                cellElements.push(cell);
             }
         }
     }
@@ -145,11 +340,12 @@ document.addEventListener('DOMContentLoaded', function() {
         resultCards.innerHTML = '';
         
         // Define fixed order and color mapping
-        const heuristicOrder = ['manhattan', 'KNN', 'decision_tree'];
+        const heuristicOrder = ['manhattan', 'KNN', 'decision_tree', 'landmark'];
         const colorMapping = {
             'manhattan': '#FF6384',
             'KNN': '#36A2EB',
-            'decision_tree': '#FFCE56'
+            'decision_tree': '#FFCE56',
+            'landmark': '#4BC0C0'
         };
         
         // Prepare data for chart
@@ -161,8 +357,10 @@ document.addEventListener('DOMContentLoaded', function() {
         let fastestHeuristic = '';
         let fastestTime = Infinity;
         
-        // Convert results object to array and sort by custom order
+        // Convert results object to array and sort by custom order, leaving out
+        // searches the server aborted for running out of budget
         const sortedResults = Object.entries(results)
+            .filter(([, data]) => !data.error)
             .sort((a, b) => {
                 const indexA = heuristicOrder.indexOf(a[0]);
                 const indexB = heuristicOrder.indexOf(b[0]);
@@ -172,7 +370,7 @@ document.addEventListener('DOMContentLoaded', function() {
         // Create result cards and collect data for chart
         for (const [heuristic, data] of sortedResults) {
             const executionTime = data.time;
-            const solvedMaze = data.solved_maze;
+            const solutionPath = data.path;
             
             // Check if this is the fastest
             if (executionTime < fastestTime) {
@@ -217,7 +415,7 @@ document.addEventListener('DOMContentLoaded', function() {
                 card.classList.add('active');
                 
                 // Display this solution
-                displayMaze(currentMaze, startPos, endPos, solvedMaze);
+                displayMaze(currentMaze, startPos, endPos, solutionPath);
             });
             
             // Add data for chart
@@ -238,7 +436,9 @@ document.addEventListener('DOMContentLoaded', function() {
         }
         
         // Display the fastest solution by default
-        displayMaze(currentMaze, startPos, endPos, results[fastestHeuristic].solved_maze);
+        if (fastestHeuristic) {
+            displayMaze(currentMaze, startPos, endPos, results[fastestHeuristic].path);
+        }
         
         // Create comparison chart
         createComparisonChart(labels, times, backgroundColors);
@@ -0,0 +1,62 @@
+import heapq
+import os
+import sys
+from collections import deque
+import pytest
+
+# The modules live at the repository root, next to this folder
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from maze_generator import generate_maze_array  # noqa: E402
+
+STEPS = ((-1, 0), (0, 1), (1, 0), (0, -1))
+
+def reference_cost(grid, start, end, costs=None):
+    """Cheapest cost from start to end by plain Dijkstra (BFS steps with unit costs), or None"""
+    height, width = grid.shape
+    best = {tuple(start): 0}
+    queue = [(0, tuple(start))]
+    while queue:
+        cost, (x, y) = heapq.heappop(queue)
+        if [x, y] == list(end):
+            return cost
+        if cost > best[(x, y)]:
+            continue
+        for dx, dy in STEPS:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < height and 0 <= ny < width and not grid[nx, ny]:
+                step = int(costs[nx, ny]) if costs is not None else 1
+                if cost + step < best.get((nx, ny), float('inf')):
+                    best[(nx, ny)] = cost + step
+                    heapq.heappush(queue, (cost + step, (nx, ny)))
+    return None
+
+def reference_field(grid, goal):
+    """BFS distance from every open cell to goal (None where unreachable)"""
+    height, width = grid.shape
+    field = [[None] * width for _ in range(height)]
+    field[goal[0]][goal[1]] = 0
+    queue = deque([tuple(goal)])
+    while queue:
+        x, y = queue.popleft()
+        for dx, dy in STEPS:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < height and 0 <= ny < width and not grid[nx, ny] and field[nx][ny] is None:
+                field[nx][ny] = field[x][y] + 1
+                queue.append((nx, ny))
+    return field
+
+def assert_valid_path(grid, path, start, end):
+    """Check that path walks through open cells, one step at a time, from start to end"""
+    assert [list(p) for p in path[:1]] == [list(start)]
+    assert list(path[-1]) == list(end)
+    for (x1, y1), (x2, y2) in zip(path, path[1:]):
+        assert abs(x1 - x2) + abs(y1 - y2) == 1
+    assert all(grid[x, y] == 0 for x, y in path)
+
+@pytest.fixture(params=[(21, 0.0, 1), (31, 0.3, 2), (41, 0.5, 3)], ids=lambda p: f"{p[0]}-{p[1]}-{p[2]}")
+def maze(request):
+    """Seeded maze as (grid, start, end): perfect, braided and open"""
+    size, probability, seed = request.param
+    grid = generate_maze_array(size, size, probability > 0, probability, seed=seed)
+    return grid, [1, 1], [size - 2, size - 2]
@@ -0,0 +1,96 @@
+import json
+import pytest
+import app as web
+from maze_encoding import decode_rle, encode_bits, moves_to_path
+from maze_generator import generate_maze_array
+
+@pytest.fixture
+def client():
+    return web.app.test_client()
+
+@pytest.fixture
+def open_maze():
+    """9x9 maze with no inner walls, where every shortest path has 12 steps"""
+    return [[1] * 9] + [[1] + [0] * 7 + [1] for _ in range(7)] + [[1] * 9]
+
+def test_malformed_inline_maze_is_rejected(client):
+    response = client.post('/solve_maze', json={'maze_rle': {'shape': [2, 2], 'values': [0], 'runs': [3]}})
+    assert response.status_code == 400
+    assert response.get_json()['error'].startswith('invalid maze')
+
+def test_compact_formats(client, open_maze):
+    bits = encode_bits(open_maze)
+    response = client.post('/solve_maze', json={'maze_bits': bits, 'format': 'moves'})
+    assert response.status_code == 200
+    for result in response.get_json().values():
+        assert moves_to_path(result['start'], result['moves'])[-1] == [7, 7]
+
+    generated = client.post('/generate_maze', json={'size': 21, 'seed': 1, 'format': 'rle'}).get_json()
+    assert decode_rle(generated['maze_rle']).shape == (21, 21)
+
+@pytest.fixture
+def maze_id(client):
+    return client.post('/generate_maze', json={'size': 21, 'seed': 1}).get_json()['maze_id']
+
+@pytest.mark.parametrize('endpoint', ['/solve_maze', '/solve_maze_progress', '/update_maze'])
+def test_invalid_requests_are_rejected(client, maze_id, endpoint):
+    extra = {'changes': []} if endpoint == '/update_maze' else {}
+    cases = [
+        ({'maze_id': '../etc/passwd'}, 400),
+        ({'maze_id': '0' * 32}, 404),
+        ({'maze_id': maze_id, 'start': 'ab'}, 400),
+        ({'maze_id': maze_id, 'end': [5, 99]}, 400),
+    ]
+    for body, status in cases:
+        assert client.post(endpoint, json={**body, **extra}).status_code == status, body
+
+def test_stored_maze_results_are_cached(client, maze_id):
+    first = client.post('/solve_maze', json={'maze_id': maze_id}).get_json()
+    second = client.post('/solve_maze', json={'maze_id': maze_id}).get_json()
+    assert all(second[heuristic]['cached'] for heuristic in second)
+    assert {h: r['solved_maze'] for h, r in first.items()} == {h: r['solved_maze'] for h, r in second.items()}
+
+def test_progress_stream_messages(client, open_maze):
+    response = client.post('/solve_maze_progress', json={'maze': open_maze, 'heuristics': ['manhattan', 'KNN'],
+                                                          'batch_size': 4})
+    messages = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [m['type'] for m in messages if m['type'] != 'expanded'] == ['start', 'result', 'start', 'result', 'done']
+    expanded = sum(len(m['cells']) for m in messages if m['type'] == 'expanded' and m['heuristic'] == 'manhattan')
+    result = next(m for m in messages if m['type'] == 'result')
+    assert expanded == result['stats']['expanded_nodes'] and len(result['path']) == 13
+
+def test_closed_progress_stream_releases_its_slot(client, maze_id):
+    web.configure_serving(workers=1, queue_depth=0)
+    try:
+        response = client.post('/solve_maze_progress', json={'maze_id': maze_id}, buffered=False)
+        assert response.status_code == 200
+        response.close()
+        assert web.solver_service.metrics()['in_flight'] == 0
+    finally:
+        web.configure_serving(workers=0)
+
+@pytest.mark.parametrize('budget', [{'max_expansions': 0}, {'max_expansions': -1}, {'time_limit': 0},
+                                    {'max_expansions': 'many'}])
+def test_invalid_budgets_are_rejected(client, maze_id, budget):
+    assert client.post('/solve_maze', json={'maze_id': maze_id, **budget}).status_code == 400
+
+def test_exceeded_budget_is_reported_per_heuristic(client):
+    # A fresh maze, so no heuristic is answered from the result cache
+    maze = generate_maze_array(31, 31, seed=22).tolist()
+    results = client.post('/solve_maze', json={'maze': maze, 'max_expansions': 1, 'format': 'path'}).get_json()
+    assert all(result['error'] and result['path'] is None for result in results.values())
+
+@pytest.mark.parametrize('size', [4, 5000, 'big', None])
+def test_generate_rejects_invalid_sizes(client, size):
+    assert client.post('/generate_maze', json={'size': size}).status_code == 400
+
+def test_full_worker_pool_answers_429(client):
+    maze = generate_maze_array(31, 31, seed=23).tolist()
+    web.configure_serving(workers=1, queue_depth=0)
+    try:
+        web.solver_service.reserve()
+        assert client.post('/solve_maze', json={'maze': maze}).status_code == 429
+        assert client.post('/generate_maze', json={'size': 21}).status_code == 429
+        web.solver_service.release()
+    finally:
+        web.configure_serving(workers=0)
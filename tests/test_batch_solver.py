@@ -0,0 +1,34 @@
+import io
+import json
+from batch_solver import iter_maze_records, solve_batch
+from maze_format import save_maze
+from maze_generator import generate_maze_array
+from conftest import reference_cost
+
+def test_batch_results_cover_every_maze_and_heuristic(tmp_path):
+    grids = {}
+    for seed in range(3):
+        grid = generate_maze_array(21, 21, seed=seed)
+        grids[f'm{seed}'] = grid
+        with open(tmp_path / f'm{seed}.json', 'w') as f:
+            json.dump({'maze': grid.tolist()}, f)
+    grids['packed'] = generate_maze_array(21, 21, seed=7)
+    save_maze(tmp_path / 'packed.maze', grids['packed'], [1, 1], [19, 19], bit_packed=True)
+
+    output = io.StringIO()
+    written = solve_batch(iter_maze_records(str(tmp_path)), output, ['manhattan', 'knn'], workers=2, chunksize=1)
+    results = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert written == len(results) == 8
+    for result in results:
+        grid = grids[result['id']]
+        shortest = reference_cost(grid, [1, 1], [19, 19])
+        if result['heuristic'] == 'manhattan':
+            assert result['path_length'] == shortest
+        else:
+            assert result['path_length'] >= shortest
+
+def test_jsonl_records_get_default_ids_and_corners(tmp_path):
+    source = tmp_path / 'mazes.jsonl'
+    source.write_text(json.dumps({'maze': [[0] * 5] * 4}) + '\n\n' + json.dumps({'maze': [[0] * 3] * 3, 'id': 'x'}) + '\n')
+    records = list(iter_maze_records(str(source)))
+    assert [(r['id'], r['start'], r['end']) for r in records] == [(1, [1, 1], [2, 3]), ('x', [1, 1], [1, 1])]
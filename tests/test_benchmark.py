@@ -0,0 +1,27 @@
+import json
+from benchmark import main, run_benchmarks
+
+def test_small_sweep_covers_every_case():
+    results = run_benchmarks([21], [0.0, 0.5], ['manhattan', 'knn'], ['solve', 'generate'], warmup=0, repeats=2)
+    keys = [(r['benchmark'], r['probability'], r['heuristic']) for r in results]
+    assert keys == [('generate', 0.0, None), ('solve', 0.0, 'manhattan'), ('solve', 0.0, 'knn'),
+                    ('generate', 0.5, None), ('solve', 0.5, 'manhattan'), ('solve', 0.5, 'knn')]
+    for result in results:
+        assert result['repeats'] == 2 and result['min'] <= result['median'] <= result['max']
+        if result['benchmark'] == 'solve':
+            assert result['expansions'] > 0 and result['path_length'] > 0
+
+def test_baseline_comparison_flags_regressions(tmp_path, capsys):
+    output = tmp_path / 'results.json'
+    args = ['--sizes', '21', '--probabilities', '0', '--heuristics', 'manhattan',
+            '--benchmarks', 'solve', '--repeats', '1', '--warmup', '0']
+    assert main(args + ['-o', str(output)]) == 0
+    report = json.loads(output.read_text())
+    assert report['metadata']['seed'] == 0 and len(report['results']) == 1
+
+    # A baseline ten times faster than any real run makes this one a regression
+    report['results'][0]['median'] /= 10
+    baseline = tmp_path / 'baseline.json'
+    baseline.write_text(json.dumps(report))
+    assert main(args + ['--baseline', str(baseline)]) == 1
+    assert 'REGRESSION' in capsys.readouterr().out
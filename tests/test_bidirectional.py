@@ -0,0 +1,28 @@
+import pytest
+from astar_algorithm import astar_solve
+from maze_generator import generate_maze_array
+from conftest import assert_valid_path, reference_cost
+
+@pytest.mark.parametrize('open_list', ['heap', 'indexed', 'bucket'])
+def test_bidirectional_finds_shortest_paths(maze, open_list):
+    grid, start, end = maze
+    stats = {}
+    path, _ = astar_solve(grid, start, end, 'manhattan', bidirectional=True, open_list=open_list,
+                          path_only=True, stats=stats)
+    assert_valid_path(grid, path, start, end)
+    assert len(path) - 1 == reference_cost(grid, start, end)
+    assert stats['expanded_nodes'] == stats['forward_expanded'] + stats['backward_expanded']
+    assert stats['meeting_point'] in path
+
+def test_bidirectional_unreachable_goal():
+    grid = generate_maze_array(21, 21, seed=1)
+    grid[18, 19] = grid[19, 18] = 1  # Wall the goal in
+    start, end = [1, 1], [19, 19]
+    stats = {}
+    path, _ = astar_solve(grid, start, end, 'manhattan', bidirectional=True, path_only=True, stats=stats)
+    assert path is None and stats['meeting_point'] is None
+
+def test_bidirectional_rejects_other_engines(maze):
+    grid, start, end = maze
+    with pytest.raises(ValueError):
+        astar_solve(grid, start, end, 'manhattan', engine='list', bidirectional=True)
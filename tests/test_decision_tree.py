@@ -0,0 +1,42 @@
+import json
+import numpy as np
+from astar_algorithm import astar_solve
+from heuristic.decision_tree_heuristic import (decision_tree_training_set, load_model, train_decision_tree,
+                                               use_corpus_model)
+from heuristic.features import OFFSETS_3X3, neighbor_wall_counts, wall_count_grid
+from maze_generator import generate_maze_array
+from train_model import main as train_main
+from conftest import assert_valid_path, reference_field
+
+def test_wall_count_grid_matches_per_position_counts(maze):
+    grid, _, _ = maze
+    positions = np.argwhere(np.ones_like(grid))
+    expected = neighbor_wall_counts(grid, positions, OFFSETS_3X3)
+    assert np.array_equal(wall_count_grid(grid)[positions[:, 0], positions[:, 1]], expected)
+
+def test_training_set_targets_are_true_distances(maze):
+    grid, _, end = maze
+    X, y = decision_tree_training_set(grid, end, max_samples=50)
+    field = reference_field(grid, end)
+    assert X.shape == (len(y), 6) and len(y) <= 50
+    for (x, col, *_), distance in zip(X.tolist(), y.tolist()):
+        assert field[x][col] == distance
+
+def test_corpus_model_is_used_for_every_maze(tmp_path):
+    for seed in range(3):
+        grid = generate_maze_array(21, 21, seed=seed)
+        (tmp_path / f'm{seed}.json').write_text(json.dumps({'maze': grid.tolist()}))
+    model_path = tmp_path / 'model.pkl'
+    assert train_main([str(tmp_path), '-o', str(model_path), '--samples-per-maze', '200']) == 0
+
+    model = load_model(model_path)
+    grid = generate_maze_array(21, 21, seed=9)
+    use_corpus_model(model)
+    try:
+        assert train_decision_tree(grid, [19, 19]) is model
+        use_corpus_model(model, warm_start=True)
+        assert train_decision_tree(grid, [19, 19]).base is model
+        path, _ = astar_solve(grid, [1, 1], [19, 19], 'decision_tree', path_only=True)
+        assert_valid_path(grid, path, [1, 1], [19, 19])
+    finally:
+        use_corpus_model(None)
@@ -0,0 +1,37 @@
+import numpy as np
+from heuristic.distance_cache import UNREACHABLE, DistanceFieldCache, distance_field
+from grid_engine import descend_distance_field
+from maze_generator import generate_maze_array, generate_terrain
+from conftest import reference_cost, reference_field
+
+def test_distance_field_matches_bfs(maze):
+    grid, _, end = maze
+    field = distance_field(grid, end)
+    expected = reference_field(grid, end)
+    for x, row in enumerate(expected):
+        for y, distance in enumerate(row):
+            assert field[x, y] == (UNREACHABLE if distance is None else distance)
+
+def test_weighted_distance_field_matches_dijkstra():
+    grid = generate_maze_array(31, 31, True, 0.4, seed=1)
+    costs = generate_terrain(31, 31, seed=1)
+    field = distance_field(grid, [29, 29], costs)
+    for start in ([1, 1], [1, 29], [15, 15], [29, 1]):
+        if not grid[start[0], start[1]]:
+            assert field[start[0], start[1]] == reference_cost(grid, start, [29, 29], costs)
+
+def test_blocked_goal_is_unreachable_from_everywhere():
+    grid = np.zeros((5, 5), dtype=np.uint8)
+    grid[2, 2] = 1
+    for costs in (None, np.full((5, 5), 2, dtype=np.uint8)):
+        field = distance_field(grid, [2, 2], costs)
+        assert (field == UNREACHABLE).all()
+        assert descend_distance_field(field, [0, 0]) is None
+
+def test_cache_returns_the_stored_field(maze):
+    grid, _, end = maze
+    cache = DistanceFieldCache()
+    first = cache.get(grid, end)
+    assert cache.get(grid.copy(), end) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert not first.flags.writeable
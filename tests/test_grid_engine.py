@@ -0,0 +1,30 @@
+import numpy as np
+from astar_algorithm import astar_solve
+from maze_generator import generate_maze_array
+from conftest import assert_valid_path, reference_cost
+
+def test_grid_engine_finds_shortest_paths(maze):
+    grid, start, end = maze
+    path, _ = astar_solve(grid, start, end, 'manhattan', path_only=True)
+    assert_valid_path(grid, path, start, end)
+    assert len(path) - 1 == reference_cost(grid, start, end)
+
+def test_grid_engine_matches_the_list_engine(maze):
+    grid, start, end = maze
+    grid_path, _ = astar_solve(grid, start, end, 'manhattan', path_only=True)
+    list_path, _ = astar_solve(grid.tolist(), start, end, 'manhattan', engine='list', path_only=True)
+    assert_valid_path(grid, list_path, start, end)
+    assert len(grid_path) == len(list_path)
+
+def test_solved_maze_marks_the_path(maze):
+    grid, start, end = maze
+    solved, _ = astar_solve(grid, start, end, 'manhattan')
+    path, _ = astar_solve(grid, start, end, 'manhattan', path_only=True)
+    assert np.count_nonzero(np.asarray(solved) == 2) == len(path)
+
+def test_unreachable_goal_returns_none():
+    grid = generate_maze_array(21, 21, seed=5)
+    grid[18:, 18:] = 1
+    grid[19, 19] = 0
+    path, _ = astar_solve(grid, [1, 1], [19, 19], 'manhattan', path_only=True)
+    assert path is None
@@ -0,0 +1,30 @@
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from astar_algorithm import astar_solve
+from heuristic.context import HeuristicContextPool
+from conftest import assert_valid_path, reference_cost
+
+@pytest.mark.parametrize('engine', ['list', 'grid'])
+@pytest.mark.parametrize('heuristic', ['knn', 'decision_tree'])
+def test_learned_heuristics_find_valid_paths(maze, heuristic, engine):
+    grid, start, end = maze
+    path, _ = astar_solve(grid, start, end, heuristic, engine=engine, path_only=True)
+    assert_valid_path(grid, path, start, end)
+    assert len(path) - 1 >= reference_cost(grid, start, end)
+
+def test_pool_shares_one_context_per_maze_and_goal(maze):
+    grid, _, end = maze
+    pool = HeuristicContextPool()
+    first = pool.get(grid, end, 'knn')
+    assert pool.get(grid, end, 'knn') is first
+    assert pool.get(grid, [1, 1], 'knn') is not first
+    assert (pool.hits, pool.misses) == (1, 2)
+
+def test_concurrent_searches_leave_the_model_untouched(maze):
+    grid, start, end = maze
+    context = HeuristicContextPool().get(grid, end, 'knn')
+    cached = dict(context.model.cache)
+    estimate = context.heuristic_func()
+    with ThreadPoolExecutor(4) as executor:
+        list(executor.map(lambda x: [estimate([x, y], end, grid) for y in range(grid.shape[1])], range(grid.shape[0])))
+    assert context.model.cache == cached
@@ -0,0 +1,17 @@
+import pytest
+from astar_algorithm import astar_solve
+from conftest import assert_valid_path, reference_cost
+
+@pytest.mark.parametrize('heuristic_mode', ['scalar', 'batch', 'table'])
+def test_heuristic_modes_find_shortest_paths(maze, heuristic_mode):
+    grid, start, end = maze
+    path, _ = astar_solve(grid, start, end, 'manhattan', heuristic_mode=heuristic_mode, path_only=True)
+    assert len(path) - 1 == reference_cost(grid, start, end)
+
+@pytest.mark.parametrize('heuristic', ['knn', 'decision_tree'])
+def test_batch_and_table_modes_agree(maze, heuristic):
+    grid, start, end = maze
+    batch, _ = astar_solve(grid, start, end, heuristic, heuristic_mode='batch', path_only=True)
+    table, _ = astar_solve(grid, start, end, heuristic, heuristic_mode='table', path_only=True)
+    assert_valid_path(grid, table, start, end)
+    assert batch == table
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from heuristic.distance_cache import UNREACHABLE
+from incremental_planner import IncrementalPlanner
+from maze_generator import generate_maze_array
+from conftest import assert_valid_path, reference_field
+
+def field_matches(planner):
+    """The repaired field equals a fresh BFS on the edited maze"""
+    expected = reference_field(planner.grid, planner.goal)
+    field = planner.distance_field()
+    for x, row in enumerate(expected):
+        for y, distance in enumerate(row):
+            if planner.grid[x, y]:
+                continue
+            assert field[x, y] == (UNREACHABLE if distance is None else distance), (x, y)
+
+@pytest.mark.parametrize('seed', range(4))
+def test_repaired_field_matches_bfs(seed):
+    grid = generate_maze_array(31, 31, True, 0.3, seed=seed)
+    goal = [29, 29]
+    planner = IncrementalPlanner(grid, goal)
+    rng = np.random.default_rng(seed)
+    for _ in range(10):
+        # Toggle a few interior cells, never the goal
+        changes = []
+        for x, y in rng.integers(1, 30, size=(5, 2)).tolist():
+            if [x, y] != goal:
+                changes.append([x, y, 1 - int(planner.grid[x, y])])
+        planner.update(changes)
+        field_matches(planner)
+
+        expected = reference_field(planner.grid, goal)[1][1]
+        path = planner.path([1, 1])
+        if expected is None or planner.grid[1, 1]:
+            assert path is None
+        else:
+            assert_valid_path(planner.grid, path, [1, 1], goal)
+            assert len(path) - 1 == expected
+
+def test_invalid_changes_leave_the_maze_untouched():
+    grid = generate_maze_array(21, 21, seed=9)
+    planner = IncrementalPlanner(grid, [19, 19])
+    with pytest.raises(ValueError):
+        planner.update([[3, 3, 1], [50, 3, 1]])
+    assert np.array_equal(planner.grid, grid)
+
+def test_walled_goal_is_unreachable_until_reopened():
+    grid = generate_maze_array(21, 21, seed=3)
+    grid[19, 19] = 1
+    planner = IncrementalPlanner(grid, [19, 19])
+    assert planner.path([1, 1]) is None
+    planner.update([[19, 19, 0]])
+    assert_valid_path(planner.grid, planner.path([1, 1]), [1, 1], [19, 19])
+    planner.update([[19, 19, 1]])
+    assert planner.path([1, 1]) is None
+    assert (planner.distance_field() == UNREACHABLE).all()
@@ -0,0 +1,19 @@
+import pytest
+from astar_algorithm import astar_solve
+from maze_generator import generate_maze_array
+from conftest import assert_valid_path, reference_cost
+
+@pytest.mark.parametrize('open_list', ['heap', 'indexed', 'bucket'])
+def test_jps_finds_shortest_paths(maze, open_list):
+    grid, start, end = maze
+    path, _ = astar_solve(grid, start, end, 'manhattan', engine='jps', open_list=open_list, path_only=True)
+    assert_valid_path(grid, path, start, end)
+    assert len(path) - 1 == reference_cost(grid, start, end)
+
+def test_jps_expands_fewer_cells_on_open_mazes():
+    grid = generate_maze_array(61, 61, True, 0.9, seed=4)
+    jps, grid_stats = {}, {}
+    astar_solve(grid, [1, 1], [59, 59], 'manhattan', engine='jps', path_only=True, stats=jps)
+    astar_solve(grid, [1, 1], [59, 59], 'manhattan', path_only=True, stats=grid_stats)
+    assert jps['path_length'] == grid_stats['path_length']
+    assert jps['generated_nodes'] < grid_stats['generated_nodes']
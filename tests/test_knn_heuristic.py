@@ -0,0 +1,21 @@
+import numpy as np
+from heuristic.knn_heuristic import KNNHeuristic
+
+def test_ring_buffer_keeps_the_newest_samples():
+    model = KNNHeuristic(k=2, max_samples=4)
+    for i in range(6):
+        model.add_sample((i, i), float(i))
+    assert model.count == 4
+    assert sorted(model.training_distances.tolist()) == [2.0, 3.0, 4.0, 5.0]
+    # Evicted samples leave the exact-match cache too
+    assert (0, 0) not in model.cache and (5, 5) in model.cache
+
+def test_batch_predictions_match_single_predictions():
+    model = KNNHeuristic(k=3, max_samples=50)
+    rng = np.random.default_rng(0)
+    model.add_samples(rng.integers(0, 30, size=(40, 2)), rng.uniform(0, 60, size=40))
+    positions = rng.integers(0, 30, size=(25, 2))
+    defaults = np.abs(positions - 29).sum(axis=1).astype(np.float64)
+    batch = model.predict_distance_batch(positions, defaults)
+    single = [model.predict_distance(p.tolist(), d) for p, d in zip(positions, defaults)]
+    assert np.allclose(batch, single)
@@ -0,0 +1,56 @@
+import pickle
+import pytest
+from astar_algorithm import astar_solve
+from heuristic.context import HeuristicContext
+from heuristic.landmark_heuristic import landmark_cache
+from maze_generator import generate_maze_array
+from maze_store import MazeStore, _context_nbytes
+from conftest import assert_valid_path, reference_cost
+
+@pytest.mark.parametrize('engine, open_list', [('grid', 'heap'), ('grid', 'indexed'), ('grid', 'bucket'),
+                                               ('jps', 'heap'), ('list', 'heap')])
+def test_landmark_finds_shortest_paths(maze, engine, open_list):
+    grid, start, end = maze
+    path, _ = astar_solve(grid, start, end, 'landmark', engine=engine, open_list=open_list, path_only=True)
+    assert_valid_path(grid, path, start, end)
+    assert len(path) - 1 == reference_cost(grid, start, end)
+
+def test_landmark_expands_no_more_than_manhattan(maze):
+    grid, start, end = maze
+    landmark, manhattan = {}, {}
+    astar_solve(grid, start, end, 'landmark', path_only=True, stats=landmark)
+    astar_solve(grid, start, end, 'manhattan', path_only=True, stats=manhattan)
+    assert landmark['expanded_nodes'] <= manhattan['expanded_nodes']
+
+def test_heuristic_names_are_case_insensitive(maze):
+    grid, start, end = maze
+    upper, lower = {}, {}
+    assert (astar_solve(grid, start, end, 'KNN', path_only=True, stats=upper)[0] ==
+            astar_solve(grid, start, end, 'knn', path_only=True, stats=lower)[0])
+    assert upper['expanded_nodes'] == lower['expanded_nodes']
+    with pytest.raises(ValueError):
+        astar_solve(grid, start, end, 'euclidean')
+
+def test_pickled_contexts_share_the_landmark_table():
+    grid = generate_maze_array(31, 31, seed=5)
+    first = HeuristicContext(grid, [29, 29], 'landmark').train()
+    second = HeuristicContext(grid, [1, 29], 'landmark').train()
+    assert first.model is second.model
+    data = pickle.dumps(first)
+    assert len(data) < first.model.nbytes
+    assert pickle.loads(data).model is first.model
+
+    # Loaded without the table in memory: rebuilt once and shared again
+    landmark_cache.clear()
+    reloaded = pickle.loads(data)
+    assert reloaded.estimate([1, 1]) == first.estimate([1, 1])
+    assert pickle.loads(pickle.dumps(second)).model is reloaded.model
+
+def test_store_budget_excludes_the_shared_table(tmp_path):
+    grid = generate_maze_array(31, 31, seed=6)
+    store = MazeStore(directory=str(tmp_path))
+    maze_id = store.put(grid)
+    contexts = [store.get_context(maze_id, grid, goal, 'landmark') for goal in ([29, 29], [1, 29], [29, 1])]
+    assert _context_nbytes(contexts[0]) < contexts[0].model.nbytes
+    reloaded = MazeStore(directory=str(tmp_path)).get_context(maze_id, grid, [1, 29], 'landmark')
+    assert reloaded.model is contexts[0].model
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+from grid_engine import mark_path
+from maze_encoding import (decode_bits, decode_maze, decode_rle, encode_bits, encode_rle,
+                           format_solution, moves_to_path, path_to_moves)
+from maze_generator import generate_maze_array
+
+@pytest.mark.parametrize('shape', [(1, 1), (7, 13), (41, 41)])
+def test_encodings_round_trip(shape):
+    grid = (np.random.default_rng(0).random(shape) < 0.4).astype(np.uint8)
+    assert np.array_equal(decode_rle(encode_rle(grid)), grid)
+    assert np.array_equal(decode_bits(encode_bits(grid)), grid)
+    assert np.array_equal(decode_maze({'maze': grid.tolist()}), grid)
+    assert np.array_equal(decode_maze({'maze_rle': encode_rle(grid)}), grid)
+    assert np.array_equal(decode_maze({'maze_bits': encode_bits(grid)}), grid)
+
+def test_moves_round_trip():
+    path = [[1, 1], [1, 2], [2, 2], [3, 2], [3, 1], [2, 1]]
+    assert path_to_moves(path) == 'RDDLU'
+    assert moves_to_path(path[0], 'RDDLU') == path
+    assert path_to_moves(None) is None
+
+def test_rle_solution_matches_marked_maze():
+    grid = generate_maze_array(15, 15, seed=2)
+    path = [[1, 1], [1, 2], [1, 3]]
+    encoded = format_solution(grid, path, 'rle')['solved_maze_rle']
+    assert np.array_equal(decode_rle(encoded), mark_path(grid, path))
+
+@pytest.mark.parametrize('data', [
+    {'maze_rle': {'shape': [2, 2], 'values': [0], 'runs': [3]}},
+    {'maze_rle': {'shape': [2, 2], 'values': [0, 1], 'runs': [4]}},
+    {'maze_rle': {'shape': [2, 2], 'values': [0], 'runs': [10 ** 12]}},
+    {'maze_rle': {'shape': [2, 2], 'values': ['a'], 'runs': [4]}},
+    {'maze_rle': {'shape': [2, 2], 'values': [2], 'runs': [4]}},
+    {'maze_rle': {'shape': [-2, 2], 'values': [0], 'runs': [4]}},
+    {'maze_rle': {'shape': [10 ** 6, 10 ** 6], 'values': [0], 'runs': [10 ** 12]}},
+    {'maze_rle': [0, 1]},
+    {'maze_bits': {'shape': [2, 2], 'bits': '!!!!'}},
+    {'maze_bits': {'shape': [4, 4], 'bits': 'AA=='}},
+    {'maze_bits': {'shape': [2, 2], 'bits': 5}},
+    {'maze': [[0, 1], [0]]},
+    {'maze': [[0, 'x'], [0, 0]]},
+    {'maze': [[0, 3], [0, 0]]},
+    {'maze': []},
+])
+def test_malformed_mazes_raise_value_error(data):
+    with pytest.raises(ValueError):
+        decode_maze(data)
+
+def test_missing_maze_decodes_to_none():
+    assert decode_maze({}) is None
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+from maze_format import load_maze, read_header, save_maze
+from maze_generator import generate_maze, generate_maze_array
+
+def test_same_seed_gives_the_same_maze():
+    assert np.array_equal(generate_maze_array(41, 41, seed=5), generate_maze_array(41, 41, seed=5))
+    assert not np.array_equal(generate_maze_array(41, 41, seed=5), generate_maze_array(41, 41, seed=6))
+    assert generate_maze(31, 31, seed=5) == generate_maze(31, 31, seed=5)
+
+@pytest.mark.parametrize('mmap', [True, False])
+@pytest.mark.parametrize('bit_packed', [True, False])
+def test_save_and_load_round_trip(tmp_path, bit_packed, mmap):
+    grid = generate_maze_array(23, 37, seed=4)
+    path = tmp_path / 'maze.maze'
+    save_maze(path, grid, [1, 1], [21, 35], seed=4, bit_packed=bit_packed)
+    loaded, header = load_maze(path, mmap=mmap)
+    assert np.array_equal(loaded, grid)
+    assert header == {'height': 23, 'width': 37, 'start': [1, 1], 'end': [21, 35],
+                      'seed': 4, 'bit_packed': bit_packed}
+
+def test_bit_packing_rejects_weighted_grids(tmp_path):
+    with pytest.raises(ValueError):
+        save_maze(tmp_path / 'maze.maze', np.full((3, 3), 2, dtype=np.uint8), bit_packed=True)
+
+def test_read_header_rejects_other_files(tmp_path):
+    short = tmp_path / 'short.maze'
+    short.write_bytes(b'MAZE')
+    other = tmp_path / 'other.maze'
+    other.write_bytes(b'\0' * 128)
+    for path in (short, other):
+        with pytest.raises(ValueError):
+            read_header(path)
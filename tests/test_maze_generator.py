@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+from maze_generator import generate_maze, generate_maze_array
+from conftest import reference_field
+
+def open_cells_connected(grid):
+    field = reference_field(grid, [1, 1])
+    return all(field[x][y] is not None for x, y in np.argwhere(grid == 0).tolist())
+
+@pytest.mark.parametrize('size', [5, 21, 41])
+def test_perfect_array_maze_is_connected(size):
+    grid = generate_maze_array(size, size, multiple_paths=False, seed=size)
+    assert grid.dtype == np.uint8 and grid.shape == (size, size)
+    assert open_cells_connected(grid)
+    # A perfect maze is a tree: one fewer passage than open cells
+    open_cells = int((grid == 0).sum())
+    edges = int(((grid[1:, :] == 0) & (grid[:-1, :] == 0)).sum() + ((grid[:, 1:] == 0) & (grid[:, :-1] == 0)).sum())
+    assert edges == open_cells - 1
+
+def test_large_maze_does_not_recurse():
+    grid = generate_maze_array(1001, 1001, seed=0)
+    assert grid[1, 1] == 0 and grid[999, 999] == 0
+    assert generate_maze(301, 301, seed=0)[299][299] == 0
+
+def test_list_maze_is_connected():
+    grid = np.array(generate_maze(31, 31, multiple_paths=True, seed=3), dtype=np.uint8)
+    assert open_cells_connected(grid)
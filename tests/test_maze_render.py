@@ -0,0 +1,48 @@
+import io
+import re
+import struct
+import zlib
+import numpy as np
+from maze_generator import generate_maze_array
+from maze_render import (BACKGROUND, END, PALETTE, START, WALL, cell_codes, downsample, print_frame,
+                         render_maze, save_maze_png)
+
+ESCAPE = re.compile(r'\033\[[0-9;]*m')
+
+def test_full_mode_draws_two_characters_per_cell():
+    grid = generate_maze_array(21, 21, seed=1)
+    frame = render_maze(grid, mode='full')
+    lines = frame.rstrip('\n').split('\n')
+    assert len(lines) == 21
+    assert all(len(ESCAPE.sub('', line)) == 42 for line in lines)
+    # Runs share one escape code: the top wall row is a single run
+    assert lines[0] == BACKGROUND[WALL] + '  ' * 21 + '\033[0m'
+
+def test_auto_mode_fits_wide_mazes():
+    grid = generate_maze_array(201, 201, seed=2)
+    lines = render_maze(grid, columns=80).rstrip('\n').split('\n')
+    assert all(len(ESCAPE.sub('', line)) <= 80 for line in lines)
+    assert len(lines) < 201
+
+def test_downsample_keeps_start_and_end():
+    codes = cell_codes(generate_maze_array(41, 41, seed=3))
+    small = downsample(codes, 4)
+    assert small.shape == (11, 11) and small[0, 0] == START and small[39 // 4, 39 // 4] == END
+
+def test_print_frame_writes_once():
+    writes = []
+    stream = io.StringIO()
+    stream.write = lambda text, write=stream.write: writes.append(text) or write(text)
+    print_frame(np.zeros((5, 5), dtype=np.uint8), mode='full', file=stream)
+    assert len(writes) == 1
+
+def test_png_export(tmp_path):
+    grid = generate_maze_array(9, 11, seed=4)
+    path = tmp_path / 'maze.png'
+    save_maze_png(grid, path, scale=2)
+    data = path.read_bytes()
+    width, height = struct.unpack('>II', data[16:24])
+    assert (width, height) == (22, 18)
+    idat = data[33 + 8:-12 - 4]
+    raw = np.frombuffer(zlib.decompress(idat), dtype=np.uint8).reshape(18, 22 * 3 + 1)
+    assert tuple(raw[0, 1:4]) == tuple(PALETTE[WALL])
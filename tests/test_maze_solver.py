@@ -0,0 +1,27 @@
+import pytest
+from maze_solver import MazeSolver
+from conftest import assert_valid_path, reference_cost
+
+def test_queries_share_contexts_per_goal(maze):
+    grid, start, end = maze
+    solver = MazeSolver(grid, 'decision_tree')
+    first = solver.context(end)
+    assert solver.context(end, 'DECISION_TREE') is first
+    assert solver.context(end, 'knn') is not first
+    assert len(solver.contexts) == 2
+    with pytest.raises(ValueError):
+        solver.context(end, 'euclidean')
+
+@pytest.mark.parametrize('group_by_goal', [False, True])
+def test_solve_many_answers_every_query(maze, group_by_goal):
+    grid, start, end = maze
+    queries = [(start, end), ([end[0], start[1]], end), (end, start), (start, start)]
+    solver = MazeSolver(grid, 'manhattan')
+    results = solver.solve_many(queries, group_by_goal=group_by_goal)
+    for (query_start, query_end), (path, _) in zip(queries, results):
+        shortest = reference_cost(grid, query_start, query_end)
+        if shortest is None:
+            assert path is None
+        else:
+            assert_valid_path(grid, path, query_start, query_end)
+            assert len(path) - 1 == shortest
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from maze_generator import generate_maze_array
+from maze_store import FileBackend, LRUStore, MazeStore, is_maze_id
+
+def test_lru_evicts_least_recently_used_within_budget():
+    store = LRUStore(max_bytes=30)
+    for key in 'abc':
+        store.put(key, key.upper(), 10)
+    store.get('a')
+    store.put('d', 'D', 10)
+    assert store.get('b') is None and store.get('a') == 'A'
+    assert store.stats()['bytes'] == 30 and store.evictions == 1
+    store.put('huge', 'H', 31)  # Larger than the whole budget: not stored
+    assert store.get('huge') is None
+
+def test_store_round_trips_mazes_and_results():
+    store = MazeStore()
+    grid = generate_maze_array(21, 21, seed=1)
+    maze_id = store.put(grid)
+    assert is_maze_id(maze_id) and store.put(grid.tolist()) == maze_id
+    assert np.array_equal(store.get(maze_id), grid)
+    store.put_result(maze_id, [1, 1], [19, 19], 'KNN', [[1, 1]], 0.5, {'expanded_nodes': 1})
+    assert store.get_result(maze_id, [1, 1], [19, 19], 'knn') == ([[1, 1]], 0.5, {'expanded_nodes': 1})
+    assert store.get_result(maze_id, [1, 1], [19, 19], 'manhattan') is None
+
+def test_directory_store_is_shared(tmp_path):
+    grid = generate_maze_array(21, 21, seed=2)
+    first = MazeStore(directory=str(tmp_path))
+    maze_id = first.put(grid)
+    context = first.get_context(maze_id, grid, [19, 19], 'decision_tree')
+    second = MazeStore(directory=str(tmp_path))
+    assert np.array_equal(second.get(maze_id), grid)
+    reloaded = second.get_context(maze_id, grid, [19, 19], 'decision_tree')
+    assert np.array_equal(reloaded.heuristic_table(), context.heuristic_table())
+
+@pytest.mark.parametrize('key', ['../x', 'a/b', '..'])
+def test_file_backend_refuses_keys_outside_its_folder(tmp_path, key):
+    with pytest.raises(ValueError):
+        FileBackend(str(tmp_path)).path('results', key)
+
+def test_store_ignores_invalid_maze_ids(tmp_path):
+    assert MazeStore(directory=str(tmp_path)).get('../../x') is None
+    assert not is_maze_id('A' * 32) and not is_maze_id(None)
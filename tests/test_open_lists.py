@@ -0,0 +1,17 @@
+import pytest
+from astar_algorithm import astar_solve
+from maze_generator import generate_maze_array
+from conftest import assert_valid_path, reference_cost
+
+@pytest.mark.parametrize('open_list', ['heap', 'indexed', 'bucket'])
+def test_open_lists_find_shortest_paths(maze, open_list):
+    grid, start, end = maze
+    path, _ = astar_solve(grid, start, end, 'manhattan', open_list=open_list, path_only=True)
+    assert_valid_path(grid, path, start, end)
+    assert len(path) - 1 == reference_cost(grid, start, end)
+
+@pytest.mark.parametrize('heuristic', ['knn', 'decision_tree'])
+def test_bucket_open_list_rejects_fractional_estimates(heuristic):
+    grid = generate_maze_array(41, 41, True, 0.3, seed=4)
+    with pytest.raises(ValueError):
+        astar_solve(grid, [1, 1], [39, 39], heuristic, open_list='bucket', path_only=True)
@@ -0,0 +1,30 @@
+import numpy as np
+from astar_algorithm import astar_solve
+from heuristic.context import HeuristicContext
+from parallel_solver import SharedMaze, _solve_shared, shutdown_solver_pool, solve_parallel
+
+HEURISTICS = ['manhattan', 'knn', 'decision_tree']
+
+def test_parallel_results_match_sequential_solves(maze):
+    grid, start, end = maze
+    try:
+        results = solve_parallel(grid, start, end, HEURISTICS, max_workers=2)
+    finally:
+        shutdown_solver_pool()
+    assert set(results) == set(HEURISTICS)
+    for heuristic in HEURISTICS:
+        path, _ = astar_solve(grid, start, end, heuristic, path_only=True)
+        assert results[heuristic][0] == path
+
+def test_shared_maze_solve_outlives_the_block():
+    grid = np.zeros((9, 9), dtype=np.uint8)
+    with SharedMaze(grid) as shared:
+        heuristic, path, _, stats = _solve_shared(shared.name, shared.shape, [0, 0], [8, 8], 'knn', {})
+    assert heuristic == 'knn' and len(path) == 17 and stats['path_length'] == 16
+
+def test_context_owns_its_grid():
+    shared = np.zeros((5, 5), dtype=np.uint8)
+    context = HeuristicContext(shared, [4, 4], 'manhattan')
+    assert context.grid.base is None
+    shared[2, 2] = 1
+    assert context.grid[2, 2] == 0
@@ -0,0 +1,26 @@
+import pytest
+from astar_algorithm import astar_solve
+
+STAT_FIELDS = {'training_time', 'heuristic_calls', 'heuristic_time', 'search_time', 'peak_open_size',
+               'stale_pops', 'generated_nodes', 're_pushes', 'expanded_nodes', 'path_length',
+               'path_cost', 'total_time'}
+
+@pytest.mark.parametrize('engine', ['list', 'grid', 'jps'])
+def test_every_engine_fills_stats(maze, engine):
+    grid, start, end = maze
+    stats = {}
+    path, _ = astar_solve(grid, start, end, 'manhattan', engine=engine, path_only=True, stats=stats)
+    assert STAT_FIELDS <= set(stats)
+    assert stats['path_length'] == len(path) - 1
+    assert stats['expanded_nodes'] > 0 and stats['total_time'] >= stats['search_time'] >= 0
+
+@pytest.mark.parametrize('engine, start_pushes', [('list', 0), ('grid', 1)])
+def test_trace_events_match_stats(maze, engine, start_pushes):
+    grid, start, end = maze
+    events = []
+    stats = {}
+    astar_solve(grid, start, end, 'manhattan', engine=engine, path_only=True, stats=stats,
+                trace=lambda event, position, g_score: events.append(event))
+    assert stats['expanded_nodes'] == events.count('expand')
+    # The list engine reports the start as generated without counting it as a push
+    assert stats['generated_nodes'] == events.count('generate') - 1 + start_pushes
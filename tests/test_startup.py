@@ -0,0 +1,27 @@
+import pytest
+from benchmark_report import compare_results, measure, result_key, summarize
+from startup_benchmark import FORBIDDEN, run_entry_point
+
+@pytest.mark.parametrize('entry_point', ['solver', 'solve_manhattan', 'worker', 'main'])
+def test_entry_points_do_not_load_heavy_modules(entry_point):
+    report, _, _ = run_entry_point(entry_point)
+    assert not set(report['loaded']) & set(FORBIDDEN[entry_point])
+
+def test_summary_and_comparison():
+    summary = summarize([1.0, 2.0, 3.0, 4.0, 5.0])
+    assert (summary['median'], summary['min'], summary['max']) == (3.0, 1.0, 5.0)
+    assert summary['p10'] < summary['median'] < summary['p90']
+
+    results = [{'benchmark': 'startup', 'entry_point': 'app', 'median': 1.2},
+               {'benchmark': 'solve', 'size': 41, 'probability': 0.0, 'heuristic': 'knn', 'median': 1.0}]
+    baseline = [{'benchmark': 'startup', 'entry_point': 'app', 'median': 1.0}]
+    assert [result_key(result) for result in results] == ['startup/app', 'solve/41/0.0/knn']
+    assert compare_results(results, baseline, threshold=0.1) == [('startup/app', 1.0, 1.2, 1.2, True)]
+
+def test_measure_resets_before_every_run():
+    calls = []
+    result = measure(lambda: calls.append('run') or {'expansions': 3}, warmup=1, repeats=2,
+                     reset=lambda: calls.append('reset'))
+    # Warmup, timed runs and the traced run are each preceded by a reset
+    assert calls == ['reset', 'run'] * 4
+    assert result['repeats'] == 2 and result['expansions'] == 3 and result['peak_memory'] >= 0
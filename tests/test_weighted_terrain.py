@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from astar_algorithm import astar_solve
+from maze_generator import generate_maze, generate_maze_array
+from maze_solver import MazeSolver
+from conftest import assert_valid_path, reference_cost
+
+@pytest.mark.parametrize('heuristic', ['manhattan', 'landmark'])
+def test_weighted_paths_are_cheapest(maze, heuristic):
+    grid, start, end = maze
+    _, costs = generate_maze_array(*grid.shape, seed=8, terrain=True)
+    stats = {}
+    path, _ = astar_solve(grid, start, end, heuristic, path_only=True, stats=stats, costs=costs)
+    assert_valid_path(grid, path, start, end)
+    # Entering a cell costs its value; the start is free
+    assert stats['path_cost'] == sum(int(costs[x, y]) for x, y in path[1:])
+    assert stats['path_cost'] == reference_cost(grid, start, end, costs)
+
+@pytest.mark.parametrize('heuristic', ['knn', 'decision_tree'])
+def test_learned_heuristics_find_valid_weighted_paths(maze, heuristic):
+    grid, start, end = maze
+    _, costs = generate_maze_array(*grid.shape, seed=8, terrain=True)
+    stats = {}
+    path, _ = astar_solve(grid, start, end, heuristic, path_only=True, stats=stats, costs=costs)
+    assert_valid_path(grid, path, start, end)
+    assert stats['path_cost'] >= reference_cost(grid, start, end, costs)
+
+@pytest.mark.parametrize('options', [{'engine': 'jps'}, {'bidirectional': True}, {}])
+def test_unit_cost_engines_report_path_cost(maze, options):
+    grid, start, end = maze
+    stats = {}
+    path, _ = astar_solve(grid, start, end, 'manhattan', path_only=True, stats=stats, **options)
+    assert stats['path_cost'] == stats['path_length'] == len(path) - 1
+
+def test_grouped_weighted_queries_use_the_cost_field():
+    grid, costs = generate_maze_array(31, 31, seed=5, terrain=True)
+    solver = MazeSolver(grid, 'manhattan', costs=costs)
+    queries = [([1, 1], [29, 29]), ([1, 29], [29, 29])]
+    for (start, end), (path, _) in zip(queries, solver.solve_many(queries, group_by_goal=True)):
+        assert sum(int(costs[x, y]) for x, y in path[1:]) == reference_cost(grid, start, end, costs)
+
+def test_list_generator_terrain_matches_the_maze():
+    maze, costs = generate_maze(21, 21, seed=1, terrain=True)
+    assert costs.shape == (21, 21) and costs.dtype == np.uint8 and costs.min() >= 1
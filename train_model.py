@@ -0,0 +1,35 @@
+import argparse
+import sys
+from batch_solver import iter_maze_records
+from maze_format import load_maze
+from heuristic.decision_tree_heuristic import save_model, train_corpus_model
+
+def iter_examples(records):
+    """Yield (maze, goal) for each maze record (see batch_solver.iter_maze_records)"""
+    for record in records:
+        maze = record.get('maze')
+        if maze is None:
+            maze, _ = load_maze(record['maze_file'])
+        yield maze, record['end']
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train a decision tree heuristic on a corpus of mazes")
+    parser.add_argument('source', help="directory of *.json / *.maze mazes, a *.jsonl file, or - for stdin")
+    parser.add_argument('-o', '--output', required=True, help="file receiving the pickled model")
+    parser.add_argument('--samples-per-maze', type=int, default=5000,
+                        help="training cells drawn from each maze (default: 5000)")
+    parser.add_argument('--max-depth', type=int, default=10, help="tree depth (default: 10)")
+    parser.add_argument('--seed', type=int, default=0, help="seed for subsampling and fitting")
+    args = parser.parse_args(argv)
+
+    model = train_corpus_model(iter_examples(iter_maze_records(args.source)),
+                               args.samples_per_maze, args.max_depth, args.seed)
+    if model is None:
+        print("No reachable cells in the corpus, nothing written", file=sys.stderr)
+        return 1
+    save_model(args.output, model)
+    print(f"Wrote model with {model.tree_.node_count} nodes to {args.output}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())